@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+AWS Benchmark - Measure tool operations against a local AWS stand-in
+Author: [Vishal Attri]
+Description: Times per-action latency against moto server (never real AWS)
+
+Start a stand-in first:
+    pip install "moto[server]"
+    moto_server -p 5000
+    python aws_benchmark.py --endpoint-url http://127.0.0.1:5000
+
+Compare the sync and async status-check engines (needs aiobotocore; exits 1 when a check
+fails or the two reports differ, so it doubles as a regression run):
+    python aws_benchmark.py --suite engines --buckets 50 --objects 2000
+
+Time every tool operation (status checks, listings, uploads, downloads,
+bucket deletion, instance stop/start) and keep the results per version:
+    python aws_benchmark.py --suite operations --regions us-east-1,eu-west-1 --output bench.json
+
+No moto server? Run everything against moto's in-process mock instead:
+    python aws_benchmark.py --in-process --suite all
+
+Track cron cold-start cost (fresh interpreters, no AWS calls, no stand-in needed):
+    python aws_benchmark.py --suite startup --runs 10
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from unittest import mock
+
+import boto3
+
+import aws_cache
+import aws_clients
+import aws_master_tool
+import aws_status_check
+
+# ====================== BENCH CONFIG ======================
+DEFAULT_ENDPOINT = 'http://127.0.0.1:5000'
+DEFAULT_ITERATIONS = 50
+DEFAULT_RUNS = 3
+DEFAULT_OP_ITERATIONS = 5
+SUITES = ('clients', 'engines', 'operations', 'startup')
+BENCH_AMI = 'ami-12c6146b'
+
+def use_endpoint(endpoint_url):
+    """Point every boto3 client at the stand-in and give it dummy credentials"""
+    os.environ['AWS_ENDPOINT_URL'] = endpoint_url
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    aws_clients.reset_clients()
+
+def reset_stand_in(endpoint_url):
+    """Wipe moto server state so every run starts from the same seed"""
+    request = urllib.request.Request(f"{endpoint_url}/moto-api/reset", method='POST')
+    urllib.request.urlopen(request).read()
+
+def use_in_process():
+    """Start moto's in-process mock (no server needed); returns the context to exit"""
+    try:
+        from moto import mock_aws
+    except ImportError:
+        raise SystemExit("--in-process needs moto: pip install moto")
+    os.environ.pop('AWS_ENDPOINT_URL', None)
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    aws_clients.reset_clients()
+    return mock_aws()
+
+def create_bucket(s3, name, region, objects):
+    """One bucket holding objects small keys under data/"""
+    if region == 'us-east-1':
+        s3.create_bucket(Bucket=name)  # us-east-1 rejects an explicit LocationConstraint
+    else:
+        s3.create_bucket(Bucket=name, CreateBucketConfiguration={'LocationConstraint': region})
+    for o in range(objects):
+        s3.put_object(Bucket=name, Key=f"data/{o:06}.bin", Body=b'x' * (o % 1024))
+
+def seed(buckets, objects, instances, region=aws_clients.DEFAULT_REGION, regions=()):
+    """Create buckets x objects in region and a batch of instances in every region"""
+    s3 = aws_clients.get_client('s3', region)
+    for b in range(buckets):
+        create_bucket(s3, f"bench-bucket-{b:04}", region, objects)
+
+    if instances:
+        for name in dict.fromkeys((region,) + tuple(regions)):
+            aws_clients.get_client('ec2', name).run_instances(
+                ImageId=BENCH_AMI, MinCount=instances, MaxCount=instances
+            )
+
+def time_calls(action, iterations):
+    """Run action repeatedly and return latency samples in milliseconds"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def summarize(samples):
+    """Mean/median/p95 of latency samples"""
+    ordered = sorted(samples)
+    return {
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'p50_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+    }
+
+# ====================== CLIENT REUSE ======================
+ACTIONS = {
+    's3 list_buckets': ('s3', lambda c: c.list_buckets()),
+    'ec2 describe_instances': ('ec2', lambda c: c.describe_instances()),
+    'ec2 describe_vpcs': ('ec2', lambda c: c.describe_vpcs()),
+}
+
+def bench_client_reuse(iterations):
+    """Fresh boto3.client() per action vs the shared registry client"""
+    results = []
+    for name, (service, call) in ACTIONS.items():
+        region = aws_clients.DEFAULT_REGION
+        fresh = time_calls(lambda: call(boto3.client(service, region_name=region)), iterations)
+        aws_clients.get_client(service)  # first build is not part of steady state
+        shared = time_calls(lambda: call(aws_clients.get_client(service)), iterations)
+
+        fresh_stats = summarize(fresh)
+        shared_stats = summarize(shared)
+        results.append({
+            'benchmark': 'client_reuse',
+            'action': name,
+            'fresh': fresh_stats,
+            'shared': shared_stats,
+            'saved_ms': round(fresh_stats['mean_ms'] - shared_stats['mean_ms'], 3),
+        })
+    return results
+
+# ====================== SYNC VS ASYNC ======================
+
+def run_status_check(argv):
+    """Run aws_status_check.main() and return its output without timings"""
+    # Each cron run is a fresh process, so both engines pay for client setup
+    aws_clients.reset_clients()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        aws_status_check.main(argv)
+    text = re.sub(r'STATUS CHECK - .*', 'STATUS CHECK', output.getvalue())
+    return re.sub(r'\d+\.\ds', '-', text)
+
+def bench_engines(runs, concurrency):
+    """Time the whole status check with the sync and async engines.
+
+    Doubles as a regression run: a section that failed ('❌' in the report)
+    or a difference between the engines' reports marks the rows as failing.
+    """
+    outputs = {}
+    results = []
+    for engine in ('sync', 'async'):
+        argv = ['--engine', engine, '--concurrency', str(concurrency)]
+        samples = time_calls(lambda: outputs.__setitem__(engine, run_status_check(argv)), runs)
+        results.append({'benchmark': 'engines', 'action': f"status check ({engine})", **summarize(samples),
+                        'errors': '❌' in outputs[engine]})
+
+    identical = outputs['sync'] == outputs['async']
+    for row in results:
+        row['identical_output'] = identical
+    return results
+
+# ====================== TOOL OPERATIONS ======================
+
+def run_quiet(action, answers=()):
+    """Run an interactive tool function with scripted input() answers and no output.
+
+    Only stdin/stdout are replaced: anything the user waits through (delays,
+    progress animations) is part of the timing. Returns False when the tool
+    reported an error.
+    """
+    replies = iter(answers)
+    output = io.StringIO()
+    with mock.patch('builtins.input', lambda prompt='': next(replies, '')), \
+            contextlib.redirect_stdout(output):
+        action()
+    return '❌' not in output.getvalue()
+
+def write_file(path, size):
+    """Create a file of size bytes (incompressible enough for checksums to matter)"""
+    with open(path, 'wb') as f:
+        chunk = os.urandom(min(size, 1024 * 1024))
+        while size > 0:
+            f.write(chunk[:size])
+            size -= len(chunk)
+    return path
+
+def bench_operation(name, prepare, iterations, items=0, unit=None):
+    """Time one tool operation; prepare(i) -> (action, answers) runs untimed before each call"""
+    samples = []
+    failures = 0
+    for i in range(iterations):
+        action, answers = prepare(i)
+        started = time.perf_counter()
+        ok = run_quiet(action, answers)
+        samples.append((time.perf_counter() - started) * 1000)
+        failures += not ok
+
+    row = {'benchmark': 'operations', 'action': name, 'iterations': iterations, **summarize(samples),
+           'failures': failures, 'items': items, 'unit': unit}
+    row['per_sec'] = round(items / (row['mean_ms'] / 1000), 1) if items and row['mean_ms'] else None
+    return row
+
+def bench_operations(args, regions):
+    """Every menu/status-check operation against the seeded stand-in"""
+    aws_cache.configure(enabled=False)   # time AWS calls, not cache hits
+    region = aws_clients.DEFAULT_REGION
+    s3 = aws_clients.get_client('s3', region)
+    ec2 = aws_clients.get_client('ec2', region)
+    iterations = args.op_iterations
+    bucket = 'bench-bucket-0000'
+    objects = args.buckets * args.objects
+    results = []
+
+    def fixed(action, *answers):
+        return lambda i: (action, answers)
+
+    # Read-only checks and listings
+    results.append(bench_operation('check_s3', fixed(aws_status_check.check_s3), iterations, objects, 'objects'))
+    results.append(bench_operation('check_ec2', fixed(aws_status_check.check_ec2), iterations,
+                                   args.instances, 'instances'))
+    if len(regions) > 1:
+        check_all = lambda: aws_status_check.main(['--regions', ','.join(regions)])
+        results.append(bench_operation('check_regions', fixed(check_all), iterations,
+                                       args.instances * len(regions), 'instances'))
+    results.append(bench_operation('ec2_list_instances', fixed(aws_master_tool.ec2_list_instances, ''),
+                                   iterations, args.instances, 'instances'))
+    if not args.buckets:
+        return results
+    results.append(bench_operation('s3_list_files', fixed(aws_master_tool.s3_list_files, bucket),
+                                   iterations, args.objects, 'objects'))
+
+    workdir = tempfile.mkdtemp(prefix='aws-bench-')
+    try:
+        # Upload paths: single PUT, multipart, folder, and a re-sync with nothing to send
+        small = write_file(os.path.join(workdir, 'small.bin'), 64 * 1024)
+        large = write_file(os.path.join(workdir, 'large.bin'), int(args.upload_mb * 1024 * 1024))
+        folder = os.path.join(workdir, 'folder')
+        os.makedirs(folder)
+        for n in range(args.folder_files):
+            write_file(os.path.join(folder, f"file-{n:04}.bin"), 4 * 1024)
+
+        results.append(bench_operation('s3_upload_file', fixed(aws_master_tool.s3_upload_file, bucket, small),
+                                       iterations, 64 / 1024, 'MB'))
+        results.append(bench_operation('s3_upload_multipart', fixed(aws_master_tool.s3_upload_file, bucket, large),
+                                       iterations, args.upload_mb, 'MB'))
+        results.append(bench_operation(
+            's3_upload_folder',
+            lambda i: (aws_master_tool.s3_upload_file, (bucket, folder, f"folder-{i}")),
+            iterations, args.folder_files, 'files'))
+        results.append(bench_operation('s3_sync_unchanged',
+                                       fixed(aws_master_tool.s3_upload_file, bucket, folder, 'folder-0'),
+                                       iterations, args.folder_files, 'files'))
+
+        target = os.path.join(workdir, 'download.bin')
+
+        def prepare_download(i):
+            if os.path.exists(target):
+                os.remove(target)
+            return aws_master_tool.s3_download_file, (bucket, 'large.bin', target)
+        results.append(bench_operation('s3_download_file', prepare_download, iterations, args.upload_mb, 'MB'))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # Lifecycle: stop then start every seeded instance (tracked until they get there)
+    instance_ids = [item['InstanceId'] for reservation in ec2.describe_instances()['Reservations']
+                    for item in reservation['Instances'] if item['State']['Name'] == 'running']
+    if instance_ids:
+        # Both prompts take the ID list, plus a y/N confirmation for more than one instance
+        answers = (' '.join(instance_ids),) + (('y',) if len(instance_ids) > 1 else ())
+
+        def stop_start():
+            aws_master_tool.ec2_stop_instance()
+            aws_master_tool.ec2_start_instance()
+        results.append(bench_operation('ec2_stop_start', fixed(stop_start, *answers * 2),
+                                       iterations, len(instance_ids), 'instances'))
+
+    # Deletion needs a fresh, full bucket every time (filled untimed)
+    def prepare_delete(i):
+        name = f"bench-delete-{i:04}"
+        create_bucket(s3, name, region, args.objects)
+        return aws_master_tool.s3_delete_bucket, (name, 'DELETE')
+    results.append(bench_operation('s3_delete_bucket', prepare_delete, iterations, args.objects, 'objects'))
+    return results
+
+# ====================== STARTUP ======================
+STARTUP_MODULE = 'aws_status_check'
+DEFAULT_IMPORT_TOP = 15
+
+# What a cron run does before its first API call: import the checker, build its clients
+STARTUP_SCRIPT = f"""
+import time
+started = time.perf_counter()
+import {STARTUP_MODULE}, aws_clients
+imported = time.perf_counter()
+aws_clients.get_client('s3')
+aws_clients.get_client('ec2')
+print(imported - started, time.perf_counter() - imported)
+"""
+
+# The real cron path: main() from interpreter start until it is about to send its first
+# API call (argument parsing, pool sizing, prewarm). That call is stopped before it leaves.
+MAIN_SCRIPT = f"""
+import contextlib, io, time
+started = time.perf_counter()
+import {STARTUP_MODULE}, aws_clients
+first_call = []
+instrument = aws_clients.instrument
+def stop_first_call(client, limit=True):
+    def before_call(**kwargs):
+        first_call.append(time.perf_counter())
+        raise RuntimeError("startup benchmark: no AWS calls")
+    client.meta.events.register('before-call', before_call)
+    return instrument(client, limit)
+aws_clients.instrument = stop_first_call
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    {STARTUP_MODULE}.main(['--format', 'ndjson'])
+print(min(first_call) - started)
+"""
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from python -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+def run_startup(env, importtime=False):
+    """One fresh interpreter running STARTUP_SCRIPT -> (import_ms, clients_ms, importtime stderr)"""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', STARTUP_SCRIPT]
+    done = subprocess.run(command, capture_output=True, text=True, env=env, check=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    imported, clients = (float(value) * 1000 for value in done.stdout.split())
+    return imported, clients, done.stderr
+
+def run_main(env):
+    """One fresh interpreter running MAIN_SCRIPT -> ms until main() sends its first API call"""
+    done = subprocess.run([sys.executable, '-c', MAIN_SCRIPT], capture_output=True, text=True, env=env,
+                          check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return float(done.stdout) * 1000
+
+def bench_startup(runs, top=DEFAULT_IMPORT_TOP):
+    """Cold-start time of the status checker with and without the service model cache,
+    plus the slowest imports according to python -X importtime"""
+    cache_dir = tempfile.mkdtemp(prefix='aws-bench-models-')
+    # Dummy keys: prewarm() resolves credentials, and a profile/IMDS lookup would swamp the timings
+    env = dict(os.environ, AWS_TOOL_CACHE_DIR=cache_dir, AWS_ACCESS_KEY_ID='bench', AWS_SECRET_ACCESS_KEY='bench')
+    results = []
+    try:
+        for label, overrides in (('no model cache', {'AWS_TOOL_MODEL_CACHE': '0'}), ('model cache', {})):
+            run_env = dict(env, **overrides)
+            if not overrides:
+                run_startup(run_env)   # the first run fills the cache
+            samples = [run_startup(run_env) for _ in range(runs)]
+            results.append({
+                'benchmark': 'startup',
+                'action': f"startup ({label})",
+                'import': summarize([sample[0] for sample in samples]),
+                'clients': summarize([sample[1] for sample in samples]),
+                'first_call': summarize([run_main(run_env) for _ in range(runs)]),
+                **summarize([sample[0] + sample[1] for sample in samples]),
+            })
+
+        modules = parse_importtime(run_startup(env, importtime=True)[2])
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    results.append({
+        'benchmark': 'importtime',
+        'action': STARTUP_MODULE,
+        'modules': len(modules),
+        'total_ms': round(sum(own for own, _ in modules.values()) / 1000, 3),
+        'slowest': [{'module': name, 'self_ms': own / 1000, 'cumulative_ms': cumulative / 1000}
+                    for name, (own, cumulative) in slowest],
+    })
+    return results
+
+# ====================== REPORT ======================
+
+def print_table(results):
+    """Human readable benchmark tables"""
+    reuse = [row for row in results if row['benchmark'] == 'client_reuse']
+    if reuse:
+        print(f"{'Action':<28} {'fresh ms':>10} {'shared ms':>10} {'saved ms':>10}")
+        print("-" * 61)
+        for row in reuse:
+            print(f"{row['action']:<28} {row['fresh']['mean_ms']:>10.2f} "
+                  f"{row['shared']['mean_ms']:>10.2f} {row['saved_ms']:>10.2f}")
+
+    engines = [row for row in results if row['benchmark'] == 'engines']
+    if engines:
+        print(f"\n{'Engine':<28} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        print("-" * 61)
+        for row in engines:
+            print(f"{row['action']:<28} {row['mean_ms']:>10.2f} {row['p50_ms']:>10.2f} {row['p95_ms']:>10.2f}")
+        print(f"Identical output: {'yes' if engines[0]['identical_output'] else 'NO'}")
+        for row in engines:
+            if row['errors']:
+                print(f"❌ {row['action']} reported failed checks")
+
+    operations = [row for row in results if row['benchmark'] == 'operations']
+    if operations:
+        print(f"\n{'Operation':<28} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'throughput':>18} {'fail':>5}")
+        print("-" * 86)
+        for row in operations:
+            rate = f"{row['per_sec']:,.1f} {row['unit']}/s" if row['per_sec'] is not None else '-'
+            print(f"{row['action']:<28} {row['mean_ms']:>10.2f} {row['p50_ms']:>10.2f} "
+                  f"{row['p95_ms']:>10.2f} {rate:>18} {row['failures']:>5}")
+
+    startup = [row for row in results if row['benchmark'] == 'startup']
+    if startup:
+        print(f"\n{'Startup (median)':<28} {'import ms':>10} {'clients ms':>10} {'total ms':>10} "
+              f"{'main() ms':>10}")
+        print("-" * 72)
+        for row in startup:
+            print(f"{row['action']:<28} {row['import']['p50_ms']:>10.2f} {row['clients']['p50_ms']:>10.2f} "
+                  f"{row['p50_ms']:>10.2f} {row['first_call']['p50_ms']:>10.2f}")
+        print("main() ms: a real status-check run until its first API call")
+
+    for row in results:
+        if row['benchmark'] == 'importtime':
+            print(f"\nSlowest imports ({row['modules']} modules, {row['total_ms']:.0f} ms in total)")
+            print(f"{'Module':<40} {'self ms':>10} {'cumul ms':>10}")
+            print("-" * 62)
+            for module in row['slowest']:
+                print(f"{module['module']:<40} {module['self_ms']:>10.2f} {module['cumulative_ms']:>10.2f}")
+
+def run_metadata(args):
+    """What was measured, so result files from different versions can be compared"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'boto3': boto3.__version__,
+        'stand_in': 'in-process' if args.in_process else args.endpoint_url,
+        'scale': {'buckets': args.buckets, 'objects': args.objects, 'instances': args.instances,
+                  'regions': args.regions, 'upload_mb': args.upload_mb, 'folder_files': args.folder_files},
+    }
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark tool operations against moto server")
+    parser.add_argument('--endpoint-url', default=os.environ.get('AWS_ENDPOINT_URL', DEFAULT_ENDPOINT),
+                        help="local AWS stand-in (moto server)")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help="calls per action")
+    parser.add_argument('--suite', default='clients',
+                        help=f"comma separated: {', '.join(SUITES)} (or 'all')")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS,
+                        help="full status-check runs per engine / fresh interpreters per startup variant")
+    parser.add_argument('--buckets', type=int, default=20, help="buckets to seed")
+    parser.add_argument('--objects', type=int, default=200, help="objects per bucket to seed")
+    parser.add_argument('--instances', type=int, default=50, help="instances to seed (per region)")
+    parser.add_argument('--regions', default=aws_clients.DEFAULT_REGION,
+                        help="comma separated regions to seed instances in (buckets go in the first)")
+    parser.add_argument('--op-iterations', type=int, default=DEFAULT_OP_ITERATIONS,
+                        help="runs per tool operation")
+    parser.add_argument('--upload-mb', type=float, default=20, help="size of the multipart upload/download file")
+    parser.add_argument('--folder-files', type=int, default=50, help="files in the uploaded folder")
+    parser.add_argument('--in-process', action='store_true',
+                        help="use moto's in-process mock instead of a moto server")
+    parser.add_argument('--concurrency', type=int, default=64, help="async engine concurrency")
+    parser.add_argument('--no-reset', action='store_true',
+                        help="keep the stand-in's current state instead of reset + seed")
+    parser.add_argument('--import-top', type=int, default=DEFAULT_IMPORT_TOP,
+                        help="slowest imports listed by the startup suite")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--output', help="also write results and run metadata to this JSON file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the benchmarks"""
+    args = parse_args(argv)
+    suites = SUITES if args.suite == 'all' else args.suite.split(',')
+    regions = [region.strip() for region in args.regions.split(',') if region.strip()]
+    aws_clients.set_default_region(regions[0])
+    aws_status_check.REGION = regions[0]
+
+    results = []
+    if 'startup' in suites:
+        # Runs first, in fresh interpreters: it makes no AWS calls
+        results += bench_startup(args.runs, args.import_top)
+    if not set(suites) - {'startup'}:
+        suites = ()
+
+    stand_in = use_in_process() if args.in_process else contextlib.nullcontext()
+    with stand_in if suites else contextlib.nullcontext():
+        if suites and not args.in_process:
+            use_endpoint(args.endpoint_url)
+        if suites and not args.no_reset:
+            if not args.in_process:
+                reset_stand_in(args.endpoint_url)
+            seed(args.buckets, args.objects, args.instances, regions[0], regions)
+
+        if 'clients' in suites:
+            results += bench_client_reuse(args.iterations)
+        if 'engines' in suites:
+            results += bench_engines(args.runs, args.concurrency)
+        if 'operations' in suites:
+            results += bench_operations(args, regions)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': run_metadata(args), 'results': results}, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    engines = [row for row in results if row['benchmark'] == 'engines']
+    if any(row['errors'] or not row['identical_output'] for row in engines):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
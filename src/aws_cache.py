@@ -0,0 +1,176 @@
+"""
+AWS Cache - Local on-disk cache for listing results
+Author: [Vishal Attri]
+Description: SQLite store of bucket, object and instance listings with per-resource TTLs
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import time
+
+from aws_records import BucketRecord, InstanceRecord, ObjectRecord
+
+# ====================== CACHE CONFIG ======================
+CACHE_DIR = os.environ.get(
+    'AWS_TOOL_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 's3-ec2-manager')
+)
+CACHE_FILE = 'listings.sqlite3'
+
+# Seconds a listing stays fresh (instances change state the most often)
+TTLS = {
+    'buckets': int(os.environ.get('AWS_TOOL_TTL_BUCKETS', 300)),
+    'objects': int(os.environ.get('AWS_TOOL_TTL_OBJECTS', 120)),
+    'instances': int(os.environ.get('AWS_TOOL_TTL_INSTANCES', 30)),
+}
+
+# Listings longer than this are streamed but never stored (one JSON row per listing)
+MAX_CACHED_RECORDS = int(os.environ.get('AWS_TOOL_CACHE_MAX_RECORDS', 10000))
+
+RECORD_TYPES = {
+    'buckets': BucketRecord,
+    'objects': ObjectRecord,
+    'instances': InstanceRecord,
+}
+
+_settings = {
+    'enabled': os.environ.get('AWS_TOOL_CACHE', '1') != '0',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    kind    TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    stored  REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+)
+"""
+
+# ====================== STORE ======================
+
+def configure(enabled=None):
+    """Turn the cache on or off for this process (--no-cache)"""
+    if enabled is not None:
+        _settings['enabled'] = enabled
+
+def cache_path():
+    """Full path of the SQLite file"""
+    return os.path.join(CACHE_DIR, CACHE_FILE)
+
+@contextlib.contextmanager
+def connect():
+    """Open the cache (creating it on first use), commit and close"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    connection = sqlite3.connect(cache_path(), timeout=5)
+    try:
+        with connection:
+            connection.execute(SCHEMA)
+            yield connection
+    finally:
+        connection.close()
+
+# A missing/locked/read-only cache only costs a normal API call
+CACHE_ERRORS = (sqlite3.Error, OSError)
+
+def cache_key(*parts):
+    """Key scoped to the AWS profile/endpoint so accounts never share entries"""
+    scope = os.environ.get('AWS_PROFILE', 'default')
+    endpoint = os.environ.get('AWS_ENDPOINT_URL')
+    if endpoint:
+        scope = f"{scope}@{endpoint}"
+    return '|'.join((scope,) + tuple(str(part) for part in parts))
+
+def load(kind, key):
+    """(records, age_seconds) for a fresh entry, or (None, None)"""
+    if not _settings['enabled']:
+        return None, None
+    try:
+        with connect() as connection:
+            row = connection.execute(
+                "SELECT stored, payload FROM listings WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+    except CACHE_ERRORS:
+        return None, None
+
+    if row is None:
+        return None, None
+    age = time.time() - row[0]
+    if age > TTLS[kind]:
+        return None, None
+    record_type = RECORD_TYPES[kind]
+    try:
+        return [record_type.from_dict(item) for item in json.loads(row[1])], age
+    except (ValueError, TypeError):
+        return None, None  # written by an older record layout
+
+def store(kind, key, records):
+    """Save a listing (errors are ignored: the cache is only a shortcut)"""
+    if not _settings['enabled']:
+        return
+    payload = json.dumps([record.to_dict() for record in records])
+    try:
+        with connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO listings (kind, key, stored, payload) VALUES (?, ?, ?, ?)",
+                (kind, key, time.time(), payload)
+            )
+    except CACHE_ERRORS:
+        pass
+
+def invalidate(kind, *parts):
+    """Drop the entry for cache_key(*parts) and every key below it"""
+    prefix = cache_key(*parts)
+    try:
+        with connect() as connection:
+            connection.execute(
+                "DELETE FROM listings WHERE kind = ? AND (key = ? OR substr(key, 1, ?) = ?)",
+                (kind, prefix, len(prefix) + 1, prefix + '|')
+            )
+    except CACHE_ERRORS:
+        pass
+
+def clear():
+    """Forget every cached listing (--refresh)"""
+    try:
+        with connect() as connection:
+            connection.execute("DELETE FROM listings")
+    except CACHE_ERRORS:
+        pass
+
+# ====================== LISTINGS ======================
+
+def cached(kind, key, fetch):
+    """(records, age_seconds) from the cache, else fetch() and store it (age None)"""
+    records, age = load(kind, key)
+    if records is not None:
+        return records, age
+    records = list(fetch())
+    store(kind, key, records)
+    return records, None
+
+def cached_stream(kind, key, fetch, limit=None):
+    """Like cached(), but a fresh listing comes back as an iterator that yields each record as
+    fetch() produces it. It is stored once exhausted, and only if it held at most limit
+    (MAX_CACHED_RECORDS) records, so a huge bucket is never buffered whole."""
+    records, age = load(kind, key)
+    if records is not None:
+        return records, age
+    return store_stream(kind, key, fetch(), MAX_CACHED_RECORDS if limit is None else limit), None
+
+def store_stream(kind, key, records, limit):
+    """Yield records, keeping a copy to store() until there are more than limit of them"""
+    kept = [] if _settings['enabled'] else None
+    for record in records:
+        if kept is not None:
+            kept.append(record)
+            if len(kept) > limit:
+                kept = None   # too big to cache: stop buffering, keep streaming
+        yield record
+    if kept is not None:
+        store(kind, key, kept)
+
+def format_age(age):
+    """Short note for listings served from the cache"""
+    return f"cached {age:.0f}s ago, start with --refresh to reload"
@@ -0,0 +1,318 @@
+"""
+AWS CLI - Non-interactive subcommands for the S3 and EC2 tools
+Author: [Vishal Attri]
+Description: argparse front end (s3 ls/put/get/mb/rb, ec2 ls/start/stop/terminate/launch) calling the
+             same operations as the menus, with no screen clearing, banners or progress sleeps
+"""
+
+import json
+import os
+import sys
+
+import aws_cache
+import aws_clients
+import ec2_bulk
+import s3_index
+import s3_purge
+import s3_transfer
+from aws_records import BucketRecord, ObjectRecord
+from ec2_inventory import iter_instances, parse_filter_expression
+from s3_listing import iter_objects_sharded
+
+# ====================== OUTPUT ======================
+PAST_TENSE = {'start': 'Started', 'stop': 'Stopped', 'terminate': 'Terminated'}
+
+def fail(message):
+    """Report an error on stderr and return the failing exit status"""
+    print(f"error: {message}", file=sys.stderr)
+    return 1
+
+def print_records(records, columns, as_json):
+    """One line per record: tab separated columns, or JSON objects with --json"""
+    for record in records:
+        if as_json:
+            print(json.dumps(record.to_dict()))
+        else:
+            values = (getattr(record, column) for column in columns)
+            print('\t'.join('' if value is None else str(value) for value in values))
+
+def report_summary(summary, verb):
+    """Per-instance lines for a bulk action; returns the exit status"""
+    for instance_id, previous, current in summary['changed']:
+        print(f"{instance_id}\t{previous}\t{current}")
+    for instance_id, code, message in summary['failed']:
+        print(f"error: {instance_id}: {code} {message}", file=sys.stderr)
+    print(f"{verb} {len(summary['changed'])} instance(s) in {summary['elapsed']:.2f}s", file=sys.stderr)
+    return 1 if summary['failed'] else 0
+
+# ====================== S3 COMMANDS ======================
+
+def s3_ls(args):
+    """List buckets, or the objects in one bucket"""
+    s3 = aws_clients.get_client('s3')
+    if not args.bucket:
+        buckets, _ = aws_cache.cached(
+            'buckets', aws_cache.cache_key(),
+            lambda: [BucketRecord.from_api(b) for b in s3.list_buckets()['Buckets']]
+        )
+        print_records(buckets, ('name', 'created'), args.json)
+        return 0
+
+    # Rows print as pages arrive; short listings are cached per bucket/prefix on the way through
+    prefix = args.prefix or ''
+    key = aws_cache.cache_key(args.bucket, prefix) if prefix else aws_cache.cache_key(args.bucket)
+    objects, _ = aws_cache.cached_stream(
+        'objects', key,
+        lambda: (ObjectRecord.from_api(item) for item in iter_objects_sharded(s3, args.bucket, prefix))
+    )
+    print_records(objects, ('key', 'size', 'last_modified'), args.json)
+    return 0
+
+def s3_mb(args):
+    """Create a bucket in the current region"""
+    s3 = aws_clients.get_client('s3')
+    region = aws_clients.DEFAULT_REGION
+    if region == 'us-east-1':
+        s3.create_bucket(Bucket=args.bucket)
+    else:
+        s3.create_bucket(Bucket=args.bucket, CreateBucketConfiguration={'LocationConstraint': region})
+    aws_cache.invalidate('buckets')
+    print(f"created\t{args.bucket}")
+    return 0
+
+def s3_rb(args):
+    """Empty (every version) and delete a bucket"""
+    if not args.yes:
+        return fail(f"deleting {args.bucket} removes every object in it; pass --yes to confirm")
+    s3 = aws_clients.get_client('s3')
+    summary = s3_purge.purge_bucket(s3, args.bucket, progress=False)
+    aws_cache.invalidate('objects', args.bucket)
+    for key, code, message in summary['failed']:
+        print(f"error: {key}: {code} {message}", file=sys.stderr)
+    if summary['failed']:
+        s3_index.mark_dirty(args.bucket)
+        return fail(f"{len(summary['failed'])} object(s) could not be deleted; bucket kept")
+    s3.delete_bucket(Bucket=args.bucket)
+    aws_cache.invalidate('buckets')
+    s3_index.drop_bucket(args.bucket)
+    print(f"deleted\t{args.bucket}\t{summary['deleted']} object version(s)")
+    return 0
+
+def s3_put(args):
+    """Upload a file, folder or glob"""
+    s3 = aws_clients.get_client('s3')
+    if s3_transfer.is_bulk_source(args.source):
+        try:
+            summary = s3_transfer.upload_tree(s3, args.source, args.bucket, args.prefix or '')
+        finally:
+            aws_cache.invalidate('objects', args.bucket)
+            s3_index.mark_dirty(args.bucket, args.prefix or '')
+        for path, error in summary['failed']:
+            print(f"error: {path}: {error}", file=sys.stderr)
+        print(s3_transfer.format_summary(summary), file=sys.stderr)
+        return 1 if summary['failed'] or not summary['files'] else 0
+
+    if not os.path.isfile(args.source):
+        return fail(f"file not found: {args.source}")
+    prefix = (args.prefix or '').strip('/')
+    key = args.key or '/'.join(part for part in (prefix, os.path.basename(args.source)) if part)
+    s3_transfer.upload_file(s3, args.source, args.bucket, key, progress=args.progress)
+    aws_cache.invalidate('objects', args.bucket)
+    s3_index.mark_dirty(args.bucket, s3_index.key_folder(key), recursive=False)
+    print(f"uploaded\ts3://{args.bucket}/{key}")
+    return 0
+
+def s3_get(args):
+    """Download an object (resumable, verified)"""
+    s3 = aws_clients.get_client('s3')
+    summary = s3_transfer.download_file(s3, args.bucket, args.key, args.dest, progress=args.progress)
+    print(f"downloaded\t{summary['filename']}\t{summary['bytes']}\t{summary['verified'] or 'unverified'}")
+    return 0
+
+def s3_analyze(args):
+    """Storage breakdown of a bucket (numpy is imported only here: it is an optional extra)"""
+    import s3_analytics
+
+    if args.top < 1:
+        return fail("--top must be at least 1")
+    s3 = aws_clients.get_client('s3')
+    report = s3_analytics.analyze_bucket(s3, args.bucket, args.prefix or '', args.source,
+                                         depth=args.depth, top=args.top)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        s3_analytics.print_report(report)
+    return 0
+
+# ====================== EC2 COMMANDS ======================
+
+def selection_filters(args):
+    """EC2 filters from --tag KEY=VALUE and --filter EXPRESSION"""
+    expression = ' '.join([f"tag:{tag}" for tag in args.tag or []] + ([args.filter] if args.filter else []))
+    return parse_filter_expression(expression) if expression else None
+
+def ec2_ls(args):
+    """List instances (optionally filtered)"""
+    ec2 = aws_clients.get_client('ec2')
+    filters = selection_filters(args)
+    if filters:
+        instances = iter_instances(ec2, filters)
+    else:
+        instances, _ = aws_cache.cached(
+            'instances', aws_cache.cache_key(ec2.meta.region_name, ''),
+            lambda: iter_instances(ec2)
+        )
+    print_records(instances, ('id', 'state', 'type', 'name', 'az'), args.json)
+    return 0
+
+def ec2_action(args):
+    """start / stop / terminate by IDs, ID file, tags or filter"""
+    ec2 = aws_clients.get_client('ec2')
+    ids = list(args.ids or [])
+    if args.file:
+        ids += ec2_bulk.read_id_file(args.file)
+    filters = selection_filters(args)
+    if not ids and not filters:
+        return fail("name instances by ID, --file, --tag or --filter")
+    if ids and filters:
+        return fail("give instance IDs or --tag/--filter, not both")
+    if args.action == 'terminate' and not args.yes:
+        return fail("terminate deletes instances permanently; pass --yes to confirm")
+
+    instance_ids = ec2_bulk.select_instances(ec2, args.action, ids or None, filters)
+    if not instance_ids:
+        print(f"no instances to {args.action}", file=sys.stderr)
+        return 0
+
+    summary = ec2_bulk.run_action(ec2, args.action, instance_ids, progress=False)
+    aws_cache.invalidate('instances', ec2.meta.region_name)
+    status = report_summary(summary, PAST_TENSE[args.action])
+    if args.wait and summary['changed']:
+        status = wait(ec2, [instance_id for instance_id, _, _ in summary['changed']], args.action,
+                      args.timeout) or status
+    return status
+
+def wait(ec2, instance_ids, action, timeout):
+    """Block until the instances reach the action's target state; returns the exit status"""
+    summary = ec2_bulk.wait_for_state(ec2, instance_ids, ec2_bulk.TARGET_STATES[action], timeout, progress=False)
+    aws_cache.invalidate('instances', ec2.meta.region_name)
+    for instance_id, state in summary['reached'].items():
+        print(f"{instance_id}\t{state}")
+    for instance_id, state in {**summary['failed'], **summary['pending']}.items():
+        print(f"error: {instance_id} is {state}", file=sys.stderr)
+    return 1 if summary['failed'] or summary['pending'] else 0
+
+def ec2_launch(args):
+    """Launch one instance (default subnet and Amazon Linux 2 AMI, as in the menu)"""
+    from aws_master_tool import get_available_subnet, get_default_ami
+
+    ec2 = aws_clients.get_client('ec2')
+    subnet_id = args.subnet or get_available_subnet()
+    if not subnet_id:
+        return fail("no subnet available")
+    launch = {
+        'ImageId': args.ami or get_default_ami(),
+        'InstanceType': args.type,
+        'MinCount': 1,
+        'MaxCount': 1,
+        'SubnetId': subnet_id,
+        'TagSpecifications': [{'ResourceType': 'instance', 'Tags': [{'Key': 'Name', 'Value': args.name}]}],
+    }
+    if args.key_name:
+        launch['KeyName'] = args.key_name
+    instance_id = ec2.run_instances(**launch)['Instances'][0]['InstanceId']
+    aws_cache.invalidate('instances', ec2.meta.region_name)
+    print(f"{instance_id}\tpending")
+    return wait(ec2, [instance_id], 'launch', args.timeout) if args.wait else 0
+
+# ====================== PARSERS ======================
+
+def add_s3_commands(subparsers):
+    """Register ls/mb/rb/put/get/analyze on an argparse subparsers object"""
+    ls = subparsers.add_parser('ls', help="list buckets, or the objects in BUCKET")
+    ls.add_argument('bucket', nargs='?')
+    ls.add_argument('--prefix', help="only keys under this prefix")
+    ls.add_argument('--json', action='store_true', help="one JSON object per line")
+    ls.set_defaults(func=s3_ls)
+
+    mb = subparsers.add_parser('mb', help="create a bucket")
+    mb.add_argument('bucket')
+    mb.set_defaults(func=s3_mb)
+
+    rb = subparsers.add_parser('rb', help="empty and delete a bucket")
+    rb.add_argument('bucket')
+    rb.add_argument('--yes', action='store_true', help="confirm deleting every object")
+    rb.set_defaults(func=s3_rb)
+
+    put = subparsers.add_parser('put', help="upload a file, folder or glob")
+    put.add_argument('source')
+    put.add_argument('bucket')
+    put.add_argument('--key', help="object key for a single file (default: file name)")
+    put.add_argument('--prefix', help="destination folder")
+    put.add_argument('--progress', action='store_true', help="show a progress bar")
+    put.set_defaults(func=s3_put)
+
+    get = subparsers.add_parser('get', help="download an object (resumes interrupted downloads)")
+    get.add_argument('bucket')
+    get.add_argument('key')
+    get.add_argument('dest', nargs='?')
+    get.add_argument('--progress', action='store_true', help="show a progress bar")
+    get.set_defaults(func=s3_get)
+
+    analyze = subparsers.add_parser('analyze', help="size by prefix, storage class and age; largest/small objects")
+    analyze.add_argument('bucket')
+    analyze.add_argument('--prefix', help="only keys under this prefix")
+    analyze.add_argument('--depth', type=int, default=1, help="prefix levels to group by (default 1)")
+    analyze.add_argument('--top', type=int, default=10, help="largest objects to show (default 10)")
+    analyze.add_argument('--source', choices=('auto', 'listing', 'index'), default='auto',
+                         help="read the local index (option 12) or list the bucket (default: index if built)")
+    analyze.add_argument('--json', action='store_true', help="the whole report as one JSON object")
+    analyze.set_defaults(func=s3_analyze)
+
+def add_selection(parser):
+    """--tag/--filter options shared by the EC2 commands"""
+    parser.add_argument('--tag', action='append', metavar='KEY=VALUE', help="match a tag (repeatable)")
+    parser.add_argument('--filter', help="filter expression, e.g. 'state=running type=t2.micro'")
+
+def add_ec2_commands(subparsers):
+    """Register ls/start/stop/terminate/launch on an argparse subparsers object"""
+    ls = subparsers.add_parser('ls', help="list instances")
+    add_selection(ls)
+    ls.add_argument('--json', action='store_true', help="one JSON object per line")
+    ls.set_defaults(func=ec2_ls)
+
+    for action in ec2_bulk.ACTIONS:
+        command = subparsers.add_parser(action, help=f"{action} instances by ID, file, tag or filter")
+        command.add_argument('ids', nargs='*', help="instance IDs")
+        command.add_argument('--file', help="file of instance IDs")
+        add_selection(command)
+        command.add_argument('--wait', action='store_true', help="return once every instance got there")
+        command.add_argument('--timeout', type=float, default=ec2_bulk.WAIT_TIMEOUT, help="seconds to --wait")
+        if action == 'terminate':
+            command.add_argument('--yes', action='store_true', help="confirm permanent deletion")
+        command.set_defaults(func=ec2_action, action=action)
+
+    launch = subparsers.add_parser('launch', help="launch an instance")
+    launch.add_argument('--name', required=True)
+    launch.add_argument('--type', default='t2.micro')
+    launch.add_argument('--ami', help="image ID (default: latest Amazon Linux 2)")
+    launch.add_argument('--subnet', help="subnet ID (default: first subnet of the default VPC)")
+    launch.add_argument('--key-name', help="EC2 key pair")
+    launch.add_argument('--wait', action='store_true', help="return once the instance is running")
+    launch.add_argument('--timeout', type=float, default=ec2_bulk.WAIT_TIMEOUT, help="seconds to --wait")
+    launch.set_defaults(func=ec2_launch)
+
+def add_region_option(parser):
+    """--region shared by every front end"""
+    parser.add_argument('--region', help=f"AWS region (default {aws_clients.DEFAULT_REGION})")
+
+def run(args):
+    """Run a parsed subcommand; returns the process exit status"""
+    if getattr(args, 'region', None):
+        aws_clients.set_default_region(args.region)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return fail("interrupted")
+    except Exception as e:
+        return fail(str(e))
@@ -0,0 +1,437 @@
+"""
+AWS Clients - Shared boto3 client registry
+Author: [Vishal Attri]
+Description: One lazily created client per (service, region), reused for the whole session,
+             with adaptive retries, a shared per-service rate limit and cached service models
+
+boto3/botocore are imported on first use rather than at import time, so
+scripts that never talk to AWS (--help, argument errors) start instantly
+and cron runs can prewarm() clients while they parse arguments.
+"""
+
+import hashlib
+import marshal
+import os
+import random
+import threading
+import time
+
+import aws_cache
+import aws_profile
+
+# ====================== CLIENT CONFIG ======================
+DEFAULT_REGION = os.environ.get('AWS_TOOL_REGION', 'ap-south-1')
+
+# Connection pool per client and TCP keep-alive (override via environment)
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_TOOL_MAX_POOL', 20))
+TCP_KEEPALIVE = os.environ.get('AWS_TOOL_TCP_KEEPALIVE', '1') != '0'
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+
+# botocore retries: 'adaptive' adds client-side rate limiting to 'standard'
+RETRY_MODE = os.environ.get('AWS_TOOL_RETRY_MODE', 'adaptive')
+MAX_ATTEMPTS = int(os.environ.get('AWS_TOOL_MAX_ATTEMPTS', 10))
+
+_settings = {
+    'max_pool_connections': MAX_POOL_CONNECTIONS,
+    'tcp_keepalive': TCP_KEEPALIVE,
+    'connect_timeout': CONNECT_TIMEOUT,
+    'read_timeout': READ_TIMEOUT,
+    'retries': {'mode': RETRY_MODE, 'max_attempts': MAX_ATTEMPTS},
+}
+
+# ====================== RATE LIMIT CONFIG ======================
+# Requests per second and burst per (service, region), shared by every
+# thread and tool in the process. EC2 meters API calls per account and
+# region with token buckets of roughly this size; S3 allows ~5,500 reads
+# per second per prefix. Override with e.g. AWS_TOOL_RATE_LIMITS="ec2=10/50,s3=3500".
+RATE_LIMITS = {
+    'ec2': (20.0, 100),
+    's3': (5500.0, 5500),
+    'ssm': (10.0, 40),
+}
+MIN_RATE = 1.0            # never throttle ourselves below this
+
+# Error codes AWS uses to say "slow down"
+THROTTLE_CODES = {
+    'Throttling', 'ThrottlingException', 'ThrottledException', 'RequestThrottled',
+    'RequestThrottledException', 'RequestLimitExceeded', 'TooManyRequestsException',
+    'SlowDown', 'EC2ThrottledException', 'BandwidthLimitExceeded', 'PriorRequestNotComplete',
+}
+
+# Parsed botocore service models, reused across runs (AWS_TOOL_MODEL_CACHE=0 disables)
+MODEL_CACHE = os.environ.get('AWS_TOOL_MODEL_CACHE', '1') != '0'
+MODEL_CACHE_DIR = os.path.join(aws_cache.CACHE_DIR, 'models')
+
+_session = None
+_clients = {}
+_creating = {}            # (service, region) -> lock held while that client is built
+_limiters = {}
+_stats = {}
+_cancelled = {}           # region -> abandoned scans still unwinding there
+_lock = threading.Lock()
+
+# ====================== REGISTRY ======================
+
+def configure(**settings):
+    """Change pool settings (max_pool_connections, tcp_keepalive, timeouts).
+
+    Clients built with the old settings are dropped so the next
+    get_client() call picks up the new ones.
+    """
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown client setting(s): {', '.join(sorted(unknown))}")
+
+    with _lock:
+        _settings.update({k: v for k, v in settings.items() if v is not None})
+        _clients.clear()
+
+def set_default_region(region):
+    """Region used by get_client() when none is given"""
+    global DEFAULT_REGION
+    DEFAULT_REGION = region
+
+def setting(name):
+    """Current value of one client setting (reads no botocore, unlike client_config())"""
+    return _settings[name]
+
+def client_config(settings=None):
+    """botocore Config built from the current settings (or the given ones)"""
+    from botocore.config import Config
+    return Config(**(settings or _settings))
+
+def get_session():
+    """Shared boto3 session (sessions are not thread safe to create clients from)"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import boto3.session
+                import botocore.session
+
+                core = botocore.session.get_session()
+                if MODEL_CACHE:
+                    core.register_component('data_loader', model_loader(core))
+                _session = boto3.session.Session(botocore_session=core)
+    return _session
+
+def get_client(service, region=None):
+    """Return the shared client for (service, region), creating it on first use"""
+    key = (service, region or DEFAULT_REGION)
+    client = _clients.get(key)
+    if client is None:
+        session = get_session()
+        with _lock:
+            creating = _creating.setdefault(key, threading.Lock())
+        # Built under its own lock: calls on other clients (whose hooks take _lock) never wait for it
+        with creating:
+            client = _clients.get(key)
+            if client is None:
+                settings = dict(_settings)
+                client = session.client(service, region_name=key[1], config=client_config(settings))
+                instrument(client)
+                with _lock:
+                    if _settings == settings:   # configure() ran meanwhile: don't keep a stale client
+                        _clients[key] = client
+    return client
+
+def reset_clients():
+    """Forget every cached client and the shared session"""
+    global _session
+    with _lock:
+        _clients.clear()
+        _session = None
+
+def prewarm(services, regions=None):
+    """Build clients (and resolve credentials) on a background thread.
+
+    Client creation is mostly model parsing and credential lookup, so doing
+    it while the caller parses arguments and prints headers hides most of it.
+    Returns the thread; get_client() calls made meanwhile simply wait for it.
+    """
+    def warm():
+        try:
+            get_session().get_credentials()
+            for region in regions or [None]:
+                for service in services:
+                    get_client(service, region)
+        except Exception:
+            pass  # the real call reports the error
+
+    thread = threading.Thread(target=warm, name='aws-prewarm', daemon=True)
+    thread.start()
+    return thread
+
+def cancel_region(region):
+    """Make every further call (and retry) to region's clients fail fast.
+
+    An abandoned region scan then unwinds after its in-flight calls instead
+    of running to the end (worker threads are joined when the process exits).
+    """
+    with _lock:
+        _cancelled[region] = _cancelled.get(region, 0) + 1
+
+def resume_region(region):
+    """Undo cancel_region() once the abandoned scan has finished"""
+    with _lock:
+        if _cancelled.get(region, 0) > 1:
+            _cancelled[region] -= 1
+        else:
+            _cancelled.pop(region, None)
+
+def check_cancelled(region):
+    if region in _cancelled:
+        raise TimeoutError(f"{region} scan abandoned after its timeout")
+
+# ====================== SERVICE MODEL CACHE ======================
+
+class ModelFileCache:
+    """botocore file loader that keeps each parsed model file as a marshal copy.
+
+    botocore gunzips and JSON-decodes every model it needs on every run
+    (3 MB for EC2); the marshal copy loads several times faster. Entries are
+    keyed on the source file's path, size and mtime, so a botocore upgrade
+    or a changed ~/.aws/models file is picked up automatically.
+    """
+
+    EXTENSIONS = ('.json', '.json.gz')
+
+    def __init__(self, file_loader, directory=MODEL_CACHE_DIR):
+        self.file_loader = file_loader
+        self.directory = directory
+
+    def exists(self, file_path):
+        return self.file_loader.exists(file_path)
+
+    def cache_path(self, file_path):
+        """Cache file for a model path, or None when no source file exists"""
+        versions = []
+        for ext in self.EXTENSIONS:
+            try:
+                stat = os.stat(file_path + ext)
+            except OSError:
+                continue
+            versions.append(f"{ext}:{stat.st_size}:{stat.st_mtime_ns}")
+        if not versions:
+            return None
+        key = hashlib.sha1('|'.join([file_path] + versions).encode()).hexdigest()
+        return os.path.join(self.directory, key + '.marshal')
+
+    def load_file(self, file_path):
+        cached = self.cache_path(file_path)
+        if cached is None:
+            return None
+        try:
+            with open(cached, 'rb') as f:
+                return marshal.loads(f.read())   # marshal.load() reads a file in tiny pieces
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        data = self.file_loader.load_file(file_path)
+        if data is not None:
+            self.save(cached, data)
+        return data
+
+    def save(self, cached, data):
+        """Write a marshal copy atomically (best effort: a read-only home just skips it)"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp = f"{cached}.{os.getpid()}.tmp"
+            with open(temp, 'wb') as f:
+                marshal.dump(plain(data), f)
+            os.replace(temp, cached)
+        except (OSError, ValueError):
+            pass
+
+def plain(value):
+    """Model data with OrderedDicts turned into dicts (marshal only takes builtin types)"""
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    return value
+
+def model_loader(core_session):
+    """botocore data loader that reads service models through ModelFileCache"""
+    from botocore.loaders import create_loader
+
+    loader = create_loader(core_session.get_config_variable('data_path'))
+    loader.file_loader = ModelFileCache(loader.file_loader)
+    return loader
+
+# ====================== RATE LIMITING ======================
+
+class TokenBucket:
+    """Thread safe token bucket that halves its rate on throttling and creeps back up"""
+
+    def __init__(self, rate, burst):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.last_cut = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until it is due; returns seconds waited"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens may go negative: each caller reserves its slot, then sleeps outside the lock
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def throttled(self):
+        """AWS said slow down: halve the rate (once per second at most)"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_cut >= 1.0:
+                self.rate = max(MIN_RATE, self.rate / 2)
+                self.tokens = min(self.tokens, 0.0)
+                self.last_cut = now
+
+    def succeeded(self):
+        """Win back 2% of the ceiling per successful call"""
+        if self.rate < self.max_rate:
+            with self.lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+def parse_rate_limits(text):
+    """'ec2=10/50,s3=3500' -> {'ec2': (10.0, 50), 's3': (3500.0, 3500)}"""
+    limits = {}
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        service, _, value = part.partition('=')
+        rate, _, burst = value.partition('/')
+        limits[service] = (float(rate), int(burst or max(1, float(rate))))
+    return limits
+
+RATE_LIMITS.update(parse_rate_limits(os.environ.get('AWS_TOOL_RATE_LIMITS', '')))
+
+def get_limiter(service, region):
+    """Shared TokenBucket for (service, region), or None when the service is unlimited"""
+    if service not in RATE_LIMITS:
+        return None
+    key = (service, region)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                limiter = _limiters[key] = TokenBucket(*RATE_LIMITS[service])
+    return limiter
+
+def backoff(attempt, base=0.2, cap=10.0):
+    """Sleep a full-jitter exponential delay before retry number attempt"""
+    time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+def is_throttle(code):
+    """True for error codes that mean the request rate is too high"""
+    return code in THROTTLE_CODES
+
+# ====================== COUNTERS ======================
+
+def _counters(service):
+    """Mutable counter dict for a service (created on first use)"""
+    counters = _stats.get(service)
+    if counters is None:
+        with _lock:
+            counters = _stats.setdefault(service, {'calls': 0, 'attempts': 0, 'throttles': 0, 'waited': 0.0})
+    return counters
+
+def _count(service, field, amount=1):
+    counters = _counters(service)
+    with _lock:
+        counters[field] += amount
+
+def record_throttle(client):
+    """Count a throttle reported inside a successful response (e.g. DeleteObjects per-key SlowDown)"""
+    service = client.meta.service_model.service_name
+    _count(service, 'throttles')
+    limiter = get_limiter(service, client.meta.region_name)
+    if limiter:
+        limiter.throttled()
+
+def instrument(client, limit=True):
+    """Hook a client's botocore events: count calls/retries/throttles, profile them
+    (when --profile is on) and, if limit, rate limit it.
+
+    Used by get_client(); call it on clients built elsewhere (e.g. the
+    async engine, with limit=False since a sleeping hook would block the loop).
+    """
+    service = client.meta.service_model.service_name
+    region = client.meta.region_name
+
+    def limiter():
+        return get_limiter(service, region) if limit else None
+
+    def before_call(**kwargs):
+        check_cancelled(region)
+        _count(service, 'calls')
+
+    def before_send(**kwargs):
+        # Fires once per HTTP attempt, so retries pay for a token too
+        check_cancelled(region)
+        _count(service, 'attempts')
+        bucket = limiter()
+        if bucket:
+            waited = bucket.acquire()
+            if waited:
+                _count(service, 'waited', waited)
+
+    def needs_retry(response=None, **kwargs):
+        if response is None:
+            return
+        bucket = limiter()
+        code = response[1].get('Error', {}).get('Code')
+        if code and is_throttle(code):
+            _count(service, 'throttles')
+            if bucket:
+                bucket.throttled()
+        elif bucket and not code:
+            bucket.succeeded()
+
+    events = client.meta.events
+    events.register('before-call', before_call)
+    events.register('before-send', before_send)
+    events.register('needs-retry', needs_retry)
+    aws_profile.attach(client)
+    return client
+
+def api_stats():
+    """{service: {calls, retries, throttles, waited, rate}} since the process started"""
+    with _lock:
+        stats = {}
+        for service, counters in _stats.items():
+            rates = [limiter.rate for (name, _), limiter in _limiters.items() if name == service]
+            stats[service] = {
+                'calls': counters['calls'],
+                'retries': max(0, counters['attempts'] - counters['calls']),
+                'throttles': counters['throttles'],
+                'waited': round(counters['waited'], 3),
+                'rate': min(rates) if rates else None,
+            }
+    return stats
+
+def format_api_stats(stats=None):
+    """One line per throttled/retried service, empty when every call went through first time"""
+    lines = []
+    for service, row in sorted((stats or api_stats()).items()):
+        if row['retries'] or row['throttles']:
+            rate = f", limit now {row['rate']:.0f}/s" if row['rate'] is not None else ""
+            lines.append(f"{service}: {row['calls']} calls, {row['retries']} retries, "
+                         f"{row['throttles']} throttled, {row['waited']:.1f}s rate-limited{rate}")
+    return lines
+
+def reset_stats():
+    """Zero the counters and restore every limiter to its full rate"""
+    with _lock:
+        _stats.clear()
+        _limiters.clear()
@@ -1,542 +1,964 @@
-"""
-AWS Master Tool - Manage S3 Storage & EC2 Servers
-Author: [Vishal Attri]
-Description: Single tool to manage both S3 and EC2 services with beautiful UI
-"""
-
-import boto3
-import os
-import sys
-import time
-from datetime import datetime
-
-# ====================== UI ENHANCEMENTS ======================
-
-class Colors:
-    """ANSI color codes for terminal"""
-    RED = '\033[91m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    MAGENTA = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
-    END = '\033[0m'
-
-def clear_screen():
-    """Clear terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def print_header():
-    """Display beautiful header"""
-    clear_screen()
-    print(Colors.CYAN + Colors.BOLD)
-    print("╔════════════════════════════════════════════════════════════╗")
-    print("║                  " + Colors.YELLOW + "AWS MASTER TOOL v2.0" + Colors.CYAN + "                    ║")
-    print("║            Manage S3 Storage & EC2 Servers                 ║")
-    print("╚════════════════════════════════════════════════════════════╝" + Colors.END)
-    print(f"\n📍 {Colors.YELLOW}Region: ap-south-1 (Mumbai){Colors.END}")
-    print(f"📅 {Colors.CYAN}{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Colors.END}")
-    print(f"💡 {Colors.GREEN}Tip: Stop EC2 instances when not in use to save costs{Colors.END}")
-    print(Colors.CYAN + "─" * 62 + Colors.END)
-
-def show_progress_bar(seconds=2, message="Processing"):
-    """Show animated progress bar"""
-    print(f"\n{Colors.BLUE}{message}...{Colors.END}")
-    sys.stdout.write("[")
-    for i in range(20):
-        time.sleep(seconds / 20)
-        sys.stdout.write("▓")
-        sys.stdout.flush()
-    sys.stdout.write("]\n")
-
-def print_success(msg):
-    """Print success message in green box"""
-    print(f"\n{Colors.GREEN}╔════════════════════════════════════════════════════════════╗")
-    print(f"║                    ✅ SUCCESS                         ║")
-    print(f"║    {msg:<52}   ║")
-    print(f"╚════════════════════════════════════════════════════════════╝{Colors.END}")
-
-def print_error(msg):
-    """Print error message in red box"""
-    print(f"\n{Colors.RED}╔════════════════════════════════════════════════════════════╗")
-    print(f"║                    ❌ ERROR                           ║")
-    print(f"║    {msg:<52}   ║")
-    print(f"╚════════════════════════════════════════════════════════════╝{Colors.END}")
-
-def print_warning(msg):
-    """Print warning message in yellow box"""
-    print(f"\n{Colors.YELLOW}╔════════════════════════════════════════════════════════════╗")
-    print(f"║                    ⚠️  WARNING                         ║")
-    print(f"║    {msg:<52}   ║")
-    print(f"╚════════════════════════════════════════════════════════════╝{Colors.END}")
-
-def print_menu_box():
-    """Display menu in a beautiful box"""
-    print(f"\n{Colors.MAGENTA}{Colors.BOLD}┌────────────────────────────────────────────────────────────┐")
-    print(f"│                    MAIN MENU                         │")
-    print(f"├────────────────────────────────────────────────────────────┤{Colors.END}")
-    
-    print(f"{Colors.CYAN}│  {Colors.BOLD}📦 S3 STORAGE MANAGEMENT{Colors.END}{Colors.CYAN}                              │")
-    print(f"│   {Colors.GREEN}1.{Colors.END} List all S3 buckets                              │")
-    print(f"│   {Colors.GREEN}2.{Colors.END} Create new S3 bucket                             │")
-    print(f"│   {Colors.GREEN}3.{Colors.END} Delete S3 bucket                                 │")
-    print(f"│   {Colors.GREEN}4.{Colors.END} Upload file to S3                                │")
-    print(f"│   {Colors.GREEN}5.{Colors.END} List files in bucket                             │")
-    
-    print(f"│                                                        │")
-    print(f"│  {Colors.BOLD}🖥️  EC2 SERVER MANAGEMENT{Colors.END}{Colors.CYAN}                               │")
-    print(f"│   {Colors.GREEN}6.{Colors.END} List all EC2 instances                           │")
-    print(f"│   {Colors.GREEN}7.{Colors.END} Create new EC2 instance                          │")
-    print(f"│   {Colors.GREEN}8.{Colors.END} Stop EC2 instance                                │")
-    print(f"│   {Colors.GREEN}9.{Colors.END} Start EC2 instance                               │")
-    print(f"│   {Colors.GREEN}10.{Colors.END} Delete EC2 instance                            │")
-    print(f"│                                                        │")
-    print(f"│   {Colors.RED}0.{Colors.END} Exit program                                      │")
-    print(f"└────────────────────────────────────────────────────────────┘{Colors.END}")
-
-# ====================== ENHANCED AWS FUNCTIONS ======================
-
-def s3_list_buckets():
-    """List all S3 buckets with beautiful display"""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}📁 LISTING S3 BUCKETS{Colors.END}")
-    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
-    
-    s3 = boto3.client('s3', region_name='ap-south-1')
-    
-    try:
-        response = s3.list_buckets()
-        buckets = response['Buckets']
-        
-        if buckets:
-            print(f"\n{Colors.GREEN}✅ Found {len(buckets)} S3 bucket(s):{Colors.END}")
-            print(f"{Colors.WHITE}┌────────────────────────────────────────────┐")
-            
-            for i, bucket in enumerate(buckets, 1):
-                creation_date = bucket['CreationDate'].strftime('%Y-%m-%d')
-                name = bucket['Name']
-                print(f"│ {Colors.YELLOW}{i:2}.{Colors.END} {name:<30} {Colors.CYAN}{creation_date}{Colors.END} │")
-            
-            print(f"└────────────────────────────────────────────┘{Colors.END}")
-        else:
-            print(f"\n{Colors.YELLOW}📭 No S3 buckets found{Colors.END}")
-            
-    except Exception as e:
-        print_error(f"Failed to list buckets: {str(e)}")
-
-def s3_create_bucket():
-    """Create a new S3 bucket with interactive UI"""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}➕ CREATE NEW S3 BUCKET{Colors.END}")
-    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
-    
-    s3 = boto3.client('s3', region_name='ap-south-1')
-    
-    name = input(f"\n{Colors.YELLOW}📝 Enter bucket name: {Colors.END}").strip().lower()
-    
-    if len(name) < 3 or len(name) > 63:
-        print_error("Bucket name must be 3-63 characters")
-        return
-    
-    show_progress_bar(2, "Creating bucket")
-    
-    try:
-        s3.create_bucket(
-            Bucket=name,
-            CreateBucketConfiguration={'LocationConstraint': 'ap-south-1'}
-        )
-        print_success(f"Created bucket: {Colors.BOLD}{name}{Colors.GREEN}")
-        print(f"{Colors.GREEN}🔗 URL: https://{name}.s3.ap-south-1.amazonaws.com{Colors.END}")
-        
-    except Exception as e:
-        print_error(f"Failed to create bucket: {str(e)}")
-
-def s3_delete_bucket():
-    """Delete an S3 bucket with confirmation"""
-    print(f"\n{Colors.RED}{Colors.BOLD}🗑️  DELETE S3 BUCKET{Colors.END}")
-    print(f"{Colors.RED}────────────────────────────────────────────{Colors.END}")
-    
-    s3 = boto3.client('s3', region_name='ap-south-1')
-    
-    name = input(f"\n{Colors.YELLOW}⚠️  Enter bucket name to delete: {Colors.END}").strip()
-    
-    # Confirm deletion
-    print_warning(f"This will PERMANENTLY delete bucket: {name}")
-    confirm = input(f"{Colors.RED}Type 'DELETE' to confirm: {Colors.END}").strip()
-    
-    if confirm == 'DELETE':
-        show_progress_bar(3, f"Deleting bucket {name}")
-        
-        try:
-            # First, empty the bucket
-            try:
-                objects = s3.list_objects_v2(Bucket=name)
-                if 'Contents' in objects:
-                    for obj in objects['Contents']:
-                        s3.delete_object(Bucket=name, Key=obj['Key'])
-            except:
-                pass
-            
-            # Then delete bucket
-            s3.delete_bucket(Bucket=name)
-            print_success(f"Deleted bucket: {Colors.BOLD}{name}{Colors.GREEN}")
-            
-        except Exception as e:
-            print_error(f"Failed to delete bucket: {str(e)}")
-    else:
-        print(f"\n{Colors.GREEN}✅ Deletion cancelled{Colors.END}")
-
-def s3_upload_file():
-    """Upload a file to S3 with progress"""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}⬆️  UPLOAD FILE TO S3{Colors.END}")
-    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
-    
-    s3 = boto3.client('s3', region_name='ap-south-1')
-    
-    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
-    filename = input(f"{Colors.YELLOW}📄 Enter file to upload: {Colors.END}").strip()
-    
-    if not os.path.exists(filename):
-        print_error(f"File not found: {filename}")
-        return
-    
-    file_size = os.path.getsize(filename)
-    size_mb = file_size / (1024 * 1024)
-    
-    print(f"\n{Colors.BLUE}📊 File: {filename}")
-    print(f"📦 Size: {size_mb:.2f} MB{Colors.END}")
-    
-    show_progress_bar(3, f"Uploading {filename}")
-    
-    try:
-        s3.upload_file(filename, bucket, os.path.basename(filename))
-        print_success(f"Uploaded {Colors.BOLD}{filename}{Colors.GREEN} to {Colors.BOLD}{bucket}{Colors.GREEN}")
-        
-    except Exception as e:
-        print_error(f"Upload failed: {str(e)}")
-
-def s3_list_files():
-    """List files in an S3 bucket with details"""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}📄 LIST FILES IN BUCKET{Colors.END}")
-    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
-    
-    s3 = boto3.client('s3', region_name='ap-south-1')
-    
-    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
-    
-    show_progress_bar(1, f"Scanning {bucket}")
-    
-    try:
-        files = s3.list_objects_v2(Bucket=bucket)
-        
-        if 'Contents' in files:
-            print(f"\n{Colors.GREEN}📁 Files in {Colors.BOLD}{bucket}{Colors.GREEN}:{Colors.END}")
-            print(f"{Colors.WHITE}┌────┬────────────────────────────┬─────────────────┐")
-            print(f"│ No │          File Name           │     Size       │")
-            print(f"├────┼────────────────────────────┼─────────────────┤")
-            
-            total_size = 0
-            for i, item in enumerate(files['Contents'], 1):
-                size = int(item['Size'])
-                total_size += size
-                size_str = f"{size/1024:.1f} KB" if size < 1024*1024 else f"{size/(1024*1024):.2f} MB"
-                
-                # Truncate long filenames
-                filename = item['Key']
-                if len(filename) > 25:
-                    filename = filename[:22] + "..."
-                
-                print(f"│ {i:2} │ {filename:<25} │ {size_str:<15} │")
-            
-            print(f"├────┼────────────────────────────┼─────────────────┤")
-            total_str = f"{total_size/(1024*1024):.2f} MB" if total_size > 0 else "0 B"
-            print(f"│    │ {Colors.YELLOW}Total:{Colors.END} {len(files['Contents']):2} files   │ {Colors.YELLOW}{total_str:<15}{Colors.END} │")
-            print(f"└────┴────────────────────────────┴─────────────────┘{Colors.END}")
-        else:
-            print(f"\n{Colors.YELLOW}📭 No files found in {bucket}{Colors.END}")
-            
-    except Exception as e:
-        print_error(f"Failed to list files: {str(e)}")
-
-def ec2_list_instances():
-    """List all EC2 instances with status colors"""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}🖥️  LIST EC2 INSTANCES{Colors.END}")
-    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
-    
-    ec2 = boto3.client('ec2', region_name='ap-south-1')
-    
-    try:
-        response = ec2.describe_instances()
-        instances = []
-        
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instances.append(instance)
-        
-        if instances:
-            print(f"\n{Colors.GREEN}✅ Found {len(instances)} EC2 instance(s):{Colors.END}")
-            print(f"{Colors.WHITE}┌────┬────────────────────┬──────────────────────┬──────────┐")
-            print(f"│ No │      Name          │      Instance ID     │  Status  │")
-            print(f"├────┼────────────────────┼──────────────────────┼──────────┤")
-            
-            for i, instance in enumerate(instances, 1):
-                # Get instance name from tags
-                name = "No Name"
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
-                            break
-                
-                state = instance['State']['Name']
-                instance_id = instance['InstanceId'][:19]
-                
-                # Color code status
-                if state == 'running':
-                    status_color = Colors.GREEN + "▶ Running" + Colors.END
-                elif state == 'stopped':
-                    status_color = Colors.RED + "⏹ Stopped" + Colors.END
-                elif state == 'pending':
-                    status_color = Colors.YELLOW + "⏳ Pending" + Colors.END
-                else:
-                    status_color = state
-                
-                # Truncate long names
-                if len(name) > 18:
-                    name = name[:15] + "..."
-                
-                print(f"│ {i:2} │ {name:<18} │ {instance_id:<20} │ {status_color:<8} │")
-            
-            print(f"└────┴────────────────────┴──────────────────────┴──────────┘{Colors.END}")
-            
-            # Show summary
-            running = sum(1 for i in instances if i['State']['Name'] == 'running')
-            stopped = sum(1 for i in instances if i['State']['Name'] == 'stopped')
-            print(f"\n{Colors.CYAN}📊 Summary: {Colors.GREEN}{running} running{Colors.END} | {Colors.RED}{stopped} stopped{Colors.END} | {len(instances)} total{Colors.END}")
-            
-        else:
-            print(f"\n{Colors.YELLOW}🖥️  No EC2 instances found{Colors.END}")
-            
-    except Exception as e:
-        print_error(f"Failed to list instances: {str(e)}")
-
-def get_available_subnet():
-    """Automatically find available subnet"""
-    try:
-        ec2 = boto3.client('ec2', region_name='ap-south-1')
-        
-        # Find default VPC
-        vpcs = ec2.describe_vpcs(Filters=[
-            {'Name': 'is-default', 'Values': ['true']}
-        ])
-        
-        if not vpcs['Vpcs']:
-            print_error("No default VPC found!")
-            return None
-            
-        vpc_id = vpcs['Vpcs'][0]['VpcId']
-        
-        # Find subnets in this VPC
-        subnets = ec2.describe_subnets(Filters=[
-            {'Name': 'vpc-id', 'Values': [vpc_id]}
-        ])
-        
-        if not subnets['Subnets']:
-            # Create a subnet if none exist
-            print(f"{Colors.YELLOW}Creating new subnet...{Colors.END}")
-            new_subnet = ec2.create_subnet(
-                VpcId=vpc_id,
-                CidrBlock='172.31.0.0/20',
-                AvailabilityZone='ap-south-1a'
-            )
-            return new_subnet['Subnet']['SubnetId']
-        
-        # Return first available subnet
-        return subnets['Subnets'][0]['SubnetId']
-        
-    except Exception as e:
-        print_error(f"Failed to get subnet: {str(e)}")
-        return None
-
-def ec2_create_instance():
-    """Create a new EC2 instance with options"""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}➕ CREATE NEW EC2 INSTANCE{Colors.END}")
-    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
-    
-    ec2 = boto3.client('ec2', region_name='ap-south-1')
-    
-    # Auto-detect subnet
-    subnet_id = get_available_subnet()
-    if not subnet_id:
-        print_error("Cannot create instance without subnet")
-        return
-    
-    name = input(f"\n{Colors.YELLOW}📝 Enter instance name: {Colors.END}").strip()
-    
-    print(f"\n{Colors.BLUE}Select instance type:{Colors.END}")
-    print(f"  {Colors.GREEN}1.{Colors.END} t2.micro (Free tier, 1 vCPU, 1GB RAM)")
-    print(f"  {Colors.GREEN}2.{Colors.END} t2.small (1 vCPU, 2GB RAM)")
-    print(f"  {Colors.GREEN}3.{Colors.END} t2.medium (2 vCPU, 4GB RAM)")
-    
-    choice = input(f"\n{Colors.YELLOW}Choose (1-3, default 1): {Colors.END}").strip()
-    
-    instance_types = ['t2.micro', 't2.small', 't2.medium']
-    instance_type = instance_types[0]  # default
-    
-    if choice == '2':
-        instance_type = 't2.small'
-    elif choice == '3':
-        instance_type = 't2.medium'
-    
-    print(f"\n{Colors.BLUE}Selected: {Colors.YELLOW}{instance_type}{Colors.END}")
-    print(f"{Colors.CYAN}📍 Auto-selected subnet: {subnet_id[:20]}...{Colors.END}")
-    
-    show_progress_bar(3, f"Launching {name}")
-    
-    try:
-        response = ec2.run_instances(
-            ImageId='ami-0f5ee92e2d63afc18',      # Amazon Linux 2 in Mumbai
-            InstanceType=instance_type,
-            MinCount=1,
-            MaxCount=1,
-            KeyName='MyWebServer-Key',
-            SubnetId=subnet_id,  # ← AUTO-SELECTED SUBNET
-            TagSpecifications=[{
-                'ResourceType': 'instance',
-                'Tags': [{'Key': 'Name', 'Value': name}]
-            }]
-        )
-        
-        instance_id = response['Instances'][0]['InstanceId']
-        print_success(f"Created instance: {Colors.BOLD}{name}{Colors.GREEN} ({instance_id})")
-        print(f"{Colors.GREEN}⏳ Instance is starting... (takes 2-3 minutes){Colors.END}")
-        print(f"{Colors.CYAN}💡 Check status with option 6 (List instances){Colors.END}")
-        
-    except Exception as e:
-        print_error(f"Failed to create instance: {str(e)}")
-
-def ec2_stop_instance():
-    """Stop an EC2 instance"""
-    print(f"\n{Colors.YELLOW}{Colors.BOLD}🛑 STOP EC2 INSTANCE{Colors.END}")
-    print(f"{Colors.YELLOW}────────────────────────────────────────────{Colors.END}")
-    
-    ec2 = boto3.client('ec2', region_name='ap-south-1')
-    
-    instance_id = input(f"\n{Colors.YELLOW}⚠️  Enter instance ID to stop: {Colors.END}").strip()
-    
-    show_progress_bar(2, f"Stopping {instance_id}")
-    
-    try:
-        ec2.stop_instances(InstanceIds=[instance_id])
-        print_success(f"Stopping {Colors.BOLD}{instance_id}{Colors.GREEN}")
-        print(f"{Colors.YELLOW}⏳ Takes about 1 minute to stop completely{Colors.END}")
-        
-    except Exception as e:
-        print_error(f"Failed to stop instance: {str(e)}")
-
-def ec2_start_instance():
-    """Start an EC2 instance"""
-    print(f"\n{Colors.GREEN}{Colors.BOLD}▶️  START EC2 INSTANCE{Colors.END}")
-    print(f"{Colors.GREEN}────────────────────────────────────────────{Colors.END}")
-    
-    ec2 = boto3.client('ec2', region_name='ap-south-1')
-    
-    instance_id = input(f"\n{Colors.YELLOW}🎬 Enter instance ID to start: {Colors.END}").strip()
-    
-    show_progress_bar(2, f"Starting {instance_id}")
-    
-    try:
-        ec2.start_instances(InstanceIds=[instance_id])
-        print_success(f"Starting {Colors.BOLD}{instance_id}{Colors.GREEN}")
-        print(f"{Colors.GREEN}⏳ Takes 1-2 minutes to be ready{Colors.END}")
-        
-    except Exception as e:
-        print_error(f"Failed to start instance: {str(e)}")
-
-def ec2_delete_instance():
-    """Delete an EC2 instance permanently"""
-    print(f"\n{Colors.RED}{Colors.BOLD}🗑️  DELETE EC2 INSTANCE{Colors.END}")
-    print(f"{Colors.RED}────────────────────────────────────────────{Colors.END}")
-    
-    ec2 = boto3.client('ec2', region_name='ap-south-1')
-    
-    instance_id = input(f"\n{Colors.YELLOW}⚠️  Enter instance ID to delete: {Colors.END}").strip()
-    
-    print_warning(f"This will PERMANENTLY DELETE instance: {instance_id}")
-    print_warning("All data will be lost!")
-    
-    confirm = input(f"\n{Colors.RED}Type 'DELETE' to confirm: {Colors.END}").strip()
-    
-    if confirm == 'DELETE':
-        show_progress_bar(4, f"Terminating {instance_id}")
-        
-        try:
-            ec2.terminate_instances(InstanceIds=[instance_id])
-            print_success(f"Deleting {Colors.BOLD}{instance_id}{Colors.GREEN}")
-            print(f"{Colors.RED}⏳ Takes 2-3 minutes to remove completely{Colors.END}")
-            
-        except Exception as e:
-            print_error(f"Failed to delete instance: {str(e)}")
-    else:
-        print(f"\n{Colors.GREEN}✅ Deletion cancelled{Colors.END}")
-
-def main():
-    """Main program loop"""
-    print_header()
-    
-    while True:
-        print_menu_box()
-        
-        try:
-            choice = input(f"\n{Colors.MAGENTA}🎯 Enter your choice (0-10): {Colors.END}").strip()
-        except KeyboardInterrupt:
-            print(f"\n\n{Colors.CYAN}👋 Goodbye! Thanks for using AWS Master Tool.{Colors.END}")
-            break
-        
-        # Exit
-        if choice == '0':
-            print(f"\n{Colors.CYAN}{Colors.BOLD}")
-            print("╔════════════════════════════════════════════════════════════╗")
-            print("║                    👋 GOODBYE!                           ║")
-            print("║         Thanks for using AWS Master Tool                ║")
-            print("╚════════════════════════════════════════════════════════════╝")
-            print(Colors.END)
-            break
-        
-        # S3 Operations
-        elif choice == '1':
-            s3_list_buckets()
-        elif choice == '2':
-            s3_create_bucket()
-        elif choice == '3':
-            s3_delete_bucket()
-        elif choice == '4':
-            s3_upload_file()
-        elif choice == '5':
-            s3_list_files()
-        
-        # EC2 Operations
-        elif choice == '6':
-            ec2_list_instances()
-        elif choice == '7':
-            ec2_create_instance()
-        elif choice == '8':
-            ec2_stop_instance()
-        elif choice == '9':
-            ec2_start_instance()
-        elif choice == '10':
-            ec2_delete_instance()
-        
-        # Invalid choice
-        else:
-            print_error("Please enter a number between 0 and 10")
-        
-        # Pause before showing menu again
-        if choice != '0':
-            input(f"\n{Colors.CYAN}↵ Press Enter to continue...{Colors.END}")
-            print_header()
-
-# Start the program
-if __name__ == "__main__":
+"""
+AWS Master Tool - Manage S3 Storage & EC2 Servers
+Author: [Vishal Attri]
+Description: Single tool to manage both S3 and EC2 services with beautiful UI
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import aws_cache
+import aws_cli
+import aws_profile
+import ec2_bulk
+import s3_index
+import s3_purge
+import s3_transfer
+import aws_clients
+from aws_clients import get_client
+from aws_regions import group_buckets_by_region, resolve_regions, scan_regions
+from aws_records import BucketRecord, ObjectRecord
+from ec2_inventory import iter_instances, parse_filter_expression
+from s3_listing import format_size, iter_objects_sharded
+
+# ====================== UI ENHANCEMENTS ======================
+
+class Colors:
+    """ANSI color codes for terminal"""
+    RED = '\033[91m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    MAGENTA = '\033[95m'
+    CYAN = '\033[96m'
+    WHITE = '\033[97m'
+    BOLD = '\033[1m'
+    UNDERLINE = '\033[4m'
+    END = '\033[0m'
+
+# Friendly names for the header
+REGION_NAMES = {
+    'ap-south-1': 'Mumbai',
+    'us-east-1': 'N. Virginia',
+    'us-west-2': 'Oregon',
+    'eu-west-1': 'Ireland',
+    'eu-central-1': 'Frankfurt',
+    'ap-southeast-1': 'Singapore',
+}
+
+def clear_screen():
+    """Clear terminal screen (ANSI escape, no 'clear' subprocess)"""
+    if sys.stdout.isatty():
+        sys.stdout.write("\033[2J\033[H")
+        sys.stdout.flush()
+
+def print_header():
+    """Display beautiful header"""
+    clear_screen()
+    print(Colors.CYAN + Colors.BOLD)
+    print("╔════════════════════════════════════════════════════════════╗")
+    print("║                  " + Colors.YELLOW + "AWS MASTER TOOL v2.0" + Colors.CYAN + "                    ║")
+    print("║            Manage S3 Storage & EC2 Servers                 ║")
+    print("╚════════════════════════════════════════════════════════════╝" + Colors.END)
+    region = aws_clients.DEFAULT_REGION
+    label = f" ({REGION_NAMES[region]})" if region in REGION_NAMES else ""
+    print(f"\n📍 {Colors.YELLOW}Region: {region}{label}{Colors.END}")
+    print(f"📅 {Colors.CYAN}{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Colors.END}")
+    print(f"💡 {Colors.GREEN}Tip: Stop EC2 instances when not in use to save costs{Colors.END}")
+    print(Colors.CYAN + "─" * 62 + Colors.END)
+
+def print_success(msg):
+    """Print success message in green box"""
+    print(f"\n{Colors.GREEN}╔════════════════════════════════════════════════════════════╗")
+    print(f"║                    ✅ SUCCESS                         ║")
+    print(f"║    {msg:<52}   ║")
+    print(f"╚════════════════════════════════════════════════════════════╝{Colors.END}")
+
+def print_error(msg):
+    """Print error message in red box"""
+    print(f"\n{Colors.RED}╔════════════════════════════════════════════════════════════╗")
+    print(f"║                    ❌ ERROR                           ║")
+    print(f"║    {msg:<52}   ║")
+    print(f"╚════════════════════════════════════════════════════════════╝{Colors.END}")
+
+def print_warning(msg):
+    """Print warning message in yellow box"""
+    print(f"\n{Colors.YELLOW}╔════════════════════════════════════════════════════════════╗")
+    print(f"║                    ⚠️  WARNING                         ║")
+    print(f"║    {msg:<52}   ║")
+    print(f"╚════════════════════════════════════════════════════════════╝{Colors.END}")
+
+def print_menu_box():
+    """Display menu in a beautiful box"""
+    print(f"\n{Colors.MAGENTA}{Colors.BOLD}┌────────────────────────────────────────────────────────────┐")
+    print(f"│                    MAIN MENU                         │")
+    print(f"├────────────────────────────────────────────────────────────┤{Colors.END}")
+    
+    print(f"{Colors.CYAN}│  {Colors.BOLD}📦 S3 STORAGE MANAGEMENT{Colors.END}{Colors.CYAN}                              │")
+    print(f"│   {Colors.GREEN}1.{Colors.END} List all S3 buckets                              │")
+    print(f"│   {Colors.GREEN}2.{Colors.END} Create new S3 bucket                             │")
+    print(f"│   {Colors.GREEN}3.{Colors.END} Delete S3 bucket                                 │")
+    print(f"│   {Colors.GREEN}4.{Colors.END} Upload file to S3                                │")
+    print(f"│   {Colors.GREEN}5.{Colors.END} List files in bucket                             │")
+    print(f"│   {Colors.GREEN}12.{Colors.END} Search bucket index                            │")
+    print(f"│   {Colors.GREEN}13.{Colors.END} Download file from S3                          │")
+    print(f"│   {Colors.GREEN}14.{Colors.END} Storage analytics                              │")
+    
+    print(f"│                                                        │")
+    print(f"│  {Colors.BOLD}🖥️  EC2 SERVER MANAGEMENT{Colors.END}{Colors.CYAN}                               │")
+    print(f"│   {Colors.GREEN}6.{Colors.END} List all EC2 instances                           │")
+    print(f"│   {Colors.GREEN}7.{Colors.END} Create new EC2 instance                          │")
+    print(f"│   {Colors.GREEN}8.{Colors.END} Stop EC2 instance                                │")
+    print(f"│   {Colors.GREEN}9.{Colors.END} Start EC2 instance                               │")
+    print(f"│   {Colors.GREEN}10.{Colors.END} Delete EC2 instance                            │")
+    print(f"│                                                        │")
+    print(f"│  {Colors.BOLD}🌍 REGIONS{Colors.END}{Colors.CYAN}                                            │")
+    print(f"│   {Colors.GREEN}11.{Colors.END} Multi-region overview                          │")
+    print(f"│   {Colors.GREEN}R.{Colors.END} Switch region                                    │")
+    print(f"│                                                        │")
+    print(f"│   {Colors.RED}0.{Colors.END} Exit program                                      │")
+    print(f"└────────────────────────────────────────────────────────────┘{Colors.END}")
+
+# ====================== ENHANCED AWS FUNCTIONS ======================
+
+def s3_list_buckets():
+    """List all S3 buckets with beautiful display"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}📁 LISTING S3 BUCKETS{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    try:
+        buckets, age = aws_cache.cached(
+            'buckets', aws_cache.cache_key(),
+            lambda: [BucketRecord.from_api(b) for b in s3.list_buckets()['Buckets']]
+        )
+        
+        if buckets:
+            print(f"\n{Colors.GREEN}✅ Found {len(buckets)} S3 bucket(s):{Colors.END}")
+            print(f"{Colors.WHITE}┌────────────────────────────────────────────┐")
+            
+            for i, bucket in enumerate(buckets, 1):
+                creation_date = bucket.created.strftime('%Y-%m-%d')
+                name = bucket.name
+                print(f"│ {Colors.YELLOW}{i:2}.{Colors.END} {name:<30} {Colors.CYAN}{creation_date}{Colors.END} │")
+            
+            print(f"└────────────────────────────────────────────┘{Colors.END}")
+        else:
+            print(f"\n{Colors.YELLOW}📭 No S3 buckets found{Colors.END}")
+        
+        if age is not None:
+            print(f"{Colors.CYAN}🕒 {aws_cache.format_age(age)}{Colors.END}")
+            
+    except Exception as e:
+        print_error(f"Failed to list buckets: {str(e)}")
+
+def s3_create_bucket():
+    """Create a new S3 bucket with interactive UI"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}➕ CREATE NEW S3 BUCKET{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    name = input(f"\n{Colors.YELLOW}📝 Enter bucket name: {Colors.END}").strip().lower()
+    
+    if len(name) < 3 or len(name) > 63:
+        print_error("Bucket name must be 3-63 characters")
+        return
+    
+    region = aws_clients.DEFAULT_REGION
+    
+    try:
+        # us-east-1 is the one region that rejects an explicit LocationConstraint
+        if region == 'us-east-1':
+            s3.create_bucket(Bucket=name)
+        else:
+            s3.create_bucket(
+                Bucket=name,
+                CreateBucketConfiguration={'LocationConstraint': region}
+            )
+        aws_cache.invalidate('buckets')
+        print_success(f"Created bucket: {Colors.BOLD}{name}{Colors.GREEN}")
+        print(f"{Colors.GREEN}🔗 URL: https://{name}.s3.{region}.amazonaws.com{Colors.END}")
+        
+    except Exception as e:
+        print_error(f"Failed to create bucket: {str(e)}")
+
+def s3_delete_bucket():
+    """Delete an S3 bucket with confirmation"""
+    print(f"\n{Colors.RED}{Colors.BOLD}🗑️  DELETE S3 BUCKET{Colors.END}")
+    print(f"{Colors.RED}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    name = input(f"\n{Colors.YELLOW}⚠️  Enter bucket name to delete: {Colors.END}").strip()
+    
+    # Confirm deletion
+    print_warning(f"This will PERMANENTLY delete bucket: {name}")
+    confirm = input(f"{Colors.RED}Type 'DELETE' to confirm: {Colors.END}").strip()
+    
+    if confirm == 'DELETE':
+        print(f"\n{Colors.BLUE}Emptying bucket {name}...{Colors.END}")
+        
+        try:
+            # First, empty the bucket (every version and delete marker)
+            summary = s3_purge.purge_bucket(s3, name)
+            aws_cache.invalidate('objects', name)
+            s3_index.mark_dirty(name)
+            print(f"{Colors.CYAN}📊 Removed {summary['deleted']:,} object version(s) in "
+                  f"{summary['elapsed']:.1f}s ({summary['per_sec']:,.0f}/s){Colors.END}")
+            
+            if summary['failed']:
+                for key, code, message in summary['failed'][:10]:
+                    print(f"{Colors.RED}  ✗ {key}: {code} {message}{Colors.END}")
+                print_error(f"{len(summary['failed'])} object(s) could not be deleted")
+                return
+            
+            # Then delete bucket
+            s3.delete_bucket(Bucket=name)
+            aws_cache.invalidate('buckets')
+            s3_index.drop_bucket(name)
+            print_success(f"Deleted bucket: {Colors.BOLD}{name}{Colors.GREEN}")
+            
+        except Exception as e:
+            print_error(f"Failed to delete bucket: {str(e)}")
+    else:
+        print(f"\n{Colors.GREEN}✅ Deletion cancelled{Colors.END}")
+
+def s3_upload_file():
+    """Upload a file to S3 with progress"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}⬆️  UPLOAD FILE TO S3{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
+    filename = input(f"{Colors.YELLOW}📄 Enter file, folder or glob to upload: {Colors.END}").strip()
+    
+    if s3_transfer.is_bulk_source(filename):
+        s3_upload_tree(s3, bucket, filename)
+        return
+    
+    if not os.path.exists(filename):
+        print_error(f"File not found: {filename}")
+        return
+    
+    file_size = os.path.getsize(filename)
+    size_mb = file_size / (1024 * 1024)
+    
+    print(f"\n{Colors.BLUE}📊 File: {filename}")
+    print(f"📦 Size: {size_mb:.2f} MB{Colors.END}\n")
+    
+    try:
+        # Multipart/parallel parts above the part size; bar follows real bytes sent
+        s3_transfer.upload_file(s3, filename, bucket, os.path.basename(filename))
+        aws_cache.invalidate('objects', bucket)
+        s3_index.mark_dirty(bucket, s3_index.key_folder(os.path.basename(filename)), recursive=False)
+        print_success(f"Uploaded {Colors.BOLD}{filename}{Colors.GREEN} to {Colors.BOLD}{bucket}{Colors.GREEN}")
+        
+    except Exception as e:
+        print_error(f"Upload failed: {str(e)}")
+
+def s3_download_file():
+    """Download an object with parallel byte ranges (resumes interrupted downloads)"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}⬇️  DOWNLOAD FILE FROM S3{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
+    key = input(f"{Colors.YELLOW}📄 Enter file key: {Colors.END}").strip()
+    filename = input(f"{Colors.YELLOW}💾 Save as (Enter for {os.path.basename(key)}): {Colors.END}").strip()
+    filename = filename or os.path.basename(key)
+    
+    if os.path.exists(s3_transfer.state_path(filename)):
+        print(f"{Colors.CYAN}♻️  Resuming an earlier download of {filename}{Colors.END}")
+    
+    try:
+        summary = s3_transfer.download_file(s3, bucket, key, filename)
+    except KeyboardInterrupt:
+        print_warning("Download interrupted - run it again to resume")
+        return
+    except Exception as e:
+        print_error(f"Download failed: {str(e)}")
+        return
+    
+    print(f"\n{Colors.CYAN}📊 {summary['bytes'] / s3_transfer.MB:.2f} MB in {summary['parts']} range(s), "
+          f"{summary['elapsed']:.1f}s ({summary['mb_per_sec']:.1f} MB/s){Colors.END}")
+    if summary['resumed_bytes']:
+        print(f"{Colors.CYAN}♻️  {summary['resumed_bytes'] / s3_transfer.MB:.2f} MB were already on disk{Colors.END}")
+    if summary['verified'] == s3_transfer.UNVERIFIABLE:
+        print_warning("S3 reports no ETag/checksum this tool can check for this object")
+    elif summary['verified']:
+        print(f"{Colors.GREEN}🔒 Verified against the object's {summary['verified'].upper()}{Colors.END}")
+    print_success(f"Downloaded {Colors.BOLD}{key}{Colors.GREEN} to {Colors.BOLD}{filename}{Colors.GREEN}")
+
+def s3_upload_tree(s3, bucket, source):
+    """Upload a folder or glob, skipping files already in the bucket"""
+    prefix = input(f"{Colors.YELLOW}📁 Destination prefix (optional): {Colors.END}").strip()
+    
+    print(f"\n{Colors.BLUE}📊 Syncing {source} → s3://{bucket}/{prefix}{Colors.END}")
+    
+    try:
+        summary = s3_transfer.upload_tree(s3, source, bucket, prefix)
+    except Exception as e:
+        print_error(f"Upload failed: {str(e)}")
+        return
+    finally:
+        aws_cache.invalidate('objects', bucket)
+        s3_index.mark_dirty(bucket, prefix)
+    
+    if summary['files'] == 0:
+        print_warning(f"No files matched: {source}")
+        return
+    
+    for path, error in summary['failed'][:10]:
+        print(f"{Colors.RED}  ✗ {path}: {error}{Colors.END}")
+    
+    print(f"\n{Colors.CYAN}📊 {s3_transfer.format_summary(summary)}{Colors.END}")
+    if summary['failed']:
+        print_error(f"{len(summary['failed'])} file(s) failed to upload")
+    else:
+        print_success(f"Synced {summary['files']} file(s) to {Colors.BOLD}{bucket}{Colors.GREEN}")
+
+LIST_ROWS = 1000          # rows printed by "List files"; totals cover every object
+
+def s3_list_files():
+    """List files in an S3 bucket with details"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}📄 LIST FILES IN BUCKET{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
+    
+    def scan():
+        # Whole bucket, folders listed concurrently and merged back into key order
+        print(f"\n{Colors.BLUE}Scanning {bucket}...{Colors.END}")
+        return (ObjectRecord.from_api(item) for item in iter_objects_sharded(s3, bucket))
+    
+    try:
+        # Cache hits answer straight away; a real listing prints rows as its pages arrive
+        objects, age = aws_cache.cached_stream('objects', aws_cache.cache_key(bucket), scan)
+        
+        count = total_size = 0
+        for item in objects:
+            if count == 0:
+                print(f"\n{Colors.GREEN}📁 Files in {Colors.BOLD}{bucket}{Colors.GREEN}:{Colors.END}")
+                print(f"{Colors.WHITE}┌────┬────────────────────────────┬─────────────────┐")
+                print(f"│ No │          File Name           │     Size       │")
+                print(f"├────┼────────────────────────────┼─────────────────┤")
+            count += 1
+            total_size += item.size
+            if count > LIST_ROWS:
+                continue   # past the table: only the totals still count
+            
+            size = item.size
+            size_str = f"{size/1024:.1f} KB" if size < 1024*1024 else f"{size/(1024*1024):.2f} MB"
+            
+            # Truncate long filenames
+            filename = item.key
+            if len(filename) > 25:
+                filename = filename[:22] + "..."
+            
+            print(f"│ {count:2} │ {filename:<25} │ {size_str:<15} │")
+        
+        if count:
+            if count > LIST_ROWS:
+                print(f"│ .. │ {f'... {count - LIST_ROWS:,} more':<25} │ {'':<15} │")
+            print(f"├────┼────────────────────────────┼─────────────────┤")
+            total_str = f"{total_size/(1024*1024):.2f} MB" if total_size > 0 else "0 B"
+            print(f"│    │ {Colors.YELLOW}Total:{Colors.END} {count:2} files   │ {Colors.YELLOW}{total_str:<15}{Colors.END} │")
+            print(f"└────┴────────────────────────────┴─────────────────┘{Colors.END}")
+        else:
+            print(f"\n{Colors.YELLOW}📭 No files found in {bucket}{Colors.END}")
+        
+        if age is not None:
+            print(f"{Colors.CYAN}🕒 {aws_cache.format_age(age)}{Colors.END}")
+            
+    except Exception as e:
+        print_error(f"Failed to list files: {str(e)}")
+
+INDEX_ROWS = 20           # matches shown by the index search
+
+def s3_search_index():
+    """Query a local index of a bucket (built once, then refreshed incrementally)"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}🔍 SEARCH BUCKET INDEX{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
+    
+    try:
+        info = s3_index.index_info(bucket)
+        if info is not None:
+            age = (time.time() - info['built']) / 3600
+            rebuild = input(f"{Colors.YELLOW}♻️  Index built {age:.1f}h ago from {info['source']}. "
+                            f"Rebuild? (y/N): {Colors.END}").strip().lower() == 'y'
+        
+        if info is None or rebuild:
+            manifest = input(f"{Colors.YELLOW}🗂️  S3 Inventory manifest.json (s3://...), "
+                             f"Enter to list the bucket: {Colors.END}").strip()
+            if manifest:
+                print(f"\n{Colors.BLUE}Loading inventory {manifest}...{Colors.END}")
+                summary = s3_index.ingest_inventory(s3, manifest)
+                bucket = summary['bucket']
+            else:
+                print(f"\n{Colors.BLUE}Indexing {bucket} in parallel...{Colors.END}")
+                summary = s3_index.build_index(s3, bucket)
+                print(f"{Colors.CYAN}📊 {summary['partitions']} partition(s) listed concurrently{Colors.END}")
+            print_success(f"Indexed {summary['objects']:,} object(s) in {summary['elapsed']:.1f}s")
+        elif info['dirty']:
+            summary = s3_index.refresh_index(s3, bucket)
+            print(f"{Colors.CYAN}♻️  Re-listed {summary['prefixes']} changed prefix(es): "
+                  f"{summary['objects']:,} object(s) in {summary['elapsed']:.1f}s{Colors.END}")
+        
+        expression = input(f"\n{Colors.YELLOW}🔎 Query (e.g. prefix=logs/ min=1MB max=1GB older=30d newer=7d, "
+                           f"Enter for all): {Colors.END}").strip()
+        conditions = s3_index.parse_query(expression)
+        
+        started = time.perf_counter()
+        count, total_size = s3_index.summarize(bucket, **conditions)
+        matches = list(s3_index.query(bucket, limit=INDEX_ROWS, **conditions))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        if not matches:
+            print(f"\n{Colors.YELLOW}📭 No objects match in {bucket}{Colors.END}")
+            return
+        
+        print(f"\n{Colors.WHITE}┌────┬──────────────────────────────────┬────────────┬────────────┐")
+        print(f"│ No │             Key                  │    Size    │  Modified  │")
+        print(f"├────┼──────────────────────────────────┼────────────┼────────────┤")
+        for i, item in enumerate(matches, 1):
+            key = item.key if len(item.key) <= 32 else "..." + item.key[-29:]
+            modified = item.last_modified.strftime('%Y-%m-%d') if item.last_modified else '-'
+            print(f"│ {i:2} │ {key:<32} │ {format_size(item.size):>10} │ {modified:<10} │")
+        print(f"└────┴──────────────────────────────────┴────────────┴────────────┘{Colors.END}")
+        
+        print(f"\n{Colors.GREEN}✅ {count:,} matching object(s), {format_size(total_size)} "
+              f"(showing {len(matches)}, answered in {elapsed_ms:.0f} ms){Colors.END}")
+        
+    except Exception as e:
+        print_error(f"Index search failed: {str(e)}")
+
+def s3_storage_analytics():
+    """Size by prefix, storage class and age, plus the largest and smallest objects of a bucket"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}📊 STORAGE ANALYTICS{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    s3 = get_client('s3')
+    
+    bucket = input(f"\n{Colors.YELLOW}📦 Enter bucket name: {Colors.END}").strip()
+    prefix = input(f"{Colors.YELLOW}📁 Prefix (Enter for the whole bucket): {Colors.END}").strip()
+    depth = input(f"{Colors.YELLOW}🔢 Prefix levels to group by (default 1): {Colors.END}").strip()
+    
+    try:
+        import s3_analytics  # numpy is an optional extra, loaded only for this option
+        
+        source = 'the local index' if s3_index.index_info(bucket) else 'a parallel listing'
+        print(f"\n{Colors.BLUE}Analyzing {bucket} from {source}...{Colors.END}")
+        report = s3_analytics.analyze_bucket(s3, bucket, prefix, depth=int(depth) if depth else 1)
+        
+        if not report['objects']:
+            print(f"\n{Colors.YELLOW}📭 No objects in s3://{bucket}/{prefix}{Colors.END}")
+            return
+        
+        print(Colors.WHITE)
+        s3_analytics.print_report(report)
+        print(Colors.END, end='')
+        print_success(f"{report['objects']:,} object(s) analyzed in "
+                      f"{report['load_seconds'] + report['analyze_seconds']:.1f}s")
+        
+    except Exception as e:
+        print_error(f"Storage analytics failed: {str(e)}")
+
+def ec2_list_instances():
+    """List all EC2 instances with status colors"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}🖥️  LIST EC2 INSTANCES{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    ec2 = get_client('ec2')
+    
+    expression = input(f"\n{Colors.YELLOW}🔎 Filter (e.g. state=running tag:env=dev type=t2.micro, Enter for all): {Colors.END}").strip()
+    
+    try:
+        filters = parse_filter_expression(expression)
+        running = stopped = total = 0
+        
+        key = aws_cache.cache_key(aws_clients.DEFAULT_REGION, ' '.join(expression.split()))
+        instances, age = aws_cache.load('instances', key)
+        fetched = []
+        if instances is None:
+            # Rows are printed as each page arrives and kept for the cache
+            instances = iter_instances(ec2, filters)
+        
+        for i, instance in enumerate(instances, 1):
+            if age is None:
+                fetched.append(instance)
+            if i == 1:
+                print(f"\n{Colors.WHITE}┌────┬────────────────────┬──────────────────────┬──────────┐")
+                print(f"│ No │      Name          │      Instance ID     │  Status  │")
+                print(f"├────┼────────────────────┼──────────────────────┼──────────┤")
+            
+            name = instance.name
+            state = instance.state
+            instance_id = instance.id[:19]
+            total = i
+            
+            # Color code status
+            if state == 'running':
+                running += 1
+                status_color = Colors.GREEN + "▶ Running" + Colors.END
+            elif state == 'stopped':
+                stopped += 1
+                status_color = Colors.RED + "⏹ Stopped" + Colors.END
+            elif state == 'pending':
+                status_color = Colors.YELLOW + "⏳ Pending" + Colors.END
+            else:
+                status_color = state
+            
+            # Truncate long names
+            if len(name) > 18:
+                name = name[:15] + "..."
+            
+            print(f"│ {i:2} │ {name:<18} │ {instance_id:<20} │ {status_color:<8} │")
+        
+        if age is None:
+            aws_cache.store('instances', key, fetched)
+        
+        if total:
+            print(f"└────┴────────────────────┴──────────────────────┴──────────┘{Colors.END}")
+            print(f"\n{Colors.GREEN}✅ Found {total} EC2 instance(s){Colors.END}")
+            
+            # Show summary
+            print(f"{Colors.CYAN}📊 Summary: {Colors.GREEN}{running} running{Colors.END} | {Colors.RED}{stopped} stopped{Colors.END} | {total} total{Colors.END}")
+            
+        elif filters:
+            print(f"\n{Colors.YELLOW}🖥️  No EC2 instances match: {expression}{Colors.END}")
+        else:
+            print(f"\n{Colors.YELLOW}🖥️  No EC2 instances found{Colors.END}")
+        
+        if age is not None:
+            print(f"{Colors.CYAN}🕒 {aws_cache.format_age(age)}{Colors.END}")
+            
+    except Exception as e:
+        print_error(f"Failed to list instances: {str(e)}")
+
+AMAZON_LINUX_2_PARAMETER = '/aws/service/ami-amazon-linux-latest/amzn2-ami-hvm-x86_64-gp2'
+
+def get_available_subnet():
+    """Automatically find available subnet"""
+    try:
+        ec2 = get_client('ec2')
+        
+        # Find default VPC
+        vpcs = ec2.describe_vpcs(Filters=[
+            {'Name': 'is-default', 'Values': ['true']}
+        ])
+        
+        if not vpcs['Vpcs']:
+            print_error("No default VPC found!")
+            return None
+            
+        vpc_id = vpcs['Vpcs'][0]['VpcId']
+        
+        # Find subnets in this VPC
+        subnets = ec2.describe_subnets(Filters=[
+            {'Name': 'vpc-id', 'Values': [vpc_id]}
+        ])
+        
+        if not subnets['Subnets']:
+            # Create a subnet if none exist
+            print(f"{Colors.YELLOW}Creating new subnet...{Colors.END}")
+            new_subnet = ec2.create_subnet(
+                VpcId=vpc_id,
+                CidrBlock='172.31.0.0/20',
+                AvailabilityZone=f"{aws_clients.DEFAULT_REGION}a"
+            )
+            return new_subnet['Subnet']['SubnetId']
+        
+        # Return first available subnet
+        return subnets['Subnets'][0]['SubnetId']
+        
+    except Exception as e:
+        print_error(f"Failed to get subnet: {str(e)}")
+        return None
+
+def get_default_ami():
+    """Amazon Linux 2 AMI for the current region"""
+    region = aws_clients.DEFAULT_REGION
+    if region == 'ap-south-1':
+        return 'ami-0f5ee92e2d63afc18'      # Amazon Linux 2 in Mumbai
+    
+    # AMI IDs differ per region; AWS publishes the latest one in SSM
+    response = get_client('ssm').get_parameter(Name=AMAZON_LINUX_2_PARAMETER)
+    return response['Parameter']['Value']
+
+def ec2_create_instance():
+    """Create a new EC2 instance with options"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}➕ CREATE NEW EC2 INSTANCE{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    ec2 = get_client('ec2')
+    
+    # Auto-detect subnet
+    subnet_id = get_available_subnet()
+    if not subnet_id:
+        print_error("Cannot create instance without subnet")
+        return
+    
+    name = input(f"\n{Colors.YELLOW}📝 Enter instance name: {Colors.END}").strip()
+    
+    print(f"\n{Colors.BLUE}Select instance type:{Colors.END}")
+    print(f"  {Colors.GREEN}1.{Colors.END} t2.micro (Free tier, 1 vCPU, 1GB RAM)")
+    print(f"  {Colors.GREEN}2.{Colors.END} t2.small (1 vCPU, 2GB RAM)")
+    print(f"  {Colors.GREEN}3.{Colors.END} t2.medium (2 vCPU, 4GB RAM)")
+    
+    choice = input(f"\n{Colors.YELLOW}Choose (1-3, default 1): {Colors.END}").strip()
+    
+    instance_types = ['t2.micro', 't2.small', 't2.medium']
+    instance_type = instance_types[0]  # default
+    
+    if choice == '2':
+        instance_type = 't2.small'
+    elif choice == '3':
+        instance_type = 't2.medium'
+    
+    print(f"\n{Colors.BLUE}Selected: {Colors.YELLOW}{instance_type}{Colors.END}")
+    print(f"{Colors.CYAN}📍 Auto-selected subnet: {subnet_id[:20]}...{Colors.END}")
+    
+    try:
+        response = ec2.run_instances(
+            ImageId=get_default_ami(),            # Amazon Linux 2
+            InstanceType=instance_type,
+            MinCount=1,
+            MaxCount=1,
+            KeyName='MyWebServer-Key',
+            SubnetId=subnet_id,  # ← AUTO-SELECTED SUBNET
+            TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [{'Key': 'Name', 'Value': name}]
+            }]
+        )
+        
+        instance_id = response['Instances'][0]['InstanceId']
+        aws_cache.invalidate('instances', aws_clients.DEFAULT_REGION)
+        print_success(f"Created instance: {Colors.BOLD}{name}{Colors.GREEN} ({instance_id})")
+        
+    except Exception as e:
+        print_error(f"Failed to create instance: {str(e)}")
+        return
+    
+    ec2_track([instance_id], 'launch')
+
+ACTION_ROWS = 20          # per-instance outcomes printed after a bulk action
+
+def ec2_track(instance_ids, action):
+    """Follow instances until they reach the action's target state (Ctrl-C stops watching)"""
+    target = ec2_bulk.TARGET_STATES[action]
+    print(f"\n{Colors.CYAN}👀 Waiting for {target} (Ctrl-C stops waiting, AWS carries on){Colors.END}")
+    
+    try:
+        summary = ec2_bulk.wait_for_state(get_client('ec2'), instance_ids, target)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⏭️  Stopped waiting - check later with option 6{Colors.END}")
+        return
+    except Exception as e:
+        print_error(f"Cannot track instances: {str(e)}")
+        return
+    finally:
+        aws_cache.invalidate('instances', aws_clients.DEFAULT_REGION)
+    
+    for instance_id, state in list(summary['failed'].items())[:ACTION_ROWS]:
+        print(f"{Colors.RED}  ✗ {instance_id}: {state}{Colors.END}")
+    if summary['reached']:
+        label = next(iter(summary['reached'])) if len(instance_ids) == 1 else f"{len(summary['reached'])} instance(s)"
+        print_success(f"{label} {target} after {summary['elapsed']:.0f}s")
+    if summary['pending']:
+        states = ', '.join(sorted(set(summary['pending'].values())))
+        print_warning(f"{len(summary['pending'])} instance(s) still {states} after {summary['elapsed']:.0f}s")
+
+def ec2_track_changed(summary):
+    """Track the instances a bulk action actually changed"""
+    if summary['changed']:
+        ec2_track([instance_id for instance_id, _, _ in summary['changed']], summary['action'])
+
+def ec2_select_targets(action, prompt):
+    """Instance IDs picked by ID list, @file or filter expression (None if nothing to do)"""
+    text = input(prompt).strip()
+    if not text:
+        print_error("No instance given")
+        return None
+    
+    try:
+        ids, filters = ec2_bulk.parse_selection(text)
+        instance_ids = ec2_bulk.select_instances(get_client('ec2'), action, ids, filters)
+    except Exception as e:
+        print_error(f"Cannot select instances: {str(e)}")
+        return None
+    
+    if not instance_ids:
+        print_warning(f"No instances to {action} match: {text}")
+        return None
+    return instance_ids
+
+def ec2_confirm_bulk(instance_ids, verb):
+    """Ask before acting on more than one instance"""
+    if len(instance_ids) == 1:
+        return True
+    print(f"\n{Colors.BLUE}📋 {len(instance_ids)} instance(s): {', '.join(instance_ids[:5])}"
+          f"{' ...' if len(instance_ids) > 5 else ''}{Colors.END}")
+    answer = input(f"{Colors.YELLOW}{verb} all {len(instance_ids)}? (y/N): {Colors.END}").strip().lower()
+    return answer == 'y'
+
+def ec2_run_bulk(action, instance_ids, verb):
+    """Run a batched start/stop/terminate and print every instance's outcome"""
+    ec2 = get_client('ec2')
+    summary = ec2_bulk.run_action(ec2, action, instance_ids, progress=len(instance_ids) > ec2_bulk.BATCH_SIZE)
+    aws_cache.invalidate('instances', aws_clients.DEFAULT_REGION)
+    
+    if len(instance_ids) > 1:
+        for instance_id, previous, current in summary['changed'][:ACTION_ROWS]:
+            print(f"{Colors.GREEN}  ✓ {instance_id}: {previous} → {current}{Colors.END}")
+        if len(summary['changed']) > ACTION_ROWS:
+            print(f"{Colors.GREEN}  ... and {len(summary['changed']) - ACTION_ROWS} more{Colors.END}")
+    for instance_id, code, message in summary['failed'][:ACTION_ROWS]:
+        print(f"{Colors.RED}  ✗ {instance_id}: {code} {message}{Colors.END}")
+    
+    if summary['changed']:
+        label = summary['changed'][0][0] if len(instance_ids) == 1 else f"{len(summary['changed'])} instance(s)"
+        print_success(f"{verb} {Colors.BOLD}{label}{Colors.GREEN}")
+        if len(instance_ids) > 1:
+            print(f"{Colors.CYAN}📊 {summary['elapsed']:.1f}s ({summary['per_sec']:.0f} instances/s){Colors.END}")
+    if summary['failed']:
+        print_error(f"Failed to {action} {len(summary['failed'])} instance(s)")
+    return summary
+
+def ec2_stop_instance():
+    """Stop EC2 instances (by ID, @file of IDs, or filter)"""
+    print(f"\n{Colors.YELLOW}{Colors.BOLD}🛑 STOP EC2 INSTANCE{Colors.END}")
+    print(f"{Colors.YELLOW}────────────────────────────────────────────{Colors.END}")
+    
+    instance_ids = ec2_select_targets(
+        'stop', f"\n{Colors.YELLOW}⚠️  Enter instance ID(s), @file or filter (e.g. tag:env=dev) to stop: {Colors.END}"
+    )
+    if not instance_ids or not ec2_confirm_bulk(instance_ids, "Stop"):
+        return
+    
+    ec2_track_changed(ec2_run_bulk('stop', instance_ids, "Stopping"))
+
+def ec2_start_instance():
+    """Start EC2 instances (by ID, @file of IDs, or filter)"""
+    print(f"\n{Colors.GREEN}{Colors.BOLD}▶️  START EC2 INSTANCE{Colors.END}")
+    print(f"{Colors.GREEN}────────────────────────────────────────────{Colors.END}")
+    
+    instance_ids = ec2_select_targets(
+        'start', f"\n{Colors.YELLOW}🎬 Enter instance ID(s), @file or filter (e.g. tag:env=dev) to start: {Colors.END}"
+    )
+    if not instance_ids or not ec2_confirm_bulk(instance_ids, "Start"):
+        return
+    
+    ec2_track_changed(ec2_run_bulk('start', instance_ids, "Starting"))
+
+def ec2_delete_instance():
+    """Delete EC2 instances permanently (by ID, @file of IDs, or filter)"""
+    print(f"\n{Colors.RED}{Colors.BOLD}🗑️  DELETE EC2 INSTANCE{Colors.END}")
+    print(f"{Colors.RED}────────────────────────────────────────────{Colors.END}")
+    
+    instance_ids = ec2_select_targets(
+        'terminate', f"\n{Colors.YELLOW}⚠️  Enter instance ID(s), @file or filter to delete: {Colors.END}"
+    )
+    if not instance_ids:
+        return
+    
+    if len(instance_ids) == 1:
+        print_warning(f"This will PERMANENTLY DELETE instance: {instance_ids[0]}")
+    else:
+        print_warning(f"This will PERMANENTLY DELETE {len(instance_ids)} instances: "
+                      f"{', '.join(instance_ids[:3])}{' ...' if len(instance_ids) > 3 else ''}")
+    print_warning("All data will be lost!")
+    
+    confirm = input(f"\n{Colors.RED}Type 'DELETE' to confirm: {Colors.END}").strip()
+    
+    if confirm == 'DELETE':
+        ec2_track_changed(ec2_run_bulk('terminate', instance_ids, "Deleting"))
+    else:
+        print(f"\n{Colors.GREEN}✅ Deletion cancelled{Colors.END}")
+
+def switch_region():
+    """Change the region every menu action works in"""
+    region = input(f"\n{Colors.YELLOW}🌍 Enter region (e.g. us-east-1): {Colors.END}").strip()
+    
+    if not region:
+        print(f"\n{Colors.GREEN}✅ Staying in {aws_clients.DEFAULT_REGION}{Colors.END}")
+        return
+    
+    aws_clients.set_default_region(region)
+    print_success(f"Switched to region {Colors.BOLD}{region}{Colors.GREEN}")
+
+def region_overview(region, buckets_by_region):
+    """EC2 counters and bucket count for one region"""
+    counts = {'running': 0, 'stopped': 0, 'total': 0}
+    for instance in iter_instances(get_client('ec2', region)):
+        counts['total'] += 1
+        if instance.state in counts:
+            counts[instance.state] += 1
+    counts['buckets'] = buckets_by_region.get(region, 0)
+    return counts
+
+def multi_region_overview():
+    """Scan several regions in parallel and merge them into one table"""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}🌍 MULTI-REGION OVERVIEW{Colors.END}")
+    print(f"{Colors.CYAN}────────────────────────────────────────────{Colors.END}")
+    
+    spec = input(f"\n{Colors.YELLOW}🌍 Regions (comma separated, Enter for all enabled): {Colors.END}").strip()
+    
+    try:
+        regions = resolve_regions(spec or 'all')
+        
+        # Buckets are global: one listing, grouped by the region each lives in
+        s3 = get_client('s3')
+        buckets = [BucketRecord.from_api(b) for b in s3.list_buckets()['Buckets']]
+        grouped = group_buckets_by_region(s3, buckets)
+        buckets_by_region = {region: len(items) for region, items in grouped.items()}
+        
+        print(f"\n{Colors.BLUE}Scanning {len(regions)} region(s) in parallel...{Colors.END}")
+        results = scan_regions(regions, lambda region: region_overview(region, buckets_by_region))
+    except Exception as e:
+        print_error(f"Failed to scan regions: {str(e)}")
+        return
+    
+    print(f"\n{Colors.WHITE}┌──────────────────┬─────────┬─────────┬─────────┬───────┬────────┐")
+    print(f"│      Region      │ Buckets │ Running │ Stopped │ Total │  Time  │")
+    print(f"├──────────────────┼─────────┼─────────┼─────────┼───────┼────────┤")
+    
+    totals = {'buckets': 0, 'running': 0, 'stopped': 0, 'total': 0}
+    for region, counts, error, seconds in results:
+        if error is not None:
+            print(f"│ {region:<16} │ {Colors.RED}{'failed: ' + str(error)[:35]:<43}{Colors.END}{Colors.WHITE} │")
+            continue
+        for key in totals:
+            totals[key] += counts[key]
+        print(f"│ {region:<16} │ {counts['buckets']:>7} │ {Colors.GREEN}{counts['running']:>7}{Colors.END}{Colors.WHITE} │ "
+              f"{Colors.RED}{counts['stopped']:>7}{Colors.END}{Colors.WHITE} │ {counts['total']:>5} │ {seconds:>5.1f}s │")
+    
+    print(f"├──────────────────┼─────────┼─────────┼─────────┼───────┼────────┤")
+    print(f"│ {Colors.YELLOW}{'TOTAL':<16}{Colors.END}{Colors.WHITE} │ {totals['buckets']:>7} │ {totals['running']:>7} │ "
+          f"{totals['stopped']:>7} │ {totals['total']:>5} │        │")
+    print(f"└──────────────────┴─────────┴─────────┴─────────┴───────┴────────┘{Colors.END}")
+    
+    if None in buckets_by_region:
+        print(f"{Colors.YELLOW}⚠️  Could not find the region of {buckets_by_region[None]} bucket(s){Colors.END}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        description="Interactive S3 and EC2 manager (or run one command, e.g. 's3 ls' or 'ec2 stop --tag env=dev')"
+    )
+    parser.add_argument('--refresh', action='store_true',
+                        help="drop cached listings and fetch everything from AWS again")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="never read or write the local listing cache")
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE.json',
+                        help="time every AWS call: a table after each action and at exit (or JSON to FILE)")
+    aws_cli.add_region_option(parser)
+    
+    services = parser.add_subparsers(dest='service', metavar='{s3,ec2}',
+                                     help="run one command without the menu")
+    aws_cli.add_s3_commands(services.add_parser('s3', help="S3 commands").add_subparsers(
+        dest='command', metavar='COMMAND', required=True))
+    aws_cli.add_ec2_commands(services.add_parser('ec2', help="EC2 commands").add_subparsers(
+        dest='command', metavar='COMMAND', required=True))
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main program loop"""
+    args = parse_args(argv)
+    aws_cache.configure(enabled=not args.no_cache)
+    if args.refresh:
+        aws_cache.clear()
+    if args.profile:
+        aws_profile.enable(args.profile)
+    
+    if args.service:
+        sys.exit(aws_cli.run(args))
+    if args.region:
+        aws_clients.set_default_region(args.region)
+    
+    print_header()
+    
+    while True:
+        print_menu_box()
+        
+        try:
+            choice = input(f"\n{Colors.MAGENTA}🎯 Enter your choice (0-14, R): {Colors.END}").strip().upper()
+        except KeyboardInterrupt:
+            print(f"\n\n{Colors.CYAN}👋 Goodbye! Thanks for using AWS Master Tool.{Colors.END}")
+            break
+        
+        position = aws_profile.mark()
+        
+        # Exit
+        if choice == '0':
+            print(f"\n{Colors.CYAN}{Colors.BOLD}")
+            print("╔════════════════════════════════════════════════════════════╗")
+            print("║                    👋 GOODBYE!                           ║")
+            print("║         Thanks for using AWS Master Tool                ║")
+            print("╚════════════════════════════════════════════════════════════╝")
+            print(Colors.END)
+            break
+        
+        # S3 Operations
+        elif choice == '1':
+            s3_list_buckets()
+        elif choice == '2':
+            s3_create_bucket()
+        elif choice == '3':
+            s3_delete_bucket()
+        elif choice == '4':
+            s3_upload_file()
+        elif choice == '5':
+            s3_list_files()
+        elif choice == '12':
+            s3_search_index()
+        elif choice == '13':
+            s3_download_file()
+        elif choice == '14':
+            s3_storage_analytics()
+        
+        # EC2 Operations
+        elif choice == '6':
+            ec2_list_instances()
+        elif choice == '7':
+            ec2_create_instance()
+        elif choice == '8':
+            ec2_stop_instance()
+        elif choice == '9':
+            ec2_start_instance()
+        elif choice == '10':
+            ec2_delete_instance()
+        
+        # Regions
+        elif choice == '11':
+            multi_region_overview()
+        elif choice == 'R':
+            switch_region()
+        
+        # Invalid choice
+        else:
+            print_error("Please enter a number between 0 and 14, or R")
+        
+        # Pause before showing menu again
+        if choice != '0':
+            if args.profile == '-':
+                aws_profile.print_since(position)
+            input(f"\n{Colors.CYAN}↵ Press Enter to continue...{Colors.END}")
+            print_header()
+
+# Start the program
+if __name__ == "__main__":
     main()
\ No newline at end of file
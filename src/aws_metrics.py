@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+AWS Metrics - Prometheus endpoint for the status checker
+Author: [Vishal Attri]
+Description: Every status check saves a snapshot of what it found; a small HTTP server renders the
+             latest snapshot in Prometheus text format, so scrapes never call AWS
+
+Serve the snapshot the cron runs leave behind:
+    python aws_metrics.py --port 9108
+Or serve a resident checker's live results:
+    python aws_status_check.py --watch 60 --metrics-port 9108
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import aws_clients
+import aws_profile
+from aws_cache import CACHE_DIR
+
+# ====================== METRICS CONFIG ======================
+METRICS_FILE = os.environ.get('AWS_TOOL_METRICS_FILE', os.path.join(CACHE_DIR, 'metrics.json'))
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = int(os.environ.get('AWS_TOOL_METRICS_PORT', 9108))
+PREFIX = 'aws_tool'
+
+_state = {'snapshot': None, 'loaded': None}   # latest snapshot, and the (mtime, snapshot) read from disk
+_lock = threading.Lock()
+
+# ====================== SNAPSHOTS ======================
+
+def snapshot(regions, buckets, instance_counts):
+    """Plain JSON-able snapshot, with this process's API call stats attached"""
+    return {
+        'updated': time.time(),
+        'regions': regions,
+        'buckets': buckets,
+        'instances': [[region, instance_type, state, count]
+                      for (region, instance_type, state), count in sorted(instance_counts.items())],
+        'api': aws_profile.summary(),
+        'throttling': aws_clients.api_stats(),
+    }
+
+def count_instances(counts, region, instance_type, state):
+    counts[(region, instance_type, state)] = counts.get((region, instance_type, state), 0) + 1
+
+def scan_snapshot(results):
+    """Snapshot of status-check results: [(region, ((bucket_results, error), (instances, error)), error, seconds)]"""
+    regions, buckets, counts = {}, [], {}
+    for region, result, error, seconds in results:
+        errors = {}
+        if error is not None:
+            errors['region'] = str(error)
+        else:
+            (bucket_results, s3_error), (instances, ec2_error) = result
+            for section, section_error in (('s3', s3_error), ('ec2', ec2_error)):
+                if section_error is not None:
+                    errors[section] = str(section_error)
+            for item in bucket_results or []:
+                stats = item['stats']
+                buckets.append({
+                    'region': region,
+                    'name': item['bucket'].name,
+                    'objects': stats.object_count if stats else None,
+                    'bytes': stats.total_bytes if stats else None,
+                    'truncated': stats.truncated if stats else None,
+                    'seconds': round(stats.elapsed, 3) if stats else None,
+                    'error': str(item['error']) if item['error'] is not None else None,
+                })
+            for instance in instances or []:
+                count_instances(counts, region, instance.type, instance.state)
+        regions[region] = {'seconds': round(seconds, 3), 'errors': errors}
+    return snapshot(regions, buckets, counts)
+
+class RecordSnapshot:
+    """Snapshot built from aws_output records as they are written (--format runs keep no results)"""
+
+    def __init__(self):
+        self.buckets = []
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, record):
+        """Fold in one bucket, instance or error record"""
+        region = record['region']
+        if record['type'] == 'bucket':
+            self.buckets.append({
+                'region': region,
+                'name': record['name'],
+                'objects': record.get('objects'),
+                'bytes': record.get('bytes'),
+                'truncated': record.get('truncated'),
+                'seconds': record.get('seconds'),
+                'error': record.get('error'),
+            })
+        elif record['type'] == 'instance':
+            count_instances(self.counts, region, record['instance_type'], record['state'])
+        elif record['type'] == 'error':
+            self.errors.setdefault(region, {})[record['name']] = record['error']
+
+    def snapshot(self, seconds):
+        """The snapshot, given each region's scan wall time ({region: seconds})"""
+        regions = {region: {'seconds': round(elapsed, 3), 'errors': {}} for region, elapsed in (seconds or {}).items()}
+        for region, errors in self.errors.items():
+            regions.setdefault(region, {'seconds': None, 'errors': {}})['errors'].update(errors)
+        return snapshot(regions, self.buckets, self.counts)
+
+def watch_snapshot(watcher):
+    """Snapshot of an aws_watch.Watcher's in-memory inventory after its latest poll"""
+    regions = {region: {'seconds': round(watcher.poll_seconds, 3), 'errors': {}} for region in watcher.regions}
+    for (region, section), message in watcher.errors.items():
+        regions.setdefault(region, {'seconds': None, 'errors': {}})['errors'][section] = message
+
+    buckets = []
+    for name, region in watcher.buckets.items():
+        contents = watcher.contents.get(name)
+        buckets.append({
+            'region': region,
+            'name': name,
+            'objects': contents[0] if contents is not None else None,
+            'bytes': contents[1] if contents is not None else None,
+            'truncated': None,
+            'seconds': None,
+            'error': None,
+        })
+
+    counts = {}
+    for (region, _), (_, state, instance_type, _) in watcher.instances.items():
+        count_instances(counts, region, instance_type, state)
+    return snapshot(regions, buckets, counts)
+
+def publish(data, path=METRICS_FILE):
+    """Make data the snapshot this process serves, and save it for aws_metrics.py (best effort)"""
+    with _lock:
+        _state['snapshot'] = data
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp, path)
+    except OSError:
+        pass
+
+def current(path=METRICS_FILE):
+    """This process's latest snapshot, else the saved one (re-read only when the file changes)"""
+    with _lock:
+        if _state['snapshot'] is not None:
+            return _state['snapshot']
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+        if _state['loaded'] is None or _state['loaded'][0] != mtime:
+            try:
+                with open(path) as f:
+                    _state['loaded'] = (mtime, json.load(f))
+            except (OSError, ValueError):
+                return None
+        return _state['loaded'][1]
+
+# ====================== EXPOSITION ======================
+
+def escape(value):
+    """Label value escaped for the Prometheus text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels.items()) + '}'
+
+def format_value(value):
+    """Sample value without losing precision (byte counts, Unix timestamps)"""
+    if isinstance(value, (bool, int)):
+        return str(int(value))
+    return repr(float(value))
+
+def family(lines, name, kind, help_text, samples):
+    """Append one metric family: HELP/TYPE lines, then 'name{labels} value' per sample"""
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+    for suffix, labels, value in samples:
+        lines.append(f"{PREFIX}_{name}{suffix}{format_labels(labels)} {format_value(value)}")
+
+def render(data):
+    """Prometheus text exposition of a snapshot (None = no scan saved yet)"""
+    lines = []
+    family(lines, 'snapshot_loaded', 'gauge', "1 when a status check snapshot is available",
+           [('', {}, 0 if data is None else 1)])
+    if data is None:
+        return '\n'.join(lines) + '\n'
+
+    family(lines, 'snapshot_timestamp_seconds', 'gauge', "When the snapshot was taken (Unix time)",
+           [('', {}, data['updated'])])
+    family(lines, 'snapshot_age_seconds', 'gauge', "Seconds since the snapshot was taken",
+           [('', {}, max(0.0, time.time() - data['updated']))])
+
+    regions = data['regions']
+    family(lines, 'scan_duration_seconds', 'gauge', "Wall time of the latest scan per region",
+           [('', {'region': region}, info['seconds']) for region, info in regions.items()
+            if info['seconds'] is not None])
+    family(lines, 'scan_errors', 'gauge', "Sections (s3, ec2, region) that failed in the latest scan",
+           [('', {'region': region, 'section': section}, 1) for region, info in regions.items()
+            for section in info['errors']])
+
+    family(lines, 'instances', 'gauge', "EC2 instances by region, instance type and state",
+           [('', {'region': region, 'instance_type': instance_type, 'state': state}, count)
+            for region, instance_type, state, count in data['instances']])
+
+    buckets = data['buckets']
+    family(lines, 'buckets', 'gauge', "S3 buckets per region",
+           [('', {'region': region}, sum(1 for b in buckets if b['region'] == region))
+            for region in sorted({b['region'] for b in buckets})])
+    for field, name, help_text in (('objects', 'bucket_objects', "Objects in the bucket"),
+                                   ('bytes', 'bucket_bytes', "Total object size in the bucket"),
+                                   ('seconds', 'bucket_scan_seconds', "Time the bucket listing took"),
+                                   ('truncated', 'bucket_scan_truncated', "1 when the listing hit a scan cap")):
+        family(lines, name, 'gauge', help_text,
+               [('', {'region': b['region'], 'bucket': b['name']}, b[field]) for b in buckets
+                if b[field] is not None])
+    family(lines, 'bucket_scan_errors', 'gauge', "1 when the bucket could not be listed",
+           [('', {'region': b['region'], 'bucket': b['name']}, 1) for b in buckets if b['error']])
+
+    api = data['api']
+    family(lines, 'api_latency_seconds', 'histogram', "AWS API call latency per operation",
+           [sample for row in api for sample in latency_samples(row)])
+    for field, name, help_text in (('errors', 'api_errors_total', "AWS API calls that failed"),
+                                   ('retries', 'api_retries_total', "Retried HTTP attempts"),
+                                   ('bytes_out', 'api_sent_bytes_total', "Request bytes sent"),
+                                   ('bytes_in', 'api_received_bytes_total', "Response bytes received")):
+        family(lines, name, 'counter', help_text,
+               [('', {'service': row['service'], 'operation': row['operation']}, row[field]) for row in api])
+
+    throttling = data['throttling']
+    family(lines, 'api_throttles_total', 'counter', "Throttling errors per service",
+           [('', {'service': service}, row['throttles']) for service, row in sorted(throttling.items())])
+    family(lines, 'api_rate_limited_seconds_total', 'counter', "Time spent waiting on the client-side rate limit",
+           [('', {'service': service}, row['waited']) for service, row in sorted(throttling.items())])
+    return '\n'.join(lines) + '\n'
+
+def latency_samples(row):
+    """Histogram samples (cumulative _bucket per le, _sum, _count) for one aws_profile.summary() row"""
+    labels = {'service': row['service'], 'operation': row['operation']}
+    samples = []
+    seen = 0
+    for bound, count in zip(aws_profile.LATENCY_BUCKETS_MS + (None,), row.get('buckets', ())):
+        seen += count
+        le = '+Inf' if bound is None else format_value(bound / 1000)
+        samples.append(('_bucket', {**labels, 'le': le}, seen))
+    samples.append(('_sum', labels, row['total_ms'] / 1000))
+    samples.append(('_count', labels, row['calls']))
+    return samples
+
+# ====================== HTTP SERVER ======================
+# http.server is imported only when serving: it would add ~30 ms to every cron run
+
+def make_handler(path):
+    """Request handler class whose GET /metrics renders current(path) (nothing here talks to AWS)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = render(current(path)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would drown the status log
+
+    return MetricsHandler
+
+def serve(port=METRICS_PORT, host=METRICS_HOST, path=METRICS_FILE):
+    """Start the endpoint on a daemon thread and return the server (server.shutdown() stops it)"""
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_handler(path))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='aws-metrics', daemon=True).start()
+    return server
+
+# ====================== MAIN FUNCTION ======================
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Serve the latest status check as Prometheus metrics")
+    parser.add_argument('--port', type=int, default=METRICS_PORT)
+    parser.add_argument('--host', default=METRICS_HOST, help="address to bind (0.0.0.0 for every interface)")
+    parser.add_argument('--file', default=METRICS_FILE, help="snapshot written by aws_status_check.py")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Serve until interrupted"""
+    args = parse_args(argv)
+    server = serve(args.port, args.host, args.file)
+    print(f"📈 Serving http://{args.host}:{server.server_address[1]}/metrics from {args.file} (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+AWS Output - Machine-readable record streams for the status checker
+Author: [Vishal Attri]
+Description: JSON / NDJSON / CSV writers that emit each bucket or instance as soon as it is known
+"""
+
+import csv
+import json
+import sys
+import threading
+from datetime import datetime, timezone
+
+# ====================== OUTPUT CONFIG ======================
+FORMATS = ('text', 'json', 'ndjson', 'csv')
+
+# One flat column set for every record type so CSV stays rectangular
+FIELDS = (
+    'type', 'region', 'name', 'id', 'state', 'instance_type', 'az', 'launch_time', 'created',
+    'objects', 'bytes', 'largest_key', 'largest_size', 'truncated', 'pages', 'seconds',
+    'buckets', 'instances', 'running', 'stopped', 'errors', 'error', 'checked_at',
+)
+
+# Watch mode records: one per change (errors use the same columns)
+CHANGE_FIELDS = ('type', 'kind', 'change', 'region', 'name', 'id', 'field', 'old', 'new', 'error', 'checked_at')
+
+def timestamp(value=None):
+    """ISO 8601 UTC string (now when value is None)"""
+    value = value or datetime.now(timezone.utc)
+    return value.isoformat(timespec='seconds')
+
+# ====================== RECORDS ======================
+
+def bucket_record(region, bucket, stats=None, error=None):
+    """One bucket with its scan totals (or the error that stopped the scan)"""
+    record = {
+        'type': 'bucket',
+        'region': region,
+        'name': bucket.name,
+        'created': timestamp(bucket.created) if bucket.created else None,
+    }
+    if stats is not None:
+        record.update(
+            objects=stats.object_count,
+            bytes=stats.total_bytes,
+            largest_key=stats.largest_key,
+            largest_size=stats.largest_size if stats.largest_key is not None else None,
+            truncated=stats.truncated,
+            pages=stats.pages,
+            seconds=round(stats.elapsed, 3),
+        )
+    if error is not None:
+        record['error'] = str(error)
+    return record
+
+def instance_record(region, instance):
+    """One EC2 instance"""
+    return {
+        'type': 'instance',
+        'region': region,
+        'name': instance.name,
+        'id': instance.id,
+        'state': instance.state,
+        'instance_type': instance.type,
+        'az': instance.az,
+        'launch_time': timestamp(instance.launch_time) if instance.launch_time else None,
+    }
+
+def error_record(region, section, error):
+    """A whole section (s3, ec2 or region) that could not be checked"""
+    return {'type': 'error', 'region': region, 'name': section, 'error': str(error)}
+
+def change_record(kind, change, region, name, id=None, field=None, old=None, new=None):
+    """One difference between two watch polls (kind: instance/bucket, change: added/removed/changed)"""
+    return {'type': 'change', 'kind': kind, 'change': change, 'region': region, 'name': name, 'id': id,
+            'field': field, 'old': old, 'new': new}
+
+# ====================== WRITER ======================
+
+class RecordWriter:
+    """Thread safe writer: every emit() is written and flushed straight away.
+
+    Only running totals are kept, for the closing summary record, so memory
+    stays flat however many buckets and instances an account has. on_record,
+    if given, sees every record as it is written (e.g. for a metrics snapshot).
+    """
+
+    def __init__(self, fmt, stream=None, fields=FIELDS, on_record=None):
+        if fmt not in FORMATS[1:]:
+            raise ValueError(f"Format must be one of {', '.join(FORMATS[1:])}")
+        self.format = fmt
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+        self.count = 0
+        self.closed = False
+        self.on_record = on_record
+        self.totals = {'buckets': 0, 'objects': 0, 'bytes': 0, 'instances': 0, 'running': 0, 'stopped': 0,
+                       'errors': 0}
+        self.started = datetime.now(timezone.utc)
+        self.csv = None
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(self.stream, fieldnames=fields, extrasaction='ignore')
+            self.csv.writeheader()
+        elif fmt == 'json':
+            self.stream.write('[')
+
+    def tally(self, record):
+        """Fold a record into the summary totals (caller holds the lock)"""
+        if record['type'] == 'bucket':
+            self.totals['buckets'] += 1
+            self.totals['objects'] += record.get('objects') or 0
+            self.totals['bytes'] += record.get('bytes') or 0
+        elif record['type'] == 'instance':
+            self.totals['instances'] += 1
+            if record['state'] in ('running', 'stopped'):
+                self.totals[record['state']] += 1
+        if record.get('error'):
+            self.totals['errors'] += 1
+
+    def write(self, record):
+        """Serialize one record (caller holds the lock)"""
+        record.setdefault('checked_at', timestamp())
+        if self.csv is not None:
+            self.csv.writerow(record)
+        elif self.format == 'json':
+            self.stream.write((',\n' if self.count else '\n') + json.dumps(record))
+        else:
+            self.stream.write(json.dumps(record) + '\n')
+        self.count += 1
+        self.stream.flush()
+
+    def emit(self, record):
+        """Write one record now (ignored once close() has run: a late region must not break the output)"""
+        with self.lock:
+            if self.closed:
+                return
+            self.tally(record)
+            if self.on_record is not None:
+                self.on_record(record)
+            self.write(record)
+
+    def close(self, summary=True):
+        """Write the summary record (and close the JSON array)"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            if summary:
+                self.write({'type': 'summary', **self.totals,
+                            'seconds': round((datetime.now(timezone.utc) - self.started).total_seconds(), 3)})
+            if self.format == 'json':
+                self.stream.write('\n]\n')
+                self.stream.flush()
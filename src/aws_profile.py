@@ -0,0 +1,207 @@
+"""
+AWS Profile - Per-call latency and traffic report for every AWS API call
+Author: [Vishal Attri]
+Description: botocore event hooks that time each call and print/save a summary at exit (--profile)
+"""
+
+import atexit
+import json
+import sys
+from bisect import bisect_left
+import threading
+import time
+
+# ====================== PROFILE STATE ======================
+_state = {'enabled': False, 'output': None, 'stream': None, 'started': None}
+_calls = {}               # (service, operation) -> counters + latency histogram
+_lock = threading.Lock()
+
+PERCENTILES = (50, 95, 99)
+
+# Latency histogram upper bounds (ms); a last bucket takes everything slower. Fixed
+# buckets keep a resident process's memory flat however many calls it makes, and
+# are what the Prometheus histogram exposes. Percentiles are interpolated within them.
+LATENCY_BUCKETS_MS = (1, 1.5, 2, 3, 4, 5, 7, 10, 15, 20, 30, 40, 50, 70, 100, 150, 200, 300, 400, 500,
+                      700, 1000, 1500, 2000, 3000, 5000, 7000, 10000, 20000, 30000, 60000)
+
+def enable(output='-', stream=None):
+    """Start recording; the report goes to stream/stdout ('-') or a JSON file when the process exits
+    (output=None records without a report, e.g. for the metrics endpoint)"""
+    if not _state['enabled']:
+        atexit.register(report)
+    _state.update(enabled=True, output=output, stream=stream, started=time.monotonic())
+
+def enabled():
+    """True once --profile turned recording on"""
+    return _state['enabled']
+
+def reset():
+    """Forget every recorded call"""
+    with _lock:
+        _calls.clear()
+    _state['started'] = time.monotonic()
+
+# ====================== HOOKS ======================
+
+def _entry(service, operation):
+    """Counter dict for one API operation (caller holds the lock)"""
+    entry = _calls.get((service, operation))
+    if entry is None:
+        entry = _calls[(service, operation)] = {
+            'calls': 0, 'errors': 0, 'retries': 0, 'bytes_out': 0, 'bytes_in': 0, 'total_ms': 0.0,
+            'min_ms': None, 'max_ms': None, 'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        }
+    return entry
+
+def _content_length(headers):
+    """Content-Length header as an int (0 when missing)"""
+    try:
+        return int(headers.get('Content-Length') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def attach(client):
+    """Register the timing hooks on a client (they do nothing until enable() is called)"""
+    service = client.meta.service_model.service_name
+
+    def before_call(context, **kwargs):
+        if _state['enabled']:
+            context['profile_started'] = time.perf_counter()
+            context['profile_bytes_out'] = 0
+
+    def before_send(request, **kwargs):
+        # Once per HTTP attempt, so retried uploads count every byte sent
+        if _state['enabled'] and 'profile_started' in request.context:
+            request.context['profile_bytes_out'] += _content_length(request.headers)
+
+    def finish(context, operation, retries, bytes_in, error):
+        started = context.pop('profile_started', None)
+        if started is None:
+            return
+        latency = (time.perf_counter() - started) * 1000
+        with _lock:
+            entry = _entry(service, operation)
+            entry['calls'] += 1
+            entry['errors'] += error
+            entry['retries'] += retries
+            entry['bytes_out'] += context.pop('profile_bytes_out', 0)
+            entry['bytes_in'] += bytes_in
+            entry['total_ms'] += latency
+            entry['min_ms'] = latency if entry['min_ms'] is None else min(entry['min_ms'], latency)
+            entry['max_ms'] = max(entry['max_ms'] or 0.0, latency)
+            entry['buckets'][bisect_left(LATENCY_BUCKETS_MS, latency)] += 1
+
+    def after_call(http_response, parsed, model, context, **kwargs):
+        # Also fires for AWS error responses (before botocore raises ClientError)
+        if 'profile_started' not in context:
+            return   # profiling off (or enabled mid-call): don't touch the response
+        retries = parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        # The header, not .content: aiobotocore responses expose the body as a coroutine
+        received = _content_length(http_response.headers)
+        finish(context, model.name, retries, received, 'Error' in parsed)
+
+    def after_call_error(exception, context, event_name, **kwargs):
+        # Only for calls that never got a response (connection errors, timeouts)
+        finish(context, event_name.rsplit('.', 1)[-1], 0, 0, True)
+
+    events = client.meta.events
+    events.register('before-call', before_call)
+    events.register('before-send', before_send)
+    events.register('after-call', after_call)
+    events.register('after-call-error', after_call_error)
+    return client
+
+# ====================== REPORT ======================
+
+def percentile(buckets, pct, low=0.0, high=None):
+    """Percentile (ms) of a latency histogram, interpolated within the bucket it falls in
+    and kept within the fastest/slowest call seen (exact for a single call)"""
+    count = sum(buckets)
+    if not count:
+        return 0.0
+    rank = max(1, min(count, int(round(pct / 100 * count))))   # nearest rank
+    seen = 0
+    for index, in_bucket in enumerate(buckets):
+        if seen + in_bucket >= rank:
+            break
+        seen += in_bucket
+    if index == len(LATENCY_BUCKETS_MS):
+        value = high if high is not None else float(LATENCY_BUCKETS_MS[-1])   # slower than the last bound
+    else:
+        start = LATENCY_BUCKETS_MS[index - 1] if index else 0.0
+        end = LATENCY_BUCKETS_MS[index]
+        value = start + (end - start) * (rank - seen - 0.5) / in_bucket
+    return min(max(value, low), high if high is not None else value)
+
+def mark():
+    """Current position, for a report of only the calls made after it"""
+    with _lock:
+        counts = {key: dict(entry, buckets=list(entry['buckets'])) for key, entry in _calls.items()}
+    return counts, time.monotonic()
+
+def summary(since=None):
+    """One row per (service, operation), slowest total first (only calls after since=mark())"""
+    before = since[0] if since else {}
+    with _lock:
+        snapshot = [(key, dict(entry, buckets=list(entry['buckets']))) for key, entry in _calls.items()]
+
+    rows = []
+    for (service, operation), entry in snapshot:
+        counts = before.get((service, operation))
+        if counts is not None:
+            # min/max can't be split at the mark; the whole run's still bound the percentiles
+            entry = {field: (value if field in ('min_ms', 'max_ms')
+                             else [now - then for now, then in zip(value, counts[field])] if field == 'buckets'
+                             else value - counts[field])
+                     for field, value in entry.items()}
+        if not entry['calls']:
+            continue
+        row = {'service': service, 'operation': operation, **entry, 'total_ms': round(entry['total_ms'], 3),
+               'min_ms': round(entry['min_ms'], 3), 'max_ms': round(entry['max_ms'], 3)}
+        for pct in PERCENTILES:
+            row[f"p{pct}_ms"] = round(percentile(entry['buckets'], pct, entry['min_ms'], entry['max_ms']), 3)
+        rows.append(row)
+    rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return rows
+
+def format_bytes(size):
+    """Compact byte count for the table"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+def print_report(rows, wall, stream=None):
+    """Human readable table"""
+    stream = stream or sys.stdout
+    total_calls = sum(row['calls'] for row in rows)
+    print(f"\n📈 API PROFILE - {total_calls} calls in {wall:.2f}s", file=stream)
+    print(f"{'Operation':<34} {'calls':>6} {'err':>4} {'retry':>5} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'total s':>8} {'sent':>8} {'recv':>8}", file=stream)
+    print("-" * 106, file=stream)
+    for row in rows:
+        name = f"{row['service']}.{row['operation']}"
+        print(f"{name:<34} {row['calls']:>6} {row['errors']:>4} {row['retries']:>5} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['total_ms'] / 1000:>8.2f} "
+              f"{format_bytes(row['bytes_out']):>8} {format_bytes(row['bytes_in']):>8}", file=stream)
+
+def print_since(position):
+    """Table of the calls made since mark() (nothing when profiling is off or no calls were made)"""
+    if _state['enabled']:
+        rows = summary(since=position)
+        if rows:
+            print_report(rows, time.monotonic() - position[1])
+
+def report():
+    """Print the table, or write JSON when an output file was given"""
+    if not _state['enabled'] or _state['output'] is None:
+        return
+    rows = summary()
+    wall = time.monotonic() - _state['started']
+    if _state['output'] == '-':
+        print_report(rows, wall, _state['stream'])
+    else:
+        with open(_state['output'], 'w') as f:
+            json.dump({'wall_seconds': round(wall, 3), 'calls': rows}, f, indent=2)
+        print(f"📈 API profile written to {_state['output']}", file=_state['stream'] or sys.stdout)
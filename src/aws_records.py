@@ -0,0 +1,125 @@
+"""
+AWS Records - Compact record types shared by every tool
+Author: [Vishal Attri]
+Description: __slots__ records built once from API responses, with a prebuilt tag index
+"""
+
+import sys
+from datetime import datetime
+
+# Repeated short strings (states, types, zones, storage classes) are interned
+# so thousands of records share one copy instead of one per response dict
+_intern = sys.intern
+
+# ====================== BASE ======================
+
+class Record:
+    """Shared plain-dict conversion (used by the on-disk cache)"""
+    __slots__ = ()
+    DATETIME_FIELDS = ()
+
+    def to_dict(self):
+        """JSON-friendly dict of every slot"""
+        data = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if field in self.DATETIME_FIELDS and value is not None:
+                value = value.isoformat()
+            data[field] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record written by to_dict()"""
+        values = dict(data)
+        for field in cls.DATETIME_FIELDS:
+            if values.get(field) is not None:
+                values[field] = datetime.fromisoformat(values[field])
+        return cls(**values)
+
+# ====================== EC2 ======================
+
+class InstanceRecord(Record):
+    """One EC2 instance: the displayed fields plus a tag lookup dict"""
+    __slots__ = ('id', 'name', 'state', 'type', 'az', 'launch_time', 'tags')
+    DATETIME_FIELDS = ('launch_time',)
+
+    def __init__(self, id, name='No Name', state='unknown', type='Unknown', az=None,
+                 launch_time=None, tags=None):
+        self.id = id
+        self.name = name
+        self.state = state
+        self.type = type
+        self.az = az
+        self.launch_time = launch_time
+        self.tags = tags
+
+    @classmethod
+    def from_api(cls, instance):
+        """Build from one describe_instances instance dict"""
+        tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', ())} or None
+        az = instance.get('Placement', {}).get('AvailabilityZone')
+        return cls(
+            id=instance['InstanceId'],
+            name=tags.get('Name', 'No Name') if tags else 'No Name',
+            state=_intern(instance['State']['Name']),
+            type=_intern(instance.get('InstanceType', 'Unknown')),
+            az=_intern(az) if az else None,
+            launch_time=instance.get('LaunchTime'),
+            tags=tags,
+        )
+
+    def tag(self, key, default=None):
+        """O(1) tag lookup"""
+        return self.tags.get(key, default) if self.tags else default
+
+    def __repr__(self):
+        return f"InstanceRecord({self.id!r}, name={self.name!r}, state={self.state!r})"
+
+# ====================== S3 ======================
+
+class BucketRecord(Record):
+    """One S3 bucket from list_buckets"""
+    __slots__ = ('name', 'created', 'region')
+    DATETIME_FIELDS = ('created',)
+
+    def __init__(self, name, created=None, region=None):
+        self.name = name
+        self.created = created
+        self.region = region
+
+    @classmethod
+    def from_api(cls, bucket):
+        """Build from one list_buckets entry"""
+        region = bucket.get('BucketRegion')
+        return cls(bucket['Name'], bucket.get('CreationDate'), _intern(region) if region else None)
+
+    def __repr__(self):
+        return f"BucketRecord({self.name!r})"
+
+class ObjectRecord(Record):
+    """One S3 object from a listing page"""
+    __slots__ = ('key', 'size', 'etag', 'last_modified', 'storage_class')
+    DATETIME_FIELDS = ('last_modified',)
+
+    def __init__(self, key, size=0, etag=None, last_modified=None, storage_class='STANDARD'):
+        self.key = key
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.storage_class = storage_class
+
+    @classmethod
+    def from_api(cls, obj):
+        """Build from one list_objects_v2 Contents entry"""
+        etag = obj.get('ETag')
+        return cls(
+            key=obj['Key'],
+            size=obj.get('Size', 0),
+            etag=etag.strip('"') if etag else None,
+            last_modified=obj.get('LastModified'),
+            storage_class=_intern(obj.get('StorageClass', 'STANDARD')),
+        )
+
+    def __repr__(self):
+        return f"ObjectRecord({self.key!r}, size={self.size})"
@@ -0,0 +1,105 @@
+"""
+AWS Regions - Region discovery and parallel per-region scans
+Author: [Vishal Attri]
+Description: Run the same scan in many regions at once, each with its own timeout
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aws_clients
+from aws_clients import get_client
+
+# ====================== REGION CONFIG ======================
+REGION_TIMEOUT = 120      # seconds a single region may take
+
+# ====================== DISCOVERY ======================
+
+def discover_regions():
+    """Regions enabled for this account (opt-in regions only if opted in)"""
+    response = get_client('ec2').describe_regions(
+        Filters=[{'Name': 'opt-in-status', 'Values': ['opt-in-not-required', 'opted-in']}]
+    )
+    return sorted(region['RegionName'] for region in response['Regions'])
+
+def resolve_regions(spec, default=None):
+    """'all' -> enabled regions, 'a,b' -> [a, b], empty -> [default]"""
+    spec = (spec or '').strip()
+    if not spec:
+        return [default or get_client('ec2').meta.region_name]
+    if spec == 'all':
+        return discover_regions()
+    return [region.strip() for region in spec.split(',') if region.strip()]
+
+def bucket_region(s3_client, bucket):
+    """Region a bucket lives in (list_buckets only reports it on newer APIs)"""
+    if bucket.region:
+        return bucket.region
+    location = s3_client.get_bucket_location(Bucket=bucket.name).get('LocationConstraint')
+    # Legacy answers: None means us-east-1, 'EU' means eu-west-1
+    return {None: 'us-east-1', '': 'us-east-1', 'EU': 'eu-west-1'}.get(location, location)
+
+def group_buckets_by_region(s3_client, buckets, workers=16):
+    """{region: [BucketRecord, ...]}, looking up unknown regions concurrently"""
+    def locate(bucket):
+        try:
+            bucket.region = bucket_region(s3_client, bucket)
+        except Exception:
+            bucket.region = None
+        return bucket
+
+    grouped = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for bucket in pool.map(locate, buckets):
+            grouped.setdefault(bucket.region, []).append(bucket)
+    return grouped
+
+# ====================== PARALLEL SCAN ======================
+
+def scan_regions(regions, scan, timeout=REGION_TIMEOUT):
+    """Run scan(region) in every region at once.
+
+    Returns [(region, result, error, seconds), ...] in the order of
+    regions. A region that exceeds its timeout gets a TimeoutError and is
+    abandoned, so the total time tracks the slowest region that finishes
+    (or the timeout), never the sum of all regions.
+
+    Regions run on daemon threads, and an abandoned region's clients fail
+    every further call until its scan unwinds, so a stuck region cannot keep
+    the process alive past its in-flight calls (bound those with the
+    clients' read_timeout).
+    """
+    started = time.monotonic()
+    lock = threading.Lock()
+    finished = {}
+    abandoned = set()
+    done = {region: threading.Event() for region in regions}
+
+    def run(region):
+        try:
+            outcome = scan(region), None
+        except Exception as e:
+            outcome = None, e
+        with lock:
+            finished[region] = outcome + (time.monotonic() - started,)
+            if region in abandoned:
+                aws_clients.resume_region(region)
+        done[region].set()
+
+    for region in regions:
+        threading.Thread(target=run, args=(region,), name=f"scan-{region}", daemon=True).start()
+
+    results = []
+    for region in regions:
+        remaining = None if timeout is None else max(0, started + timeout - time.monotonic())
+        done[region].wait(remaining)
+        with lock:
+            if region in finished:
+                results.append((region,) + finished[region])
+                continue
+            abandoned.add(region)
+            aws_clients.cancel_region(region)
+        results.append((region, None, TimeoutError(f"{region} did not finish within {timeout}s"),
+                        time.monotonic() - started))
+    return results
@@ -0,0 +1,180 @@
+"""
+AWS Status Async - asyncio engine for the status checker
+Author: [Vishal Attri]
+Description: Same checks as aws_status_check, with every list/describe call issued concurrently
+
+Needs the optional aiobotocore package:
+    pip install aiobotocore
+"""
+
+import asyncio
+import time
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+except ImportError:
+    get_session = None
+
+import aws_clients
+from aws_records import BucketRecord, InstanceRecord
+from ec2_inventory import PAGE_SIZE as EC2_PAGE_SIZE
+from s3_listing import PAGE_SIZE, BucketStats
+
+# ====================== ASYNC CONFIG ======================
+CONCURRENCY = 64          # AWS calls in flight at once
+
+def require_aiobotocore():
+    """Fail with an install hint when the optional dependency is missing"""
+    if get_session is None:
+        raise RuntimeError("The async engine needs aiobotocore: pip install aiobotocore")
+
+async def next_page(pages, semaphore):
+    """Fetch the next paginator page while holding a concurrency slot"""
+    async with semaphore:
+        try:
+            return await pages.__anext__()
+        except StopAsyncIteration:
+            return None
+
+# ====================== S3 ======================
+
+async def scan_bucket(s3, bucket, semaphore, max_pages=None, max_seconds=None):
+    """Async twin of s3_listing.scan_bucket (same totals and caps)"""
+    stats = BucketStats(bucket)
+    started = time.monotonic()
+    paginator = s3.get_paginator('list_objects_v2')
+    pages = paginator.paginate(Bucket=bucket, PaginationConfig={'PageSize': PAGE_SIZE}).__aiter__()
+
+    while True:
+        page = await next_page(pages, semaphore)
+        if page is None:
+            break
+        stats.pages += 1
+        for obj in page.get('Contents', []):
+            stats.add(obj)
+
+        if not page.get('IsTruncated'):
+            break
+        if max_pages is not None and stats.pages >= max_pages:
+            stats.truncated = True
+            break
+        if max_seconds is not None and time.monotonic() - started >= max_seconds:
+            stats.truncated = True
+            break
+
+    stats.elapsed = time.monotonic() - started
+    return stats
+
+async def inspect_bucket(s3, bucket, semaphore, max_pages=None, max_seconds=None):
+    """Scan one bucket; failures are recorded instead of raised"""
+    result = {'bucket': bucket, 'stats': None, 'error': None}
+    try:
+        result['stats'] = await scan_bucket(s3, bucket.name, semaphore, max_pages, max_seconds)
+    except Exception as e:
+        result['error'] = e
+    return result
+
+async def inspect_buckets(s3, buckets, semaphore, max_pages=None, max_seconds=None):
+    """Inspect every bucket at once (results keep bucket order)"""
+    return list(await asyncio.gather(
+        *(inspect_bucket(s3, bucket, semaphore, max_pages, max_seconds) for bucket in buckets)
+    ))
+
+async def list_buckets(s3, semaphore):
+    """All buckets in the account as BucketRecords"""
+    async with semaphore:
+        response = await s3.list_buckets()
+    return [BucketRecord.from_api(b) for b in response['Buckets']]
+
+# ====================== EC2 ======================
+
+async def collect_ec2(ec2, semaphore, filters=None, page_size=EC2_PAGE_SIZE):
+    """Fetch EC2 instances page by page as InstanceRecords"""
+    paginator = ec2.get_paginator('describe_instances')
+    pages = paginator.paginate(Filters=filters or [], PaginationConfig={'PageSize': page_size}).__aiter__()
+
+    instances = []
+    while True:
+        page = await next_page(pages, semaphore)
+        if page is None:
+            break
+        for reservation in page['Reservations']:
+            for instance in reservation['Instances']:
+                instances.append(InstanceRecord.from_api(instance))
+    return instances
+
+# ====================== ENGINE ======================
+
+async def gather(coroutine):
+    """Await a collector and return (result, error) instead of raising"""
+    try:
+        return await coroutine, None
+    except Exception as e:
+        return None, e
+
+def client_config(concurrency):
+    """Connection pool big enough for the concurrency limit, with the shared retry settings"""
+    retries = dict(aws_clients.client_config().retries)
+    if retries.get('mode') == 'adaptive':
+        retries['mode'] = 'standard'  # the semaphore already paces requests
+    return AioConfig(max_pool_connections=concurrency, retries=retries)
+
+async def collect_region(session, region, semaphore, args, buckets=None):
+    """((s3_results, error), (instances, error)) for one region, like the sync engine.
+
+    With buckets=None the region's S3 client lists every bucket itself.
+    """
+    config = client_config(args.concurrency or CONCURRENCY)
+    async with session.create_client('s3', region_name=region, config=config) as s3, \
+            session.create_client('ec2', region_name=region, config=config) as ec2:
+        # Count calls/retries/throttles like the shared sync clients (no blocking limiter here)
+        aws_clients.instrument(s3, limit=False)
+        aws_clients.instrument(ec2, limit=False)
+
+        async def collect_s3():
+            targets = buckets if buckets is not None else await list_buckets(s3, semaphore)
+            return await inspect_buckets(s3, targets, semaphore, args.max_pages, args.max_seconds)
+
+        return await asyncio.gather(
+            gather(collect_s3()),
+            gather(collect_ec2(ec2, semaphore, args.ec2_filter)),
+        )
+
+async def collect(region, args):
+    """Single-region collection (same shape as the sync main path)"""
+    require_aiobotocore()
+    semaphore = asyncio.Semaphore(args.concurrency or CONCURRENCY)
+    return await collect_region(get_session(), region, semaphore, args)
+
+async def collect_regions(regions, grouped, args):
+    """[(region, result, error, seconds), ...] like aws_regions.scan_regions"""
+    require_aiobotocore()
+    session = get_session()
+    semaphore = asyncio.Semaphore(args.concurrency or CONCURRENCY)
+    started = time.monotonic()
+
+    async def one(region):
+        try:
+            result = await asyncio.wait_for(
+                collect_region(session, region, semaphore, args, grouped.get(region, [])),
+                timeout=args.region_timeout
+            )
+            return region, result, None, time.monotonic() - started
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"{region} did not finish within {args.region_timeout}s")
+        except Exception as e:
+            error = e
+        return region, None, error, time.monotonic() - started
+
+    return list(await asyncio.gather(*(one(region) for region in regions)))
+
+# ====================== ENTRY POINTS ======================
+
+def check(region, args):
+    """collect() for synchronous callers"""
+    return asyncio.run(collect(region, args))
+
+def check_regions(regions, grouped, args):
+    """collect_regions() for synchronous callers"""
+    return asyncio.run(collect_regions(regions, grouped, args))
@@ -6,10 +6,24 @@ Run this file to check S3 and EC2 status ONLY (no menu)
 Perfect for daily automated checks!
 """
 
-import boto3
+import argparse
 import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+import aws_clients
+import aws_metrics
+import aws_output
+import aws_profile
+import aws_watch
+from aws_records import BucketRecord
+from aws_regions import REGION_TIMEOUT, group_buckets_by_region, resolve_regions, scan_regions
+from ec2_inventory import iter_instances, parse_filter_expression
+from s3_listing import scan_bucket, format_size
+
 # ====================== SIMPLE UI ======================
 def print_separator():
     print("=" * 70)
@@ -21,107 +35,490 @@ def print_section(title):
 # ====================== AWS CONFIG ======================
 REGION = 'ap-south-1'
 
+# Per-bucket listing caps so one huge bucket can't stall the daily check
+# (None = walk every page)
+MAX_PAGES_PER_BUCKET = None
+MAX_SECONDS_PER_BUCKET = None
+
+# Buckets inspected in parallel (each bucket costs at least one round trip)
+BUCKET_WORKERS = 8
+
+# Threads listing one bucket's folders at once (1 = one sequential listing)
+SHARD_WORKERS = 1
+
+# Multi-region scans report buckets whose region can't be looked up under this name
+UNKNOWN_REGION = 'unknown'
+UNKNOWN_REGION_ERROR = 'Could not find the bucket region'
+
+def size_pools(workers):
+    """Make the shared clients' connection pools fit the worker count"""
+    if workers > aws_clients.setting('max_pool_connections'):
+        aws_clients.configure(max_pool_connections=workers)
+
+def make_client(service, region=None):
+    """Shared (thread safe to create) client for the checked region"""
+    return aws_clients.get_client(service, region or REGION)
+
+def async_engine():
+    """The asyncio engine, imported only for --engine async (asyncio and aiobotocore are slow to load)"""
+    import aws_status_async
+    return aws_status_async
+
+def prewarm(regions_spec):
+    """Start building the S3/EC2 clients for the named regions in the background"""
+    regions = [r.strip() for r in (regions_spec or REGION).split(',') if r.strip() and r.strip() != 'all']
+    return aws_clients.prewarm(('s3', 'ec2'), regions or [REGION])
+
+def gather(collect, *args):
+    """Run a collector and return (result, error) instead of raising"""
+    try:
+        return collect(*args), None
+    except Exception as e:
+        return None, e
+
 # ====================== S3 CHECK ======================
-def check_s3():
-    """Check all S3 buckets"""
+def inspect_bucket(s3, bucket, max_pages=None, max_seconds=None, shard_workers=SHARD_WORKERS):
+    """Scan one bucket; failures are recorded instead of raised"""
+    result = {'bucket': bucket, 'stats': None, 'error': None}
+    # Walk every listing page, keeping only running totals
+    try:
+        result['stats'] = scan_bucket(s3, bucket.name, max_pages=max_pages, max_seconds=max_seconds,
+                                      shard_workers=shard_workers)
+    except Exception as e:
+        result['error'] = e
+    return result
+
+def list_buckets(s3):
+    """All buckets in the account as BucketRecords"""
+    return [BucketRecord.from_api(b) for b in s3.list_buckets()['Buckets']]
+
+def collect_s3(s3, workers=BUCKET_WORKERS, max_pages=None, max_seconds=None, shard_workers=SHARD_WORKERS):
+    """List buckets and inspect them concurrently (results keep bucket order)"""
+    return inspect_buckets(s3, list_buckets(s3), workers, max_pages, max_seconds, shard_workers)
+
+def inspect_buckets(s3, buckets, workers=BUCKET_WORKERS, max_pages=None, max_seconds=None,
+                    shard_workers=SHARD_WORKERS):
+    """Inspect the given buckets on a bounded thread pool"""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        jobs = [pool.submit(inspect_bucket, s3, bucket, max_pages, max_seconds, shard_workers)
+                for bucket in buckets]
+        return [job.result() for job in jobs]
+
+def report_s3(results, error=None):
+    """Print the S3 section from collected results"""
     print_section("S3 BUCKETS STATUS")
-    
+
+    if error is not None:
+        print(f"❌ Failed to check S3: {str(error)}")
+        return
+
+    if results:
+        print(f"✅ Found {len(results)} bucket(s):")
+        for result in results:
+            name = result['bucket'].name
+            created = result['bucket'].created.strftime('%Y-%m-%d %H:%M')
+            stats = result['stats']
+
+            if stats is None:
+                print(f"   📁 {name} (Cannot access details)")
+                print(f"      Created: {created}")
+                if result['error'] is not None:
+                    print(f"      Error: {result['error']}")
+                continue
+
+            file_count = f"{stats.object_count}+" if stats.truncated else stats.object_count
+            print(f"   📁 {name}")
+            print(f"      Created: {created}")
+            print(f"      Files: {file_count}")
+            print(f"      Size: {format_size(stats.total_bytes)}")
+            if stats.largest_key is not None:
+                print(f"      Largest: {stats.largest_key} ({format_size(stats.largest_size)})")
+            if stats.truncated:
+                print(f"      ⚠️  Scan stopped after {stats.pages} page(s) / {stats.elapsed:.1f}s")
+    else:
+        print("📭 No S3 buckets found")
+
+def check_s3(max_pages=MAX_PAGES_PER_BUCKET, max_seconds=MAX_SECONDS_PER_BUCKET, workers=BUCKET_WORKERS):
+    """Check all S3 buckets"""
     try:
-        s3 = boto3.client('s3', region_name=REGION)
-        response = s3.list_buckets()
-        buckets = response['Buckets']
-        
-        if buckets:
-            print(f"✅ Found {len(buckets)} bucket(s):")
-            for bucket in buckets:
-                name = bucket['Name']
-                created = bucket['CreationDate'].strftime('%Y-%m-%d %H:%M')
-                
-                # Try to get bucket size
-                try:
-                    objects = s3.list_objects_v2(Bucket=name)
-                    file_count = len(objects.get('Contents', []))
-                    print(f"   📁 {name}")
-                    print(f"      Created: {created}")
-                    print(f"      Files: {file_count}")
-                except:
-                    print(f"   📁 {name} (Cannot access details)")
-                    print(f"      Created: {created}")
-        else:
-            print("📭 No S3 buckets found")
-            
+        size_pools(workers)
+        s3 = make_client('s3')
     except Exception as e:
-        print(f"❌ Failed to check S3: {str(e)}")
+        report_s3(None, e)
+        return
+    report_s3(*gather(collect_s3, s3, workers, max_pages, max_seconds))
 
 # ====================== EC2 CHECK ======================
-def check_ec2():
-    """Check all EC2 instances"""
+def collect_ec2(ec2, filters=None):
+    """Fetch EC2 instances page by page as InstanceRecords"""
+    return list(iter_instances(ec2, filters))
+
+def report_ec2(all_instances, error=None):
+    """Print the EC2 section from collected instances"""
     print_section("EC2 INSTANCES STATUS")
-    
-    try:
-        ec2 = boto3.client('ec2', region_name=REGION)
-        response = ec2.describe_instances()
+
+    if error is not None:
+        print(f"❌ Failed to check EC2: {str(error)}")
+        return
+
+    if all_instances:
+        print(f"✅ Found {len(all_instances)} instance(s):")
         
-        all_instances = []
-        for reservation in response['Reservations']:
-            all_instances.extend(reservation['Instances'])
+        running_count = 0
+        stopped_count = 0
         
-        if all_instances:
-            print(f"✅ Found {len(all_instances)} instance(s):")
-            
-            running_count = 0
-            stopped_count = 0
+        for instance in all_instances:
+            instance_id = instance.id
+            state = instance.state
+            name = instance.name
             
-            for instance in all_instances:
-                instance_id = instance['InstanceId']
-                state = instance['State']['Name']
-                
-                # Get instance name from tags
-                name = "No Name"
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
-                            break
-                
-                # Count status
-                if state == 'running':
-                    running_count += 1
-                    status = "🟢 RUNNING"
-                elif state == 'stopped':
-                    stopped_count += 1
-                    status = "🔴 STOPPED"
-                else:
-                    status = f"🟡 {state.upper()}"
-                
-                print(f"   🖥️  {name}")
-                print(f"      ID: {instance_id}")
-                print(f"      Status: {status}")
-                print(f"      Type: {instance.get('InstanceType', 'Unknown')}")
-            
-            # Summary
-            print(f"\n📊 SUMMARY:")
-            print(f"   🟢 Running: {running_count}")
-            print(f"   🔴 Stopped: {stopped_count}")
-            print(f"   📊 Total: {len(all_instances)}")
-            
-        else:
-            print("🖥️  No EC2 instances found")
+            # Count status
+            if state == 'running':
+                running_count += 1
+                status = "🟢 RUNNING"
+            elif state == 'stopped':
+                stopped_count += 1
+                status = "🔴 STOPPED"
+            else:
+                status = f"🟡 {state.upper()}"
             
+            print(f"   🖥️  {name}")
+            print(f"      ID: {instance_id}")
+            print(f"      Status: {status}")
+            print(f"      Type: {instance.type}")
+        
+        # Summary
+        print(f"\n📊 SUMMARY:")
+        print(f"   🟢 Running: {running_count}")
+        print(f"   🔴 Stopped: {stopped_count}")
+        print(f"   📊 Total: {len(all_instances)}")
+        
+    else:
+        print("🖥️  No EC2 instances found")
+
+def check_ec2(filters=None):
+    """Check all EC2 instances"""
+    try:
+        ec2 = make_client('ec2')
+    except Exception as e:
+        report_ec2(None, e)
+        return
+    report_ec2(*gather(collect_ec2, ec2, filters))
+
+# ====================== MULTI-REGION ======================
+def collect_region(region, buckets, args):
+    """S3 and EC2 results for one region, both collected at once"""
+    s3 = make_client('s3', region)
+    ec2 = make_client('ec2', region)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        s3_job = pool.submit(gather, inspect_buckets, s3, buckets, args.workers, args.max_pages, args.max_seconds,
+                             args.shard_workers)
+        ec2_job = pool.submit(gather, collect_ec2, ec2, args.ec2_filter)
+        return s3_job.result(), ec2_job.result()
+
+def report_regions_summary(results):
+    """One merged table across every scanned region"""
+    print_section("ALL REGIONS SUMMARY")
+    print(f"   {'Region':<16} {'Buckets':>7} {'Files':>10} {'Size':>11} {'Running':>8} {'Stopped':>8} {'Total':>6} {'Time':>7}")
+
+    totals = {'buckets': 0, 'files': 0, 'bytes': 0, 'running': 0, 'stopped': 0, 'total': 0}
+    for region, result, error, seconds in results:
+        if error is not None:
+            print(f"   {region:<16} ❌ {error}")
+            continue
+
+        (bucket_results, _), (instances, _) = result
+        row = {
+            'buckets': len(bucket_results or []),
+            'files': sum(r['stats'].object_count for r in bucket_results or [] if r['stats']),
+            'bytes': sum(r['stats'].total_bytes for r in bucket_results or [] if r['stats']),
+            'running': sum(1 for i in instances or [] if i.state == 'running'),
+            'stopped': sum(1 for i in instances or [] if i.state == 'stopped'),
+            'total': len(instances or []),
+        }
+        for key in totals:
+            totals[key] += row[key]
+
+        print(f"   {region:<16} {row['buckets']:>7} {row['files']:>10} {format_size(row['bytes']):>11} "
+              f"{row['running']:>8} {row['stopped']:>8} {row['total']:>6} {seconds:>6.1f}s")
+
+    print(f"   {'TOTAL':<16} {totals['buckets']:>7} {totals['files']:>10} {format_size(totals['bytes']):>11} "
+          f"{totals['running']:>8} {totals['stopped']:>8} {totals['total']:>6}")
+
+def check_regions(regions, args):
+    """Scan every region in parallel, print each one, then a merged summary"""
+    try:
+        s3 = make_client('s3')
+        grouped = group_buckets_by_region(s3, list_buckets(s3), args.workers)
+    except Exception as e:
+        print(f"❌ Failed to list S3 buckets: {str(e)}")
+        grouped = {}
+
+    if args.engine == 'async':
+        results = async_engine().check_regions(regions, grouped, args)
+    else:
+        results = scan_regions(
+            regions,
+            lambda region: collect_region(region, grouped.get(region, []), args),
+            timeout=args.region_timeout
+        )
+    if grouped.get(None):
+        results.append((UNKNOWN_REGION, ((unlocated(grouped[None]), None), ([], None)), None, 0.0))
+    report_regions(results)
+    aws_metrics.publish(aws_metrics.scan_snapshot(results))
+
+def unlocated(buckets):
+    """Bucket results for buckets whose region lookup failed, so totals still count them"""
+    return [{'bucket': bucket, 'stats': None, 'error': UNKNOWN_REGION_ERROR} for bucket in buckets]
+
+def report_regions(results):
+    """Print each region's sections, then the merged summary"""
+    for region, result, error, seconds in results:
+        print(f"\n🌍 REGION: {region} ({seconds:.1f}s)")
+        if error is not None:
+            print(f"❌ Region scan failed: {str(error)}")
+            continue
+        report_s3(*result[0])
+        report_ec2(*result[1])
+
+    report_regions_summary(results)
+
+# ====================== MACHINE-READABLE OUTPUT ======================
+def stream_s3(s3, region, buckets, args, writer, cancel=None):
+    """Inspect buckets concurrently, emitting each one as soon as its scan finishes"""
+    targets = buckets if buckets is not None else list_buckets(s3)
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        jobs = [pool.submit(inspect_bucket, s3, bucket, args.max_pages, args.max_seconds, args.shard_workers)
+                for bucket in targets]
+        for job in as_completed(jobs):
+            if cancel is not None and cancel.is_set():
+                for pending in jobs:
+                    pending.cancel()
+                return
+            result = job.result()
+            writer.emit(aws_output.bucket_record(region, result['bucket'], result['stats'], result['error']))
+
+def stream_ec2(ec2, region, filters, writer, cancel=None):
+    """Emit instances page by page as describe_instances returns them"""
+    for instance in iter_instances(ec2, filters):
+        if cancel is not None and cancel.is_set():
+            return
+        writer.emit(aws_output.instance_record(region, instance))
+
+def stream_region(region, buckets, args, writer, cancel=None):
+    """Emit one region's buckets and instances as they are found (S3 and EC2 side by side).
+
+    With buckets=None the region's buckets are listed here. Once cancel (a
+    threading.Event) is set, e.g. after the region timed out, nothing more
+    is emitted.
+    """
+    s3 = make_client('s3', region)
+    ec2 = make_client('ec2', region)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        jobs = {
+            's3': pool.submit(gather, stream_s3, s3, region, buckets, args, writer, cancel),
+            'ec2': pool.submit(gather, stream_ec2, ec2, region, args.ec2_filter, writer, cancel),
+        }
+        for section, job in jobs.items():
+            error = job.result()[1]
+            if error is not None and not (cancel is not None and cancel.is_set()):
+                writer.emit(aws_output.error_record(region, section, error))
+
+def emit_collected(region, s3_result, ec2_result, writer):
+    """Emit results the async engine collected for a region"""
+    for section, (items, error) in (('s3', s3_result), ('ec2', ec2_result)):
+        if error is not None:
+            writer.emit(aws_output.error_record(region, section, error))
+    for result in s3_result[0] or []:
+        writer.emit(aws_output.bucket_record(region, result['bucket'], result['stats'], result['error']))
+    for instance in ec2_result[0] or []:
+        writer.emit(aws_output.instance_record(region, instance))
+
+def check_streaming(regions, args, writer):
+    """Emit every bucket and instance across regions as records; returns {region: seconds}"""
+    started = time.monotonic()
+    if args.engine == 'async':
+        # The async engine gathers a region before returning it, so records follow per region
+        if len(regions) == 1:
+            try:
+                s3_result, ec2_result = async_engine().check(regions[0], args)
+            except Exception as e:
+                s3_result, ec2_result = (None, e), (None, e)
+            emit_collected(regions[0], s3_result, ec2_result, writer)
+            return {regions[0]: time.monotonic() - started}
+        grouped = group_regions(args, writer)
+        results = async_engine().check_regions(regions, grouped, args)
+        for region, result, error, _ in results:
+            if error is not None:
+                writer.emit(aws_output.error_record(region, 'region', error))
+            else:
+                emit_collected(region, *result, writer)
+        return {region: seconds for region, _, _, seconds in results}
+
+    if len(regions) == 1:
+        stream_region(regions[0], None, args, writer)
+        return {regions[0]: time.monotonic() - started}
+
+    grouped = group_regions(args, writer)
+    cancel = threading.Event()
+    results = scan_regions(
+        regions,
+        lambda region: stream_region(region, grouped.get(region, []), args, writer, cancel),
+        timeout=args.region_timeout
+    )
+    cancel.set()  # regions still running past the timeout stop emitting before the writer closes
+    for region, _, error, _ in results:
+        if error is not None:
+            writer.emit(aws_output.error_record(region, 'region', error))
+    return {region: seconds for region, _, _, seconds in results}
+
+def group_regions(args, writer):
+    """{region: [BucketRecord, ...]} for a multi-region scan (errors and unlocated buckets become records)"""
+    try:
+        s3 = make_client('s3')
+        grouped = group_buckets_by_region(s3, list_buckets(s3), args.workers)
     except Exception as e:
-        print(f"❌ Failed to check EC2: {str(e)}")
+        writer.emit(aws_output.error_record(REGION, 's3', e))
+        return {}
+    for result in unlocated(grouped.pop(None, [])):
+        writer.emit(aws_output.bucket_record(UNKNOWN_REGION, result['bucket'], error=result['error']))
+    return grouped
+
+# ====================== WATCH MODE ======================
+def watch(args, machine):
+    """Stay resident: poll every --watch seconds and report only what changed"""
+    notes = sys.stderr if machine else sys.stdout
+    regions = resolve_regions(args.regions, REGION)
+    writer = aws_output.RecordWriter(args.format, fields=aws_output.CHANGE_FIELDS) if machine else None
+
+    def emit(record):
+        if writer is not None:
+            writer.emit(record)
+        else:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {aws_watch.describe(record)}", flush=True)
+
+    watcher = aws_watch.Watcher(regions, emit, args.ec2_filter, args.object_every, args.max_pages, args.workers)
+    try:
+        watcher.run(args.watch, args.polls, notes,
+                    after_poll=lambda w: aws_metrics.publish(aws_metrics.watch_snapshot(w)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if writer is not None:
+            writer.close(summary=False)
+    print(f"👋 Stopped after {watcher.polls} poll(s), {watcher.changes} change(s)", file=notes)
 
 # ====================== MAIN FUNCTION ======================
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="AWS S3 & EC2 status check")
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES_PER_BUCKET,
+                        help="stop listing a bucket after this many pages (1000 keys each)")
+    parser.add_argument('--max-seconds', type=float, default=MAX_SECONDS_PER_BUCKET,
+                        help="stop listing a bucket after this many seconds")
+    parser.add_argument('--workers', type=int, default=BUCKET_WORKERS,
+                        help="buckets inspected in parallel (1 = one at a time)")
+    parser.add_argument('--shard-workers', type=int, default=SHARD_WORKERS,
+                        help="threads listing one bucket's folders at once (sync engine)")
+    parser.add_argument('--ec2-filter', default='', type=parse_filter_expression,
+                        help="only report matching instances, e.g. 'state=running tag:env=prod'")
+    parser.add_argument('--regions', default=REGION,
+                        help="comma separated regions, or 'all' for every enabled region")
+    parser.add_argument('--region-timeout', type=float, default=REGION_TIMEOUT,
+                        help="seconds before a slow region is abandoned (multi-region only)")
+    parser.add_argument('--engine', choices=['sync', 'async'], default='sync',
+                        help="async issues every call concurrently (needs aiobotocore)")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="AWS calls in flight at once with --engine async (default 64)")
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE.json',
+                        help="time every AWS call and print a table at exit (or write JSON to FILE)")
+    parser.add_argument('--format', choices=aws_output.FORMATS, default='text',
+                        help="text report, or one json/ndjson/csv record per bucket and instance as it is found")
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help="stay running, poll every SECONDS and print only changes (sync engine)")
+    parser.add_argument('--object-every', type=int, default=aws_watch.OBJECT_EVERY, metavar='N',
+                        help="with --watch, also re-list every bucket on every Nth poll and report changed "
+                             "contents (off by default: each is a full listing)")
+    parser.add_argument('--polls', type=int, help="with --watch, stop after this many polls")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve Prometheus metrics from the latest results on 127.0.0.1:PORT (with --watch; "
+                             "one-off runs save a snapshot that aws_metrics.py serves)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to run all checks"""
+    args = parse_args(argv)
+    machine = args.format != 'text'
+    if args.profile:
+        # Keep stdout parseable: the profile table goes to stderr with --format
+        aws_profile.enable(args.profile, stream=sys.stderr if machine else None)
+    elif args.metrics_port:
+        aws_profile.enable(None)   # API latencies for the metrics endpoint, no report
+    if args.metrics_port:
+        aws_metrics.serve(args.metrics_port)
+    size_pools(args.workers * max(1, args.shard_workers))
+    if args.region_timeout:
+        # No single call may outlive a region's timeout, so an abandoned region can't delay the exit
+        aws_clients.configure(connect_timeout=min(aws_clients.CONNECT_TIMEOUT, args.region_timeout),
+                              read_timeout=min(aws_clients.READ_TIMEOUT, args.region_timeout))
+    if args.engine == 'sync':
+        prewarm(args.regions)
+
+    if args.watch:
+        watch(args, machine)
+        return
+
+    if machine:
+        collected = aws_metrics.RecordSnapshot()
+        writer = aws_output.RecordWriter(args.format, on_record=collected.add)
+        try:
+            seconds = check_streaming(resolve_regions(args.regions, REGION), args, writer)
+        finally:
+            writer.close()
+        aws_metrics.publish(collected.snapshot(seconds))
+        for line in aws_clients.format_api_stats():
+            print(f"🚦 {line}", file=sys.stderr)
+        return
+
     print_separator()
     print(f"AWS STATUS CHECK - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print_separator()
     
-    # Run all checks
-    check_s3()
-    check_ec2()
+    regions = resolve_regions(args.regions, REGION)
+    started = time.monotonic()
+    if len(regions) > 1:
+        check_regions(regions, args)
+    elif args.engine == 'async':
+        try:
+            s3_result, ec2_result = async_engine().check(regions[0], args)
+        except Exception as e:
+            s3_result, ec2_result = (None, e), (None, e)
+        report_s3(*s3_result)
+        report_ec2(*ec2_result)
+        aws_metrics.publish(aws_metrics.scan_snapshot([(regions[0], (s3_result, ec2_result), None,
+                                                         time.monotonic() - started)]))
+    else:
+        s3 = make_client('s3', regions[0])
+        ec2 = make_client('ec2', regions[0])
+
+        # S3 and EC2 are independent, so collect both at once and print in order
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            s3_job = pool.submit(gather, collect_s3, s3, args.workers, args.max_pages, args.max_seconds,
+                                 args.shard_workers)
+            ec2_job = pool.submit(gather, collect_ec2, ec2, args.ec2_filter)
+            report_s3(*s3_job.result())
+            report_ec2(*ec2_job.result())
+        aws_metrics.publish(aws_metrics.scan_snapshot([(regions[0], (s3_job.result(), ec2_job.result()), None,
+                                                         time.monotonic() - started)]))
     
+    throttling = aws_clients.format_api_stats()
+    if throttling:
+        print_section("API THROTTLING")
+        for line in throttling:
+            print(f"   🚦 {line}")
+
     print_separator()
     print("✅ Status check completed!")
     print_separator()
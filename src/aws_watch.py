@@ -0,0 +1,250 @@
+"""
+AWS Watch - Resident status checker that reports only what changed
+Author: [Vishal Attri]
+Description: Keeps clients and the last-seen inventory in memory, polls on an interval and emits
+             instance state transitions, new/removed buckets and (opt-in) changed bucket contents
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aws_clients
+import aws_output
+from aws_records import BucketRecord
+from aws_regions import group_buckets_by_region
+from ec2_inventory import iter_instances
+from s3_listing import format_size, iter_pages
+
+# ====================== WATCH CONFIG ======================
+WATCH_INTERVAL = 60       # seconds between polls
+OBJECT_EVERY = 0          # bucket contents are re-listed on every Nth poll (0 = never: each is a full listing)
+BUCKET_WORKERS = 8
+
+# Compared fields, in the order they are kept in the snapshot tuples
+INSTANCE_FIELDS = ('name', 'state', 'instance_type', 'az')
+CONTENT_FIELDS = ('objects', 'bytes', 'digest')
+
+# ====================== DIFF ======================
+
+def diff(before, after, fields):
+    """Compare two {key: (values...)} snapshots -> (added keys, removed keys, [(key, field, old, new)])"""
+    added = [key for key in after if key not in before]
+    removed = [key for key in before if key not in after]
+    changed = []
+    for key, values in after.items():
+        old = before.get(key)
+        if old is not None and old != values:
+            changed += [(key, field, a, b) for field, a, b in zip(fields, old, values) if a != b]
+    return added, removed, changed
+
+def summarize_objects(s3_client, bucket, max_pages=None):
+    """((objects, bytes, digest), complete) for one bucket; incomplete listings are not compared.
+
+    The digest covers every key, size and ETag in listing order, so a
+    bucket costs three values in memory however many keys it holds.
+    """
+    count = total = 0
+    digest = hashlib.blake2b(digest_size=16)
+    complete = True
+    for pages, page in enumerate(iter_pages(s3_client, bucket), 1):
+        for obj in page.get('Contents', []):
+            count += 1
+            total += obj.get('Size', 0)
+            digest.update(f"{len(obj['Key'])}:{obj['Key']}:{obj.get('Size', 0)}:{obj.get('ETag')}\n".encode())
+        if not page.get('IsTruncated'):
+            break
+        if max_pages is not None and pages >= max_pages:
+            complete = False
+            break
+    return (count, total, digest.hexdigest()), complete
+
+def describe(record):
+    """One log line for a change or error record"""
+    if record['type'] == 'error':
+        return f"❌ {record['region']} {record['name']}: {record['error']}"
+
+    kind, change, field = record['kind'], record['change'], record['field']
+    old, new = record['old'], record['new']
+    if kind == 'instance':
+        label = f"🖥️  {record['id']} ({record['name']}) [{record['region']}]"
+        if change == 'added':
+            return f"{label} appeared, {new}"
+        if change == 'removed':
+            return f"{label} disappeared, was {old}"
+        return f"{label} {field}: {old} → {new}"
+    label = f"📁 {record['name']} [{record['region']}]"
+    if change == 'added':
+        return f"{label} created"
+    if change == 'removed':
+        return f"{label} deleted"
+    if field == 'contents':
+        return f"{label} contents changed (same object count and size)"
+    if field == 'bytes':
+        old, new = format_size(old), format_size(new)
+    return f"{label} {field}: {old} → {new}"
+
+# ====================== WATCHER ======================
+
+class Watcher:
+    """Last-seen inventory plus the poll that diffs against it.
+
+    Only EC2 describe calls and one list_buckets run on every poll; bucket
+    regions are looked up once per new bucket. With object_every, bucket
+    contents are also re-listed every object_every polls and compared by
+    count, size and digest. A section that fails keeps its previous
+    snapshot, so an outage never shows up as everything deleted.
+    """
+
+    def __init__(self, regions, emit, ec2_filter=None, object_every=OBJECT_EVERY, max_pages=None,
+                 workers=BUCKET_WORKERS):
+        self.regions = regions
+        self.emit = emit
+        self.ec2_filter = ec2_filter
+        self.object_every = max(0, object_every or 0)
+        self.max_pages = max_pages
+        self.workers = max(1, workers)
+        self.instances = {}   # (region, id) -> INSTANCE_FIELDS values
+        self.buckets = {}     # name -> region, for buckets in the watched regions
+        self.located = {}     # name -> region, for every bucket ever looked up
+        self.contents = {}    # bucket -> CONTENT_FIELDS values from its latest full listing
+        self.polls = 0
+        self.poll_seconds = 0.0
+        self.changes = 0
+        self.errors = {}      # (region, section) -> message, for the latest poll
+        self.lock = threading.Lock()
+
+    def report(self, record):
+        """Emit one record (bucket listings report from worker threads)"""
+        with self.lock:
+            self.changes += record['type'] == 'change'
+            if record['type'] == 'error':
+                self.errors[(record['region'], record['name'])] = record['error']
+            self.emit(record)
+
+    def fetch_instances(self, region):
+        """{(region, id): values} for one region"""
+        ec2 = aws_clients.get_client('ec2', region)
+        snapshot = {}
+        for instance in iter_instances(ec2, self.ec2_filter):
+            record = aws_output.instance_record(region, instance)
+            snapshot[(region, instance.id)] = tuple(record[field] for field in INSTANCE_FIELDS)
+        return snapshot
+
+    def poll_instances(self, jobs, quiet):
+        """Collect every region's fetch_instances job and report transitions"""
+        current = {}
+        for region, job in jobs.items():
+            try:
+                current.update(job.result())
+            except Exception as e:
+                self.report(aws_output.error_record(region, 'ec2', e))
+                current.update({key: values for key, values in self.instances.items() if key[0] == region})
+
+        added, removed, changed = diff(self.instances, current, INSTANCE_FIELDS)
+        if not quiet:
+            for region, instance_id in added:
+                name, state = current[(region, instance_id)][:2]
+                self.report(aws_output.change_record('instance', 'added', region, name, instance_id, 'state',
+                                                     new=state))
+            for region, instance_id in removed:
+                name, state = self.instances[(region, instance_id)][:2]
+                self.report(aws_output.change_record('instance', 'removed', region, name, instance_id, 'state',
+                                                     old=state))
+            for (region, instance_id), field, old, new in changed:
+                name = current[(region, instance_id)][0]
+                self.report(aws_output.change_record('instance', 'changed', region, name, instance_id, field,
+                                                     old, new))
+        self.instances = current
+
+    def poll_buckets(self, quiet):
+        """Refresh the bucket list (locating only buckets not seen before) and report new/deleted ones"""
+        region = self.regions[0]
+        try:
+            s3 = aws_clients.get_client('s3', region)
+            names = [BucketRecord.from_api(b) for b in s3.list_buckets()['Buckets']]
+            fresh = [bucket for bucket in names if bucket.name not in self.located]
+            if len(self.regions) == 1:
+                self.located.update({bucket.name: region for bucket in fresh})
+            elif fresh:
+                grouped = group_buckets_by_region(s3, fresh, self.workers)
+                self.located.update({bucket.name: where for where, buckets in grouped.items() for bucket in buckets})
+        except Exception as e:
+            self.report(aws_output.error_record(region, 's3', e))
+            return
+
+        # Forget deleted buckets (a recreated one may live elsewhere) and failed lookups
+        listed = {bucket.name for bucket in names}
+        self.located = {name: where for name, where in self.located.items() if name in listed and where}
+
+        current = {}
+        for bucket in names:
+            where = self.located.get(bucket.name)
+            if where in self.regions:
+                current[bucket.name] = where
+
+        added = [name for name in current if name not in self.buckets]
+        removed = [name for name in self.buckets if name not in current]
+        if not quiet:
+            for name in added:
+                self.report(aws_output.change_record('bucket', 'added', current[name], name))
+            for name in removed:
+                self.report(aws_output.change_record('bucket', 'removed', self.buckets[name], name))
+        for name in removed:
+            self.contents.pop(name, None)
+        self.buckets = current
+
+    def poll_bucket_contents(self, name):
+        """List one bucket and report a changed count, size or digest (the first listing is only remembered)"""
+        region = self.buckets[name]
+        try:
+            summary, complete = summarize_objects(aws_clients.get_client('s3', region), name, self.max_pages)
+        except Exception as e:
+            self.report(aws_output.error_record(region, f"s3://{name}", e))
+            return
+        if not complete:
+            return  # a capped listing can't tell deleted keys from unlisted ones
+
+        before = self.contents.get(name)
+        self.contents[name] = summary
+        if before is None or before == summary:
+            return
+
+        changed = [(field, old, new) for field, old, new in zip(CONTENT_FIELDS[:2], before, summary) if old != new]
+        for field, old, new in changed or [('contents', None, None)]:
+            self.report(aws_output.change_record('bucket', 'changed', region, name, field=field, old=old, new=new))
+
+    def poll(self):
+        """One round of polling; the first round only records the baseline"""
+        quiet = self.polls == 0
+        list_contents_now = self.object_every and self.polls % self.object_every == 0
+        self.polls += 1
+        self.errors = {}
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers + len(self.regions)) as pool:
+            jobs = {region: pool.submit(self.fetch_instances, region) for region in self.regions}
+            self.poll_buckets(quiet)
+            if list_contents_now:
+                list(pool.map(self.poll_bucket_contents, list(self.buckets)))
+            self.poll_instances(jobs, quiet)
+        self.poll_seconds = time.monotonic() - started
+
+    def run(self, interval=WATCH_INTERVAL, polls=None, notes=None, after_poll=None):
+        """Poll every interval seconds (polls=None: until interrupted), calling after_poll(self) after each"""
+        notes = notes or sys.stdout
+        while polls is None or self.polls < polls:
+            started = time.monotonic()
+            self.poll()
+            if after_poll is not None:
+                after_poll(self)
+            if self.polls == 1:
+                contents = (f"bucket contents every {self.object_every} poll(s)" if self.object_every
+                            else "bucket contents not listed")
+                print(f"👀 Watching {len(self.buckets)} bucket(s), {len(self.instances)} instance(s) in "
+                      f"{', '.join(self.regions)} every {interval:g}s ({contents})", file=notes, flush=True)
+            if polls is not None and self.polls >= polls:
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,276 @@
+"""
+EC2 Bulk - Start/stop/terminate many instances at once
+Author: [Vishal Attri]
+Description: Select instances by ID, ID file or filter, change their state with batched, parallel calls
+             and track them until they get there
+"""
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aws_clients
+from ec2_inventory import iter_instances, parse_filter_expression
+
+# ====================== BULK CONFIG ======================
+BATCH_SIZE = 100          # EC2 accepts more, but one bad ID fails the whole call
+BULK_WORKERS = 8          # batches in flight
+MAX_RETRIES = 5
+
+# API call and response key for each action
+ACTIONS = {
+    'start': ('start_instances', 'StartingInstances'),
+    'stop': ('stop_instances', 'StoppingInstances'),
+    'terminate': ('terminate_instances', 'TerminatingInstances'),
+}
+
+# States an instance must be in for the action to do anything
+# (used when instances are picked by filter)
+ACTION_STATES = {
+    'start': ['stopped'],
+    'stop': ['pending', 'running'],
+    'terminate': ['pending', 'running', 'stopping', 'stopped'],
+}
+
+# Whole-call errors worth another attempt
+RETRYABLE_CODES = {'InternalError', 'ServiceUnavailable', 'Unavailable'} | aws_clients.THROTTLE_CODES
+
+# Errors caused by particular instances (InvalidInstanceID.NotFound, ...): only these are worth
+# splitting the batch for; anything else (permissions, quotas, ...) fails every ID the same way
+INSTANCE_ERROR_CODES = {'InvalidInstanceID', 'IncorrectInstanceState', 'UnsupportedOperation'}
+
+# ====================== WAIT CONFIG ======================
+STATUS_BATCH = 100        # describe_instance_status accepts up to 100 IDs
+WAIT_TIMEOUT = int(os.environ.get('AWS_TOOL_WAIT_TIMEOUT', 600))
+POLL_MIN = 1.0            # first poll delay, and the delay after any progress
+POLL_MAX = 15.0           # slowest poll while nothing changes
+
+# State each action converges to, and states it can never get there from
+TARGET_STATES = {
+    'launch': 'running',
+    'start': 'running',
+    'stop': 'stopped',
+    'terminate': 'terminated',
+}
+DEAD_STATES = {
+    'running': {'shutting-down', 'terminated'},
+    'stopped': {'shutting-down', 'terminated'},
+    'terminated': set(),
+}
+
+INSTANCE_ID = re.compile(r'i-[0-9a-f]{8,17}')
+
+# ====================== SELECTION ======================
+
+def read_id_file(path):
+    """Instance IDs from a file (one or more per line, '#' starts a comment)"""
+    ids = []
+    with open(path) as f:
+        for line in f:
+            ids += INSTANCE_ID.findall(line.split('#', 1)[0])
+    return ids
+
+def parse_selection(text):
+    """'i-1 i-2', 'i-1,i-2', '@ids.txt' or a filter expression -> (ids, filters)"""
+    text = text.strip()
+    if text.startswith('@'):
+        return read_id_file(text[1:].strip()), None
+    if '=' in text:
+        return None, parse_filter_expression(text)
+    ids = [part for part in re.split(r'[\s,]+', text) if part]
+    return ids, None
+
+def select_instances(ec2_client, action, ids=None, filters=None):
+    """Instance IDs to act on: the given IDs (deduplicated) or every filter match.
+
+    Filter selections only include instances in a state the action can
+    change, unless the filter names a state itself.
+    """
+    if ids is not None:
+        return list(dict.fromkeys(ids))
+
+    filters = list(filters or [])
+    if not any(f['Name'] == 'instance-state-name' for f in filters):
+        filters.append({'Name': 'instance-state-name', 'Values': ACTION_STATES[action]})
+    return [instance.id for instance in iter_instances(ec2_client, filters)]
+
+def iter_batches(items, size=BATCH_SIZE):
+    """Cut a list into chunks of at most size items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# ====================== ACTIONS ======================
+
+def change_batch(ec2_client, action, batch, max_retries=MAX_RETRIES):
+    """Run one start/stop/terminate call, isolating IDs that make it fail.
+
+    Returns ([(id, previous_state, current_state), ...], [(id, code, message), ...]).
+    A bad ID rejects the whole call, so on a per-instance error the IDs named
+    in it (or, failing that, each half of the batch) are split off and retried.
+    """
+    method, response_key = ACTIONS[action]
+    call = getattr(ec2_client, method)
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = call(InstanceIds=batch)
+            break
+        except ec2_client.exceptions.ClientError as e:
+            code = e.response['Error']['Code']
+            message = e.response['Error'].get('Message', str(e))
+            if code in RETRYABLE_CODES and attempt < max_retries:
+                aws_clients.backoff(attempt)
+                continue
+            if len(batch) == 1 or code.split('.')[0] not in INSTANCE_ERROR_CODES:
+                return [], [(instance_id, code, message) for instance_id in batch]
+
+            named = [instance_id for instance_id in batch if instance_id in message]
+            rest = [instance_id for instance_id in batch if instance_id not in named]
+            if named and rest:
+                changed, failed = change_batch(ec2_client, action, rest, max_retries)
+                return changed, failed + [(instance_id, code, message) for instance_id in named]
+            if named:
+                return [], [(instance_id, code, message) for instance_id in batch]
+
+            middle = len(batch) // 2
+            left = change_batch(ec2_client, action, batch[:middle], max_retries)
+            right = change_batch(ec2_client, action, batch[middle:], max_retries)
+            return left[0] + right[0], left[1] + right[1]
+
+    changed = [(item['InstanceId'], item['PreviousState']['Name'], item['CurrentState']['Name'])
+               for item in response.get(response_key, [])]
+    return changed, []
+
+def run_action(ec2_client, action, instance_ids, batch_size=BATCH_SIZE, workers=BULK_WORKERS, progress=True):
+    """Apply start/stop/terminate to many instances with parallel batched calls.
+
+    Returns a summary dict: changed [(id, previous, current)], failed
+    [(id, code, message)], elapsed and instances per second.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Action must be one of {', '.join(ACTIONS)}")
+
+    summary = {'action': action, 'changed': [], 'failed': []}
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def run(batch):
+        try:
+            changed, failed = change_batch(ec2_client, action, batch)
+        except Exception as e:
+            changed, failed = [], [(instance_id, type(e).__name__, str(e)) for instance_id in batch]
+        with lock:
+            summary['changed'].extend(changed)
+            summary['failed'].extend(failed)
+            if progress:
+                done = len(summary['changed']) + len(summary['failed'])
+                sys.stdout.write(f"\r  ⚙️  {done}/{len(instance_ids)} instance(s) processed")
+                sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run, iter_batches(instance_ids, batch_size)))
+
+    if progress and instance_ids:
+        sys.stdout.write("\n")
+    summary['elapsed'] = time.monotonic() - started
+    summary['per_sec'] = len(summary['changed']) / max(summary['elapsed'], 1e-6)
+    return summary
+
+# ====================== STATE TRACKING ======================
+
+def poll_states(ec2_client, batch):
+    """{id: state} for one describe_instance_status batch.
+
+    IDs AWS no longer (or does not yet) know are left out. Returns None
+    when throttled so the next, slower poll tries again.
+    """
+    try:
+        response = ec2_client.describe_instance_status(InstanceIds=batch, IncludeAllInstances=True)
+    except ec2_client.exceptions.ClientError as e:
+        code = e.response['Error']['Code']
+        if code in RETRYABLE_CODES:
+            return None
+        if code != 'InvalidInstanceID.NotFound':
+            raise
+        if len(batch) == 1:
+            return {}
+        # One unknown ID fails the whole call: drop the named ones, else bisect
+        message = e.response['Error'].get('Message', '')
+        known = [instance_id for instance_id in batch if instance_id not in message]
+        if len(known) < len(batch):
+            return poll_states(ec2_client, known) if known else {}
+        middle = len(batch) // 2
+        left = poll_states(ec2_client, batch[:middle])
+        right = poll_states(ec2_client, batch[middle:])
+        return None if left is None or right is None else {**left, **right}
+    return {item['InstanceId']: item['InstanceState']['Name'] for item in response['InstanceStatuses']}
+
+def wait_for_state(ec2_client, instance_ids, target, timeout=WAIT_TIMEOUT, workers=BULK_WORKERS, progress=True):
+    """Poll until every instance reaches target, can't reach it, or timeout runs out.
+
+    Polls only the instances still pending, 100 per call, backing off from
+    POLL_MIN to POLL_MAX while nothing changes. Returns a summary dict:
+    reached/pending/failed {id: last_state}, polls (API calls) and elapsed.
+    A timeout of None waits for as long as it takes.
+    """
+    if target not in DEAD_STATES:
+        raise ValueError(f"Target must be one of {', '.join(DEAD_STATES)}")
+
+    started = time.monotonic()
+    pending = dict.fromkeys(dict.fromkeys(instance_ids), 'unknown')
+    summary = {'target': target, 'reached': {}, 'failed': {}, 'polls': 0}
+    delay = POLL_MIN
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while pending:
+            batches = list(iter_batches(list(pending), STATUS_BATCH))
+            summary['polls'] += len(batches)
+            states = {}
+            throttled = False
+            for batch, found in zip(batches, pool.map(lambda batch: poll_states(ec2_client, batch), batches)):
+                if found is None:
+                    throttled = True
+                    continue
+                states.update(found)
+                if target == 'terminated':
+                    # Terminated instances eventually vanish from the API
+                    states.update({i: 'terminated' for i in batch if i not in found})
+
+            before = len(pending)
+            for instance_id, state in states.items():
+                if state == target:
+                    pending.pop(instance_id)
+                    summary['reached'][instance_id] = state
+                elif state in DEAD_STATES[target]:
+                    pending.pop(instance_id)
+                    summary['failed'][instance_id] = state
+                else:
+                    pending[instance_id] = state
+
+            elapsed = time.monotonic() - started
+            if progress:
+                done = len(summary['reached']) + len(summary['failed'])
+                sys.stdout.write(f"\r  ⏳ {done}/{done + len(pending)} {target} ({elapsed:.0f}s)   ")
+                sys.stdout.flush()
+            if not pending or (timeout is not None and elapsed >= timeout):
+                break
+
+            # Back to quick polls as soon as anything moves, slower while stuck
+            if throttled:
+                delay = min(POLL_MAX, delay * 2)
+            else:
+                delay = POLL_MIN if len(pending) < before else min(POLL_MAX, delay * 1.5)
+            pause = random.uniform(delay / 2, delay)
+            if timeout is not None:
+                pause = min(pause, timeout - elapsed)
+            time.sleep(max(0, pause))
+
+    if progress:
+        sys.stdout.write("\n")
+    summary['pending'] = pending
+    summary['elapsed'] = time.monotonic() - started
+    return summary
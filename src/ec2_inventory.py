@@ -0,0 +1,75 @@
+"""
+EC2 Inventory - Paginated, filtered instance listing
+Author: [Vishal Attri]
+Description: Stream compact instance records page by page, with filters applied by the EC2 API
+"""
+
+from aws_records import InstanceRecord
+
+# ====================== INVENTORY CONFIG ======================
+PAGE_SIZE = 500           # describe_instances MaxResults (5-1000)
+
+# Short names accepted in filter expressions
+FILTER_ALIASES = {
+    'state': 'instance-state-name',
+    'type': 'instance-type',
+    'id': 'instance-id',
+    'az': 'availability-zone',
+}
+
+# ====================== FILTERS ======================
+
+def build_filters(states=None, tags=None, instance_types=None):
+    """Build describe_instances Filters from simple arguments.
+
+    tags maps tag key -> value; a value of '*' matches any instance that
+    has the tag at all.
+    """
+    filters = []
+    if states:
+        filters.append({'Name': 'instance-state-name', 'Values': list(states)})
+    if instance_types:
+        filters.append({'Name': 'instance-type', 'Values': list(instance_types)})
+    for key, value in (tags or {}).items():
+        if value == '*':
+            filters.append({'Name': 'tag-key', 'Values': [key]})
+        else:
+            filters.append({'Name': f'tag:{key}', 'Values': [value]})
+    return filters
+
+def parse_filter_expression(text):
+    """Turn 'state=running tag:env=dev type=t2.micro,t3.micro' into Filters.
+
+    Any other name=value pair is passed through as a raw EC2 filter name
+    (e.g. vpc-id=vpc-123).
+    """
+    filters = []
+    for token in text.split():
+        if '=' not in token:
+            raise ValueError(f"Filter must look like name=value: {token}")
+        name, values = token.split('=', 1)
+        if not values:
+            raise ValueError(f"Filter has no value: {token}")
+        if name.startswith('tag:') and values == '*':
+            filters.append({'Name': 'tag-key', 'Values': [name[4:]]})
+            continue
+        filters.append({'Name': FILTER_ALIASES.get(name, name), 'Values': values.split(',')})
+    return filters
+
+# ====================== STREAMING LISTING ======================
+
+def iter_instances(ec2_client, filters=None, page_size=PAGE_SIZE):
+    """Yield InstanceRecords, one describe_instances page at a time.
+
+    Filters are evaluated by EC2, so only matching instances cross the
+    wire, and each raw page is dropped once its records are yielded.
+    """
+    paginator = ec2_client.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=filters or [],
+        PaginationConfig={'PageSize': page_size}
+    )
+    for page in pages:
+        for reservation in page['Reservations']:
+            for instance in reservation['Instances']:
+                yield InstanceRecord.from_api(instance)
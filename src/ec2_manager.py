@@ -4,7 +4,14 @@ Author: [Vishal Attri]
 Description: Simple tool to manage AWS EC2 instances
 """
 
-import boto3
+import argparse
+import sys
+
+import aws_cache
+import aws_cli
+import aws_clients
+import ec2_bulk
+from ec2_inventory import iter_instances, parse_filter_expression
 
 def show_menu():
     """Display the EC2 menu"""
@@ -21,28 +28,36 @@ def show_menu():
 
 def list_instances(ec2_client):
     """List all EC2 instances"""
+    expression = input("\nFilter (e.g. state=running tag:env=dev, Enter for all): ").strip()
+    
     try:
-        response = ec2_client.describe_instances()
+        count = 0
+        filters = parse_filter_expression(expression)
+        
+        key = aws_cache.cache_key(ec2_client.meta.region_name, ' '.join(expression.split()))
+        instances, age = aws_cache.load('instances', key)
+        fetched = []
+        if instances is None:
+            # Print each instance as its page arrives
+            instances = iter_instances(ec2_client, filters)
         
-        instances = []
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                instances.append(instance)
+        for instance in instances:
+            if age is None:
+                fetched.append(instance)
+            if count == 0:
+                print("\nEC2 instance(s):")
+            count += 1
+            print(f"  • {instance.name} ({instance.id}) - {instance.state}")
         
-        if instances:
-            print(f"\nYou have {len(instances)} EC2 instance(s):")
-            for instance in instances:
-                # Get instance name
-                name = 'No Name'
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
-                            break
-                
-                print(f"  • {name} ({instance['InstanceId']}) - {instance['State']['Name']}")
+        if age is None:
+            aws_cache.store('instances', key, fetched)
+        
+        if count:
+            print(f"\nYou have {count} EC2 instance(s)")
         else:
             print("\nNo EC2 instances found")
+        if age is not None:
+            print(f"({aws_cache.format_age(age)})")
             
     except Exception as e:
         print(f"Error: {e}")
@@ -65,55 +80,118 @@ def create_instance(ec2_client):
         )
         
         instance_id = response['Instances'][0]['InstanceId']
+        aws_cache.invalidate('instances', ec2_client.meta.region_name)
         print(f"Created instance: {name} ({instance_id})")
-        print("Wait 2 minutes for it to start")
         
     except Exception as e:
         print(f"Error: {e}")
-
-def stop_instance(ec2_client):
-    """Stop an EC2 instance"""
-    instance_id = input("\nInstance ID to stop: ").strip()
+        return
     
+    wait_until(ec2_client, [instance_id], 'launch')
+
+def pick_instances(ec2_client, action, prompt):
+    """Instance IDs from an ID list, @file or filter expression"""
+    text = input(prompt).strip()
+    if not text:
+        return []
     try:
-        ec2_client.stop_instances(InstanceIds=[instance_id])
-        print(f"Stopping {instance_id}...")
+        ids, filters = ec2_bulk.parse_selection(text)
+        instance_ids = ec2_bulk.select_instances(ec2_client, action, ids, filters)
     except Exception as e:
         print(f"Error: {e}")
+        return []
+    if not instance_ids:
+        print("No matching instances")
+    return instance_ids
 
-def start_instance(ec2_client):
-    """Start an EC2 instance"""
-    instance_id = input("\nInstance ID to start: ").strip()
-    
+def apply_action(ec2_client, action, instance_ids, verb):
+    """Batched start/stop/terminate with one line per instance"""
+    summary = ec2_bulk.run_action(ec2_client, action, instance_ids, progress=len(instance_ids) > ec2_bulk.BATCH_SIZE)
+    aws_cache.invalidate('instances', ec2_client.meta.region_name)
+    for instance_id, previous, current in summary['changed']:
+        print(f"{verb} {instance_id} ({previous} -> {current})")
+    for instance_id, code, message in summary['failed']:
+        print(f"Error: {instance_id}: {code} {message}")
+    if len(instance_ids) > 1:
+        print(f"{len(summary['changed'])}/{len(instance_ids)} done in {summary['elapsed']:.1f}s")
+    if summary['changed']:
+        wait_until(ec2_client, [instance_id for instance_id, _, _ in summary['changed']], action)
+
+def wait_until(ec2_client, instance_ids, action):
+    """Poll until the instances reach the action's target state (Ctrl-C stops waiting)"""
+    target = ec2_bulk.TARGET_STATES[action]
     try:
-        ec2_client.start_instances(InstanceIds=[instance_id])
-        print(f"Starting {instance_id}...")
+        summary = ec2_bulk.wait_for_state(ec2_client, instance_ids, target)
+    except KeyboardInterrupt:
+        print("\nStopped waiting")
+        return
     except Exception as e:
         print(f"Error: {e}")
+        return
+    finally:
+        aws_cache.invalidate('instances', ec2_client.meta.region_name)
+    
+    for instance_id, state in summary['failed'].items():
+        print(f"Error: {instance_id} is {state}")
+    print(f"{len(summary['reached'])}/{len(instance_ids)} {target} after {summary['elapsed']:.0f}s")
+    if summary['pending']:
+        print(f"Still waiting on: {', '.join(summary['pending'])}")
+
+def confirm_many(instance_ids, verb):
+    """Ask before acting on more than one instance"""
+    if len(instance_ids) == 1:
+        return True
+    return input(f"{verb} {len(instance_ids)} instances? (y/n): ").strip().lower() == 'y'
+
+def stop_instance(ec2_client):
+    """Stop EC2 instances (IDs, @file or filter like tag:env=dev)"""
+    instance_ids = pick_instances(ec2_client, 'stop', "\nInstance ID(s), @file or filter to stop: ")
+    if instance_ids and confirm_many(instance_ids, "Stop"):
+        apply_action(ec2_client, 'stop', instance_ids, "Stopping")
+
+def start_instance(ec2_client):
+    """Start EC2 instances (IDs, @file or filter like tag:env=dev)"""
+    instance_ids = pick_instances(ec2_client, 'start', "\nInstance ID(s), @file or filter to start: ")
+    if instance_ids and confirm_many(instance_ids, "Start"):
+        apply_action(ec2_client, 'start', instance_ids, "Starting")
 
 def delete_instance(ec2_client):
-    """Delete an EC2 instance"""
-    instance_id = input("\nInstance ID to delete: ").strip()
+    """Delete EC2 instances (IDs, @file or filter like tag:env=dev)"""
+    instance_ids = pick_instances(ec2_client, 'terminate', "\nInstance ID(s), @file or filter to delete: ")
+    if not instance_ids:
+        return
     
-    confirm = input(f"Type 'delete' to delete {instance_id}: ")
+    target = instance_ids[0] if len(instance_ids) == 1 else f"{len(instance_ids)} instances"
+    confirm = input(f"Type 'delete' to delete {target}: ")
     
     if confirm == 'delete':
-        try:
-            ec2_client.terminate_instances(InstanceIds=[instance_id])
-            print(f"Deleting {instance_id}...")
-        except Exception as e:
-            print(f"Error: {e}")
+        apply_action(ec2_client, 'terminate', instance_ids, "Deleting")
     else:
         print("Cancelled")
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Standalone EC2 manager (menu, or one command: ls, stop, ...)")
+    parser.add_argument('--refresh', action='store_true', help="drop cached listings first")
+    parser.add_argument('--no-cache', action='store_true', help="don't use the listing cache")
+    aws_cli.add_ec2_commands(parser.add_subparsers(dest='command', metavar='COMMAND', help="run one command without the menu"))
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main program"""
+    args = parse_args(argv)
+    aws_cache.configure(enabled=not args.no_cache)
+    if args.refresh:
+        aws_cache.clear()
+    if args.command:
+        sys.exit(aws_cli.run(args))
+    
     print("\nAWS EC2 Manager")
     print("Region: ap-south-1 (Mumbai)")
     print("-"*40)
     
     # Connect to EC2
-    ec2 = boto3.client('ec2', region_name='ap-south-1')
+    ec2 = aws_clients.get_client('ec2', 'ap-south-1')
     
     while True:
         show_menu()
@@ -0,0 +1,258 @@
+"""
+S3 Analytics - Storage breakdowns of a bucket over millions of keys
+Author: [Vishal Attri]
+Description: Load a listing into columnar NumPy arrays and aggregate it vectorized: size by prefix
+             depth and storage class, age histogram, largest objects and small-object counts
+
+Needs the optional numpy (2.x) package:
+    pip install numpy
+"""
+
+import math
+import sys
+import time
+from datetime import datetime
+from operator import itemgetter, methodcaller
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import s3_index
+from s3_listing import DELIMITER, format_size, iter_pages_sharded
+
+# ====================== ANALYTICS CONFIG ======================
+DEFAULT_DEPTH = 1         # prefix levels grouped by (1 = top-level folders)
+PREFIX_ROWS = 20          # prefixes reported, largest first
+TOP_OBJECTS = 10
+FEW_LABELS = 32           # up to this many distinct labels are grouped by comparison, not by sorting
+
+# S3 bills objects under 128 KB in these classes as 128 KB
+SMALL_OBJECT = 128 * 1024
+MIN_BILLED_CLASSES = ('STANDARD_IA', 'ONEZONE_IA', 'GLACIER_IR')
+
+# Age histogram: (upper bound in days, label)
+AGE_BINS = (
+    (1, '< 1 day'),
+    (7, '1-7 days'),
+    (30, '1-4 weeks'),
+    (90, '1-3 months'),
+    (365, '3-12 months'),
+    (730, '1-2 years'),
+    (math.inf, '> 2 years'),
+)
+
+get_key = itemgetter('Key')
+get_size = itemgetter('Size')
+get_modified = itemgetter('LastModified')
+get_class = methodcaller('get', 'StorageClass', 'STANDARD')
+
+def require_numpy():
+    """Fail with an install hint when the optional dependency is missing"""
+    if np is None:
+        raise RuntimeError("Storage analytics needs numpy: pip install numpy")
+
+# ====================== COLUMNS ======================
+
+class ObjectColumns:
+    """A bucket listing as parallel arrays: keys, sizes, modified (Unix time, NaN if unknown), classes"""
+
+    def __init__(self, keys, sizes, modified, classes):
+        self.keys = keys
+        self.sizes = sizes
+        self.modified = modified
+        self.classes = classes
+
+    def __len__(self):
+        return len(self.sizes)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Concatenate per-page (keys, sizes, modified, classes) arrays"""
+        strings = np.dtypes.StringDType()
+        if not chunks:
+            return cls(np.array([], dtype=strings), np.array([], dtype=np.int64),
+                       np.array([], dtype=np.float64), np.array([], dtype=strings))
+        return cls(*(np.concatenate(column) for column in zip(*chunks)))
+
+def page_columns(contents):
+    """One listing page as arrays (C-level field extraction, no per-object Python code)"""
+    strings = np.dtypes.StringDType()
+    return (
+        np.array(list(map(get_key, contents)), dtype=strings),
+        np.fromiter(map(get_size, contents), dtype=np.int64, count=len(contents)),
+        np.fromiter(map(datetime.timestamp, map(get_modified, contents)), dtype=np.float64, count=len(contents)),
+        np.array(list(map(get_class, contents)), dtype=strings),
+    )
+
+def load_listing(s3_client, bucket, prefix='', workers=None):
+    """Columns for a live listing (folders listed concurrently); each page is dropped once converted"""
+    require_numpy()
+    pages = iter_pages_sharded(s3_client, bucket, prefix, **({'workers': workers} if workers else {}))
+    return ObjectColumns.from_chunks([page_columns(page['Contents']) for page in pages if page.get('Contents')])
+
+def load_index(bucket, prefix=''):
+    """Columns from the local s3_index (no AWS calls), or None when the bucket is not indexed"""
+    require_numpy()
+    if s3_index.index_info(bucket) is None:
+        return None
+    low, high = s3_index.key_range(prefix)
+    with s3_index.connect() as index:
+        rows = index.execute(
+            "SELECT key, size, last_modified, IFNULL(storage_class, 'STANDARD') FROM objects "
+            "WHERE bucket = ? AND key >= ? AND key < ?", (bucket, low, high)
+        ).fetchall()
+    if not rows:
+        return ObjectColumns.from_chunks([])
+    keys, sizes, modified, classes = zip(*rows)   # NULL last_modified -> None -> NaN
+    strings = np.dtypes.StringDType()
+    return ObjectColumns(np.array(keys, dtype=strings), np.array(sizes, dtype=np.int64),
+                         np.array(modified, dtype=np.float64), np.array(classes, dtype=strings))
+
+# ====================== AGGREGATIONS ======================
+
+def prefixes(keys, depth):
+    """Each key's folder at most depth levels deep ('' for top-level objects)"""
+    end = np.full(len(keys), -1, dtype=np.int64)
+    deeper = np.ones(len(keys), dtype=bool)
+    for _ in range(depth):
+        found = np.strings.find(keys, DELIMITER, end + 1)
+        deeper &= found >= 0
+        end = np.where(deeper, found, end)
+    return np.strings.slice(keys, 0, end + 1)
+
+def group_sizes(labels, sizes):
+    """(labels, counts, bytes) per distinct label.
+
+    Listings arrive in key order, so prefixes are usually already sorted and
+    a run-length pass replaces the sort; a handful of distinct labels (storage
+    classes) is cheaper to compare one by one than to invert with np.unique.
+    """
+    if len(labels) == 0:
+        return labels, np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    if len(labels) == 1 or np.all(labels[1:] >= labels[:-1]):
+        starts = np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+        counts = np.diff(np.append(starts, len(labels)))
+        return labels[starts], counts, np.add.reduceat(sizes, starts)
+    names = np.unique(labels)
+    if len(names) <= FEW_LABELS:
+        masks = [labels == name for name in names]
+        return (names, np.array([np.count_nonzero(mask) for mask in masks], dtype=np.int64),
+                np.array([sizes[mask].sum() for mask in masks], dtype=np.int64))
+    names, inverse = np.unique(labels, return_inverse=True)
+    return (names, np.bincount(inverse, minlength=len(names)),
+            np.bincount(inverse, weights=sizes, minlength=len(names)).astype(np.int64))
+
+def table(names, counts, totals, label, limit=None):
+    """Rows sorted by bytes, largest first"""
+    order = np.argsort(totals, kind='stable')[::-1][:limit]
+    return [{label: str(names[i]), 'objects': int(counts[i]), 'bytes': int(totals[i])} for i in order]
+
+def size_by_prefix(columns, depth=DEFAULT_DEPTH, limit=PREFIX_ROWS):
+    return table(*group_sizes(prefixes(columns.keys, depth), columns.sizes), 'prefix', limit)
+
+def size_by_class(columns):
+    return table(*group_sizes(columns.classes, columns.sizes), 'storage_class')
+
+def age_histogram(columns, now=None):
+    """Objects and bytes per AGE_BINS bucket (objects with no timestamp are left out)"""
+    known = ~np.isnan(columns.modified)
+    ages = ((now or time.time()) - columns.modified[known]) / 86400
+    slots = np.searchsorted([limit for limit, _ in AGE_BINS[:-1]], ages, side='right')
+    counts = np.bincount(slots, minlength=len(AGE_BINS))
+    totals = np.bincount(slots, weights=columns.sizes[known], minlength=len(AGE_BINS)).astype(np.int64)
+    return [{'age': label, 'objects': int(counts[i]), 'bytes': int(totals[i])}
+            for i, (_, label) in enumerate(AGE_BINS)]
+
+def largest(columns, count=TOP_OBJECTS):
+    """The count biggest objects, biggest first (argpartition: no full sort)"""
+    if count <= 0:
+        return []   # argpartition(sizes, -0)[-0:] would pick every object
+    if len(columns) > count:
+        picked = np.argpartition(columns.sizes, -count)[-count:]
+    else:
+        picked = np.arange(len(columns))
+    picked = picked[np.argsort(columns.sizes[picked], kind='stable')[::-1]]
+    return [{'key': str(columns.keys[i]), 'bytes': int(columns.sizes[i]), 'storage_class': str(columns.classes[i])}
+            for i in picked]
+
+def small_objects(columns, threshold=SMALL_OBJECT):
+    """Objects under threshold, and the bytes billed beyond their size in minimum-size classes"""
+    small = columns.sizes < threshold
+    padded = (columns.sizes < SMALL_OBJECT) & np.isin(columns.classes, MIN_BILLED_CLASSES)
+    return {
+        'threshold': threshold,
+        'objects': int(np.count_nonzero(small)),
+        'bytes': int(columns.sizes[small].sum()),
+        'billed_padding': int((SMALL_OBJECT - columns.sizes[padded]).sum()),
+    }
+
+def analyze(columns, depth=DEFAULT_DEPTH, top=TOP_OBJECTS, small=SMALL_OBJECT, now=None):
+    """Every breakdown of one listing as a JSON-friendly dict"""
+    require_numpy()
+    started = time.perf_counter()
+    report = {
+        'objects': len(columns),
+        'bytes': int(columns.sizes.sum()),
+        'depth': depth,
+        'prefixes': size_by_prefix(columns, depth),
+        'storage_classes': size_by_class(columns),
+        'ages': age_histogram(columns, now),
+        'largest': largest(columns, top),
+        'small': small_objects(columns, small),
+    }
+    report['analyze_seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+def analyze_bucket(s3_client, bucket, prefix='', source='auto', **options):
+    """Load (index when source is auto/index and the bucket is indexed, else a live listing) and analyze"""
+    started = time.perf_counter()
+    columns = load_index(bucket, prefix) if source in ('auto', 'index') else None
+    if columns is None:
+        if source == 'index':
+            raise ValueError(f"{bucket} has no local index (build one with option 12 first)")
+        columns, source = load_listing(s3_client, bucket, prefix), 'listing'
+    else:
+        source = 'index'
+    load_seconds = round(time.perf_counter() - started, 3)
+    return dict(analyze(columns, **options), bucket=bucket, prefix=prefix, source=source, load_seconds=load_seconds)
+
+# ====================== REPORT ======================
+
+def share(part, whole):
+    return f"{100 * part / whole:5.1f}%" if whole else "    -"
+
+def print_table(rows, label, title, total_bytes, stream):
+    print(f"\n{title}", file=stream)
+    for row in rows:
+        name = row[label] if row[label] != '' else '(top level)'
+        name = name if len(name) <= 40 else "..." + name[-37:]
+        print(f"  {name:<40} {row['objects']:>12,} {format_size(row['bytes']):>10} "
+              f"{share(row['bytes'], total_bytes)}", file=stream)
+
+def print_report(report, stream=None):
+    """Human readable breakdown of an analyze()/analyze_bucket() report"""
+    stream = stream or sys.stdout
+    total = report['bytes']
+    where = f"s3://{report['bucket']}/{report['prefix']}" if 'bucket' in report else "listing"
+    print(f"📊 {where}: {report['objects']:,} object(s), {format_size(total)}", file=stream)
+    if 'load_seconds' in report:
+        print(f"   loaded from {report['source']} in {report['load_seconds']:.2f}s, "
+              f"analyzed in {report['analyze_seconds']:.2f}s", file=stream)
+
+    print_table(report['prefixes'], 'prefix', f"📁 Largest prefixes (depth {report['depth']})", total, stream)
+    print_table(report['storage_classes'], 'storage_class', "🗄️  Storage classes", total, stream)
+    print_table(report['ages'], 'age', "🕒 Age (last modified)", total, stream)
+
+    print("\n🐘 Largest objects", file=stream)
+    for row in report['largest']:
+        key = row['key'] if len(row['key']) <= 52 else "..." + row['key'][-49:]
+        print(f"  {key:<52} {format_size(row['bytes']):>10} {row['storage_class']}", file=stream)
+
+    small = report['small']
+    print(f"\n🐜 {small['objects']:,} object(s) under {format_size(small['threshold'])}, "
+          f"{format_size(small['bytes'])} in total", file=stream)
+    if small['billed_padding']:
+        print(f"   {format_size(small['billed_padding'])} billed on top of their size for objects under "
+              f"{format_size(SMALL_OBJECT)} in {'/'.join(MIN_BILLED_CLASSES)}", file=stream)
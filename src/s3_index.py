@@ -0,0 +1,368 @@
+"""
+S3 Index - Local, queryable index of a bucket's objects
+Author: [Vishal Attri]
+Description: Built once with a parallel per-prefix listing, then refreshed only where things changed
+"""
+
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from urllib.parse import unquote_plus
+
+from aws_cache import CACHE_DIR
+from aws_records import ObjectRecord
+from s3_listing import DELIMITER, iter_parallel_pages, plan_shards
+
+# ====================== INDEX CONFIG ======================
+INDEX_FILE = 'objects.sqlite3'
+INDEX_WORKERS = int(os.environ.get('AWS_TOOL_INDEX_WORKERS', 16))
+KEY_END = '\U0010ffff'    # sorts after every character a key can contain
+
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+AGE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS objects (
+        bucket        TEXT NOT NULL,
+        key           TEXT NOT NULL,
+        size          INTEGER NOT NULL,
+        etag          TEXT,
+        last_modified REAL,
+        storage_class TEXT,
+        PRIMARY KEY (bucket, key)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS objects_size ON objects (bucket, size)",
+    "CREATE INDEX IF NOT EXISTS objects_age ON objects (bucket, last_modified)",
+    """CREATE TABLE IF NOT EXISTS buckets (
+        bucket    TEXT PRIMARY KEY,
+        built     REAL NOT NULL,
+        refreshed REAL NOT NULL,
+        source    TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS dirty (
+        bucket    TEXT NOT NULL,
+        prefix    TEXT NOT NULL,
+        recursive INTEGER NOT NULL,
+        PRIMARY KEY (bucket, prefix, recursive)
+    )""",
+)
+
+INSERT_OBJECT = "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)"
+
+# ====================== STORE ======================
+
+def index_path():
+    """Full path of the SQLite file"""
+    return os.path.join(CACHE_DIR, INDEX_FILE)
+
+@contextlib.contextmanager
+def connect():
+    """Open the index (creating it on first use), commit and close"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    connection = sqlite3.connect(index_path(), timeout=30)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+            yield connection
+    finally:
+        connection.close()
+
+def key_range(prefix):
+    """(low, high) bounds so 'key >= low AND key < high' means startswith(prefix)"""
+    return prefix, prefix + KEY_END
+
+def to_row(bucket, obj):
+    """objects table row from a list_objects_v2 Contents entry"""
+    etag = obj.get('ETag')
+    modified = obj.get('LastModified')
+    return (bucket, obj['Key'], obj.get('Size', 0), etag.strip('"') if etag else None,
+            modified.timestamp() if modified else None, obj.get('StorageClass', 'STANDARD'))
+
+def index_info(bucket):
+    """{'built', 'refreshed', 'source', 'dirty'} for an indexed bucket, else None"""
+    with connect() as index:
+        row = index.execute(
+            "SELECT built, refreshed, source FROM buckets WHERE bucket = ?", (bucket,)
+        ).fetchone()
+        if row is None:
+            return None
+        dirty = index.execute("SELECT COUNT(*) FROM dirty WHERE bucket = ?", (bucket,)).fetchone()[0]
+    return {'built': row[0], 'refreshed': row[1], 'source': row[2], 'dirty': dirty}
+
+def mark_dirty(bucket, prefix='', recursive=True):
+    """Flag a prefix for the next refresh (no-op for buckets that aren't indexed).
+
+    recursive=False only covers keys directly in that folder, which is
+    what a single upload changes.
+    """
+    try:
+        with connect() as index:
+            index.execute(
+                "INSERT OR IGNORE INTO dirty SELECT ?, ?, ? WHERE EXISTS "
+                "(SELECT 1 FROM buckets WHERE bucket = ?)",
+                (bucket, prefix, int(recursive), bucket)
+            )
+    except (sqlite3.Error, OSError):
+        pass  # the next rebuild picks the change up anyway
+
+def key_folder(key):
+    """'logs/2024/a.gz' -> 'logs/2024/' (the folder mark_dirty should re-list)"""
+    return key.rpartition(DELIMITER)[0] + DELIMITER if DELIMITER in key else ''
+
+def drop_bucket(bucket):
+    """Forget a bucket's index (after the bucket itself is deleted)"""
+    try:
+        with connect() as index:
+            for table in ('objects', 'buckets', 'dirty'):
+                index.execute(f"DELETE FROM {table} WHERE bucket = ?", (bucket,))
+    except (sqlite3.Error, OSError):
+        pass
+
+# ====================== PAGE WRITES ======================
+
+def insert_pages(index, bucket, pages):
+    """Write listed pages to the index; returns the number of objects written"""
+    count = 0
+    for page in pages:
+        rows = [to_row(bucket, obj) for obj in page.get('Contents', [])]
+        index.executemany(INSERT_OBJECT, rows)
+        count += len(rows)
+    return count
+
+# ====================== BUILD / REFRESH ======================
+
+def build_index(s3_client, bucket, workers=INDEX_WORKERS):
+    """Full listing of a bucket into the index.
+
+    The bucket is split into '/' folder shards (s3_listing.plan_shards) and
+    the shards are listed concurrently while this thread writes the pages.
+    Returns {'objects', 'partitions', 'elapsed'}.
+    """
+    started = time.monotonic()
+    shards, loose = plan_shards(s3_client, bucket, '', workers)
+    jobs = [(shard, None) for shard in shards]
+
+    with connect() as index:
+        index.execute("DELETE FROM objects WHERE bucket = ?", (bucket,))
+        index.execute("DELETE FROM dirty WHERE bucket = ?", (bucket,))
+
+        total = insert_pages(index, bucket, [{'Contents': loose}])
+        total += insert_pages(index, bucket, iter_parallel_pages(s3_client, bucket, jobs, workers))
+
+        now = time.time()
+        index.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)", (bucket, now, now, 'listing'))
+
+    return {'objects': total, 'partitions': len(shards), 'elapsed': time.monotonic() - started}
+
+def collapse_prefixes(entries):
+    """Drop dirty entries already covered by a recursive one"""
+    recursive = []
+    for prefix in sorted(prefix for prefix, is_recursive in entries if is_recursive):
+        if not any(prefix.startswith(kept) for kept in recursive):
+            recursive.append(prefix)
+    folders = sorted({
+        prefix for prefix, is_recursive in entries
+        if not is_recursive and not any(prefix.startswith(kept) for kept in recursive)
+    })
+    return [(prefix, True) for prefix in recursive] + [(prefix, False) for prefix in folders]
+
+def refresh_index(s3_client, bucket, workers=INDEX_WORKERS):
+    """Re-list only the prefixes marked dirty since the last build/refresh.
+
+    Returns {'prefixes', 'objects', 'elapsed'}.
+    """
+    started = time.monotonic()
+    with connect() as index:
+        entries = index.execute(
+            "SELECT prefix, recursive FROM dirty WHERE bucket = ?", (bucket,)
+        ).fetchall()
+        targets = collapse_prefixes(entries)
+
+        for prefix, recursive in targets:
+            low, high = key_range(prefix)
+            if recursive:
+                index.execute("DELETE FROM objects WHERE bucket = ? AND key >= ? AND key < ?",
+                              (bucket, low, high))
+            else:
+                index.execute("DELETE FROM objects WHERE bucket = ? AND key >= ? AND key < ? "
+                              "AND instr(substr(key, ?), ?) = 0",
+                              (bucket, low, high, len(prefix) + 1, DELIMITER))
+
+        jobs = [(prefix, None if recursive else DELIMITER) for prefix, recursive in targets]
+        count = insert_pages(index, bucket, iter_parallel_pages(s3_client, bucket, jobs, workers))
+
+        index.executemany("DELETE FROM dirty WHERE bucket = ? AND prefix = ? AND recursive = ?",
+                          [(bucket, prefix, recursive) for prefix, recursive in entries])
+        index.execute("UPDATE buckets SET refreshed = ? WHERE bucket = ?", (time.time(), bucket))
+
+    return {'prefixes': len(targets), 'objects': count, 'elapsed': time.monotonic() - started}
+
+# ====================== S3 INVENTORY ======================
+
+def parse_s3_url(url):
+    """'s3://bucket/key' -> (bucket, key)"""
+    if not url.startswith('s3://') or '/' not in url[5:]:
+        raise ValueError(f"Expected s3://bucket/key, got: {url}")
+    bucket, _, key = url[5:].partition('/')
+    return bucket, key
+
+def field_name(name):
+    """'LastModifiedDate' / 'last_modified_date' -> 'lastmodifieddate'"""
+    return name.replace('_', '').strip().lower()
+
+def parse_timestamp(value):
+    """Inventory timestamp (ISO string or datetime) -> epoch seconds"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=value.tzinfo or timezone.utc).timestamp()
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+def iter_inventory_records(s3_client, manifest):
+    """Yield one {field: value} dict per object in every inventory data file"""
+    file_format = manifest.get('fileFormat', 'CSV').upper()
+    destination = manifest['destinationBucket'].split(':::')[-1]
+
+    if file_format == 'PARQUET':
+        # Imported only here: pyarrow is optional and slow to import
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError:
+            raise RuntimeError("Parquet inventories need pyarrow: pip install pyarrow") from None
+    elif file_format != 'CSV':
+        raise ValueError(f"Unsupported inventory format: {file_format}")
+
+    fields = [field_name(name) for name in manifest.get('fileSchema', '').split(',')]
+    for data_file in manifest['files']:
+        body = s3_client.get_object(Bucket=destination, Key=data_file['key'])['Body']
+        if file_format == 'CSV':
+            text = io.TextIOWrapper(gzip.GzipFile(fileobj=body), encoding='utf-8', newline='')
+            for values in csv.reader(text):
+                record = dict(zip(fields, values))
+                record['key'] = unquote_plus(record['key'])  # CSV keys are URL-encoded
+                yield record
+        else:
+            table = parquet.read_table(io.BytesIO(body.read()))
+            for row in table.to_pylist():
+                yield {field_name(name): value for name, value in row.items()}
+
+def ingest_inventory(s3_client, manifest_url):
+    """Replace a bucket's index with an S3 Inventory snapshot (CSV or Parquet).
+
+    Prefixes marked dirty are kept, so a refresh afterwards re-lists what
+    changed locally since the snapshot. Returns {'bucket', 'objects', 'elapsed'}.
+    """
+    started = time.monotonic()
+    manifest_bucket, manifest_key = parse_s3_url(manifest_url)
+    body = s3_client.get_object(Bucket=manifest_bucket, Key=manifest_key)['Body'].read()
+    manifest = json.loads(body)
+    bucket = manifest['sourceBucket']
+
+    total = 0
+    batch = []
+    with connect() as index:
+        index.execute("DELETE FROM objects WHERE bucket = ?", (bucket,))
+        for record in iter_inventory_records(s3_client, manifest):
+            # Versioned inventories list old versions and delete markers too
+            if str(record.get('islatest', 'true')).lower() == 'false':
+                continue
+            if str(record.get('isdeletemarker', 'false')).lower() == 'true':
+                continue
+            etag = record.get('etag')
+            batch.append((bucket, record['key'], int(record.get('size') or 0),
+                          etag.strip('"') if etag else None,
+                          parse_timestamp(record.get('lastmodifieddate')),
+                          record.get('storageclass') or 'STANDARD'))
+            if len(batch) >= 10000:
+                index.executemany(INSERT_OBJECT, batch)
+                total += len(batch)
+                batch = []
+        index.executemany(INSERT_OBJECT, batch)
+        total += len(batch)
+
+        snapshot = int(manifest.get('creationTimestamp', time.time() * 1000)) / 1000
+        index.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                      (bucket, snapshot, snapshot, 'inventory'))
+
+    return {'bucket': bucket, 'objects': total, 'elapsed': time.monotonic() - started}
+
+# ====================== QUERIES ======================
+
+def parse_size(text):
+    """'512', '10KB', '1.5GB' -> bytes"""
+    match = re.fullmatch(r'([\d.]+)\s*([KMGT]?B)?', text.strip().upper())
+    if not match:
+        raise ValueError(f"Bad size: {text} (e.g. 512, 10KB, 1.5GB)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) or 'B'])
+
+def parse_age(text):
+    """'45m', '12h', '30d', '2w' -> seconds"""
+    match = re.fullmatch(r'([\d.]+)\s*([smhdw])', text.strip().lower())
+    if not match:
+        raise ValueError(f"Bad age: {text} (e.g. 12h, 30d, 2w)")
+    return float(match.group(1)) * AGE_UNITS[match.group(2)]
+
+QUERY_FIELDS = {
+    'prefix': ('prefix', str),
+    'min': ('min_size', parse_size),
+    'max': ('max_size', parse_size),
+    'older': ('older_than', parse_age),
+    'newer': ('newer_than', parse_age),
+}
+
+def parse_query(text):
+    """'prefix=logs/ min=1MB max=1GB older=30d newer=2w' -> query() keyword arguments"""
+    conditions = {}
+    for token in (text or '').split():
+        name, sep, value = token.partition('=')
+        if not sep or name.lower() not in QUERY_FIELDS:
+            raise ValueError(f"Unknown condition: {token} (use {', '.join(QUERY_FIELDS)})")
+        argument, convert = QUERY_FIELDS[name.lower()]
+        conditions[argument] = convert(value)
+    return conditions
+
+def where_clause(bucket, prefix='', min_size=None, max_size=None, older_than=None, newer_than=None):
+    """SQL WHERE clause and parameters for the query conditions"""
+    low, high = key_range(prefix)
+    clauses = ["bucket = ?", "key >= ?", "key < ?"]
+    params = [bucket, low, high]
+    now = time.time()
+    for clause, value in (("size >= ?", min_size), ("size <= ?", max_size),
+                          ("last_modified < ?", None if older_than is None else now - older_than),
+                          ("last_modified >= ?", None if newer_than is None else now - newer_than)):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    return " AND ".join(clauses), params
+
+def query(bucket, limit=None, **conditions):
+    """Yield matching ObjectRecords in key order"""
+    where, params = where_clause(bucket, **conditions)
+    sql = f"SELECT key, size, etag, last_modified, storage_class FROM objects WHERE {where} ORDER BY key"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    with connect() as index:
+        for key, size, etag, modified, storage_class in index.execute(sql, params):
+            last_modified = datetime.fromtimestamp(modified, timezone.utc) if modified is not None else None
+            yield ObjectRecord(key, size, etag, last_modified, storage_class)
+
+def summarize(bucket, **conditions):
+    """(object count, total bytes) of the matching objects"""
+    where, params = where_clause(bucket, **conditions)
+    with connect() as index:
+        count, total = index.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects WHERE {where}", params
+        ).fetchone()
+    return count, total
@@ -0,0 +1,245 @@
+"""
+S3 Listing - Streaming bucket scans
+Author: [Vishal Attri]
+Description: Walk every page of a bucket listing while keeping only running totals
+"""
+
+import heapq
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ====================== LISTING CONFIG ======================
+PAGE_SIZE = 1000          # S3 never returns more than 1000 keys per page
+
+# Sharded listing: one bucket split on '/' folders and listed by several threads
+SHARD_WORKERS = int(os.environ.get('AWS_TOOL_SHARD_WORKERS', 8))
+DELIMITER = '/'
+SPLIT_DEPTH = 3           # folder levels explored looking for enough shards
+SPLIT_MAX_PAGES = 2       # folders with more loose keys than this are listed whole
+SHARD_QUEUE_PAGES = 4     # listed pages buffered per shard
+
+def format_size(size):
+    """Human readable size string"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024 or unit == 'TB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.2f} {unit}"
+        size /= 1024
+
+# ====================== BUCKET STATS ======================
+
+class BucketStats:
+    """Running totals for one bucket scan (no key list is kept)"""
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.object_count = 0
+        self.total_bytes = 0
+        self.largest_key = None
+        self.largest_size = 0
+        self.pages = 0
+        self.truncated = False
+        self.elapsed = 0.0
+
+    def add(self, obj):
+        """Fold one listed object into the totals"""
+        size = obj.get('Size', 0)
+        self.object_count += 1
+        self.total_bytes += size
+        # Ties go to the first key in key order, whatever order pages arrive in
+        if (self.largest_key is None or size > self.largest_size
+                or (size == self.largest_size and obj['Key'] < self.largest_key)):
+            self.largest_key = obj['Key']
+            self.largest_size = size
+
+# ====================== STREAMING SCAN ======================
+
+def iter_pages(s3_client, bucket, prefix='', page_size=PAGE_SIZE, delimiter=None):
+    """Yield list_objects_v2 pages one at a time"""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    extra = {'Delimiter': delimiter} if delimiter else {}
+    pages = paginator.paginate(
+        Bucket=bucket,
+        Prefix=prefix,
+        PaginationConfig={'PageSize': page_size},
+        **extra
+    )
+    for page in pages:
+        yield page
+
+def scan_bucket(s3_client, bucket, prefix='', max_pages=None, max_seconds=None, shard_workers=1):
+    """Count objects and bytes in a bucket, page by page.
+
+    Only one page is held in memory at a time. When max_pages or
+    max_seconds is reached the scan stops early and the returned
+    stats are marked as truncated. shard_workers > 1 lists the bucket's
+    folders concurrently (see iter_pages_sharded).
+    """
+    stats = BucketStats(bucket)
+    started = time.monotonic()
+
+    if shard_workers > 1:
+        pages = iter_pages_sharded(s3_client, bucket, prefix, shard_workers)
+    else:
+        pages = iter_pages(s3_client, bucket, prefix)
+
+    for page in pages:
+        stats.pages += 1
+        for obj in page.get('Contents', []):
+            stats.add(obj)
+
+        if not page.get('IsTruncated'):
+            break
+        if max_pages is not None and stats.pages >= max_pages:
+            stats.truncated = True
+            break
+        if max_seconds is not None and time.monotonic() - started >= max_seconds:
+            stats.truncated = True
+            break
+
+    stats.elapsed = time.monotonic() - started
+    return stats
+
+# ====================== SHARDED LISTING ======================
+
+def put_page(pages, item, stop):
+    """Queue a page unless the consumer has gone away"""
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def pump_pages(s3_client, bucket, jobs, pages, stop):
+    """List (prefix, delimiter) jobs one after another into a queue, ending with None.
+
+    A listing error is queued in place of the remaining pages.
+    """
+    try:
+        for prefix, delimiter in jobs:
+            for page in iter_pages(s3_client, bucket, prefix, delimiter=delimiter):
+                if not put_page(pages, page, stop):
+                    return
+    except Exception as e:
+        put_page(pages, e, stop)
+        return
+    put_page(pages, None, stop)
+
+def iter_parallel_pages(s3_client, bucket, jobs, workers=SHARD_WORKERS):
+    """Run (prefix, delimiter) listings on a thread pool, yielding pages as they arrive"""
+    pages = queue.Queue(maxsize=max(1, workers) * SHARD_QUEUE_PAGES)
+    stop = threading.Event()
+    remaining = len(jobs)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for job in jobs:
+            pool.submit(pump_pages, s3_client, bucket, [job], pages, stop)
+        try:
+            while remaining:
+                item = pages.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()  # abandoned early: queued listings give up instead of blocking
+
+def split_folder(s3_client, bucket, prefix):
+    """(sub_folders, loose_objects) of one folder, or None if it isn't worth splitting"""
+    sub_folders = []
+    loose = []
+    for pages, page in enumerate(iter_pages(s3_client, bucket, prefix, delimiter=DELIMITER), 1):
+        if pages > SPLIT_MAX_PAGES:
+            return None
+        sub_folders += [p['Prefix'] for p in page.get('CommonPrefixes', [])]
+        loose += page.get('Contents', [])
+    return (sub_folders, loose) if sub_folders else None
+
+def plan_shards(s3_client, bucket, prefix='', target=SHARD_WORKERS, max_depth=SPLIT_DEPTH):
+    """Split a listing into disjoint shards using Delimiter listings.
+
+    Folders are split level by level (all folders of a level at once) until
+    there are at least `target` shards. Returns (shards, loose): sorted
+    prefixes to list recursively, and the objects found directly inside
+    the folders that were split.
+    """
+    shards = [prefix]
+    loose = []
+    whole = set()   # folders with too many loose keys (or none below them)
+
+    with ThreadPoolExecutor(max_workers=max(1, target)) as pool:
+        for _ in range(max_depth):
+            candidates = [shard for shard in shards if shard not in whole]
+            if len(shards) >= target or not candidates:
+                break
+            splits = dict(zip(candidates, pool.map(
+                lambda shard: split_folder(s3_client, bucket, shard), candidates
+            )))
+
+            next_shards = []
+            for shard in shards:
+                split = splits.get(shard)
+                if split is None:
+                    whole.add(shard)
+                    next_shards.append(shard)
+                else:
+                    next_shards += split[0]
+                    loose += split[1]
+            shards = next_shards
+
+    loose.sort(key=lambda obj: obj['Key'])
+    return sorted(shards), loose
+
+def iter_pages_sharded(s3_client, bucket, prefix='', workers=SHARD_WORKERS):
+    """Pages of a whole listing, its shards fetched concurrently (arrival order).
+
+    Pages carry IsTruncated=False only on the very last one, like a plain
+    paginated listing, so callers can stop early the same way.
+    """
+    shards, loose = plan_shards(s3_client, bucket, prefix, workers)
+    jobs = [(shard, None) for shard in shards]
+
+    previous = {'Contents': loose} if loose else None
+    for page in iter_parallel_pages(s3_client, bucket, jobs, workers):
+        if previous is not None:
+            yield dict(previous, IsTruncated=True)
+        previous = page
+    if previous is not None:
+        yield dict(previous, IsTruncated=False)
+
+def iter_objects_sharded(s3_client, bucket, prefix='', workers=SHARD_WORKERS):
+    """Every object of a listing in key order, with shards listed concurrently.
+
+    Shards are grouped into one contiguous run per worker; each group is
+    listed in order on its own thread and the groups are heap-merged.
+    """
+    shards, loose = plan_shards(s3_client, bucket, prefix, workers)
+    per_group = max(1, -(-len(shards) // max(1, workers)))
+    groups = [shards[i:i + per_group] for i in range(0, len(shards), per_group)]
+
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=SHARD_QUEUE_PAGES) for _ in groups]
+
+    def drain(pages):
+        while True:
+            item = pages.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item.get('Contents', [])
+
+    with ThreadPoolExecutor(max_workers=max(1, len(groups))) as pool:
+        for group, pages in zip(groups, queues):
+            pool.submit(pump_pages, s3_client, bucket, [(shard, None) for shard in group], pages, stop)
+        try:
+            streams = [iter(loose)] + [drain(pages) for pages in queues]
+            yield from heapq.merge(*streams, key=lambda obj: obj['Key'])
+        finally:
+            stop.set()
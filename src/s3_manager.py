@@ -4,8 +4,17 @@ Author: [Vishal Attri]
 Description: Simple tool to manage AWS S3 buckets and files
 """
 
-import boto3
+import argparse
 import os
+import sys
+
+import aws_cache
+import aws_cli
+import aws_clients
+import s3_index
+import s3_transfer
+from aws_records import BucketRecord, ObjectRecord
+from s3_listing import iter_objects_sharded
 
 def show_menu():
     """Display the S3 menu"""
@@ -17,21 +26,26 @@ def show_menu():
     print("3. Delete bucket")
     print("4. Upload file")
     print("5. List files in bucket")
-    print("6. Exit")
+    print("6. Download file")
+    print("7. Exit")
     print("-"*40)
 
 def list_buckets(s3_client):
     """List all S3 buckets"""
     try:
-        response = s3_client.list_buckets()
-        buckets = response['Buckets']
+        buckets, age = aws_cache.cached(
+            'buckets', aws_cache.cache_key(),
+            lambda: [BucketRecord.from_api(b) for b in s3_client.list_buckets()['Buckets']]
+        )
         
         if buckets:
             print(f"\nYou have {len(buckets)} S3 bucket(s):")
             for bucket in buckets:
-                print(f"  • {bucket['Name']}")
+                print(f"  • {bucket.name}")
         else:
             print("\nNo S3 buckets found")
+        if age is not None:
+            print(f"({aws_cache.format_age(age)})")
             
     except Exception as e:
         print(f"Error: {e}")
@@ -44,11 +58,17 @@ def create_bucket(s3_client):
         print("Bucket name must be 3-63 characters")
         return
     
+    region = aws_clients.DEFAULT_REGION
     try:
-        s3_client.create_bucket(
-            Bucket=name,
-            CreateBucketConfiguration={'LocationConstraint': 'ap-south-1'}
-        )
+        # us-east-1 is the one region that rejects an explicit LocationConstraint
+        if region == 'us-east-1':
+            s3_client.create_bucket(Bucket=name)
+        else:
+            s3_client.create_bucket(
+                Bucket=name,
+                CreateBucketConfiguration={'LocationConstraint': region}
+            )
+        aws_cache.invalidate('buckets')
         print(f"Created bucket: {name}")
         
     except Exception as e:
@@ -60,6 +80,9 @@ def delete_bucket(s3_client):
     
     try:
         s3_client.delete_bucket(Bucket=name)
+        aws_cache.invalidate('buckets')
+        aws_cache.invalidate('objects', name)
+        s3_index.drop_bucket(name)
         print(f"Deleted bucket: {name}")
     except Exception as e:
         print(f"Error: {e}")
@@ -67,49 +90,107 @@ def delete_bucket(s3_client):
 def upload_file(s3_client):
     """Upload file to S3"""
     bucket = input("\nBucket name: ").strip()
-    filename = input("File to upload: ").strip()
+    filename = input("File, folder or glob to upload: ").strip()
+    
+    if s3_transfer.is_bulk_source(filename):
+        prefix = input("Destination prefix (optional): ").strip()
+        try:
+            summary = s3_transfer.upload_tree(s3_client, filename, bucket, prefix)
+            for path, error in summary['failed']:
+                print(f"Failed: {path}: {error}")
+            print(s3_transfer.format_summary(summary))
+        except Exception as e:
+            print(f"Error: {e}")
+        aws_cache.invalidate('objects', bucket)
+        s3_index.mark_dirty(bucket, prefix)
+        return
     
     if not os.path.exists(filename):
         print(f"File not found: {filename}")
         return
     
     try:
-        s3_client.upload_file(filename, bucket, filename)
+        s3_transfer.upload_file(s3_client, filename, bucket, filename)
+        aws_cache.invalidate('objects', bucket)
+        s3_index.mark_dirty(bucket, s3_index.key_folder(filename), recursive=False)
         print(f"Uploaded {filename} to {bucket}")
     except Exception as e:
         print(f"Error: {e}")
 
+def download_file(s3_client):
+    """Download file from S3 (resumes if interrupted)"""
+    bucket = input("\nBucket name: ").strip()
+    key = input("File key: ").strip()
+    
+    try:
+        summary = s3_transfer.download_file(s3_client, bucket, key)
+        print(f"Downloaded {key} to {summary['filename']} "
+              f"({summary['mb_per_sec']:.1f} MB/s, verified: {summary['verified'] or 'no'})")
+    except KeyboardInterrupt:
+        print("\nInterrupted - download again to resume")
+    except Exception as e:
+        print(f"Error: {e}")
+
 def list_files(s3_client):
     """List files in a bucket"""
     bucket = input("\nBucket name: ").strip()
     
     try:
-        files = s3_client.list_objects_v2(Bucket=bucket)
+        # Keys print as pages arrive; short listings are cached on the way through
+        objects, age = aws_cache.cached_stream(
+            'objects', aws_cache.cache_key(bucket),
+            lambda: (ObjectRecord.from_api(item) for item in iter_objects_sharded(s3_client, bucket))
+        )
         
-        if 'Contents' in files:
-            print(f"\nFiles in {bucket}:")
-            for item in files['Contents']:
-                print(f"  • {item['Key']}")
-        else:
+        count = 0
+        for item in objects:
+            if count == 0:
+                print(f"\nFiles in {bucket}:")
+            count += 1
+            if count <= 1000:
+                print(f"  • {item.key}")
+        if count > 1000:
+            print(f"  ... and {count - 1000} more ({count} files)")
+        elif count == 0:
             print(f"\nNo files in {bucket}")
+        if age is not None:
+            print(f"({aws_cache.format_age(age)})")
             
     except Exception as e:
         print(f"Error: {e}")
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Standalone S3 manager (menu, or one command: ls, put, ...)")
+    parser.add_argument('--refresh', action='store_true', help="drop cached listings first")
+    parser.add_argument('--no-cache', action='store_true', help="don't use the listing cache")
+    aws_cli.add_region_option(parser)
+    aws_cli.add_s3_commands(parser.add_subparsers(dest='command', metavar='COMMAND', help="run one command without the menu"))
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main program"""
+    args = parse_args(argv)
+    aws_cache.configure(enabled=not args.no_cache)
+    if args.refresh:
+        aws_cache.clear()
+    if args.region:
+        aws_clients.set_default_region(args.region)
+    if args.command:
+        sys.exit(aws_cli.run(args))
+    
     print("\nAWS S3 Manager")
-    print("Region: ap-south-1 (Mumbai)")
+    print(f"Region: {aws_clients.DEFAULT_REGION}")
     print("-"*40)
     
     # Connect to S3
-    s3 = boto3.client('s3', region_name='ap-south-1')
+    s3 = aws_clients.get_client('s3')
     
     while True:
         show_menu()
         
         try:
-            choice = input("\nChoose 1-6: ").strip()
+            choice = input("\nChoose 1-7: ").strip()
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
             break
@@ -125,10 +206,12 @@ def main():
         elif choice == '5':
             list_files(s3)
         elif choice == '6':
+            download_file(s3)
+        elif choice == '7':
             print("\nGoodbye!")
             break
         else:
-            print("Please choose 1-6")
+            print("Please choose 1-7")
         
         input("\nPress Enter to continue...")
 
@@ -0,0 +1,136 @@
+"""
+S3 Purge - Bulk bucket emptying
+Author: [Vishal Attri]
+Description: Stream object versions/delete markers and remove them with batched, parallel DeleteObjects
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aws_clients
+
+# ====================== PURGE CONFIG ======================
+BATCH_SIZE = 1000         # DeleteObjects hard limit
+PURGE_WORKERS = 8         # batches in flight
+MAX_RETRIES = 5
+
+# Per-key error codes worth another attempt (AccessDenied etc. are final)
+RETRYABLE_CODES = {'InternalError', 'SlowDown', 'ServiceUnavailable', 'RequestTimeout', 'OperationAborted'}
+
+# ====================== LISTING ======================
+
+def iter_delete_targets(s3_client, bucket, prefix=''):
+    """Yield {'Key', 'VersionId'} for every version and delete marker.
+
+    Buckets that were never versioned report a single 'null' version per
+    key, so this covers plain buckets too. Falls back to list_objects_v2
+    when ListBucketVersions isn't allowed.
+    """
+    paginator = s3_client.get_paginator('list_object_versions')
+    try:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for item in page.get('Versions', []) + page.get('DeleteMarkers', []):
+                yield {'Key': item['Key'], 'VersionId': item['VersionId']}
+    except s3_client.exceptions.ClientError as e:
+        if e.response['Error']['Code'] not in ('AccessDenied', 'NotImplemented'):
+            raise
+        for page in s3_client.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+            for item in page.get('Contents', []):
+                yield {'Key': item['Key']}
+
+def iter_batches(items, size=BATCH_SIZE):
+    """Group an iterator into lists of at most size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# ====================== DELETE ======================
+
+def delete_batch(s3_client, bucket, batch, max_retries=MAX_RETRIES):
+    """Delete up to 1000 keys, retrying keys that failed with retryable errors.
+
+    Returns (deleted_count, [(key, code, message), ...]) for keys that
+    could not be deleted.
+    """
+    pending = batch
+    failed = []
+    deleted = 0
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={'Objects': pending, 'Quiet': True}
+            )
+        except s3_client.exceptions.ClientError as e:
+            if attempt == max_retries:
+                code = e.response['Error']['Code']
+                return deleted, failed + [(t['Key'], code, str(e)) for t in pending]
+            aws_clients.backoff(attempt)
+            continue
+
+        errors = response.get('Errors', [])
+        deleted += len(pending) - len(errors)
+
+        retry = []
+        for error in errors:
+            target = {'Key': error['Key']}
+            if error.get('VersionId'):
+                target['VersionId'] = error['VersionId']
+            if aws_clients.is_throttle(error.get('Code')):
+                aws_clients.record_throttle(s3_client)
+            if error.get('Code') in RETRYABLE_CODES and attempt < max_retries:
+                retry.append(target)
+            else:
+                failed.append((error['Key'], error.get('Code'), error.get('Message')))
+
+        if not retry:
+            break
+        pending = retry
+        aws_clients.backoff(attempt)
+
+    return deleted, failed
+
+def purge_bucket(s3_client, bucket, prefix='', workers=PURGE_WORKERS, progress=True):
+    """Delete every object version and delete marker in a bucket.
+
+    The listing is streamed and cut into 1000-key batches that are deleted
+    by several threads at once. Returns a summary dict with deleted count,
+    failed keys and deletes per second.
+    """
+    summary = {'deleted': 0, 'failed': []}
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def run(batch):
+        try:
+            deleted, failed = delete_batch(s3_client, bucket, batch)
+        except Exception as e:
+            deleted, failed = 0, [(t['Key'], type(e).__name__, str(e)) for t in batch]
+        with lock:
+            summary['deleted'] += deleted
+            summary['failed'].extend(failed)
+            if progress:
+                rate = summary['deleted'] / max(time.monotonic() - started, 1e-6)
+                sys.stdout.write(f"\r  🗑️  {summary['deleted']:,} deleted ({rate:,.0f}/s)")
+                sys.stdout.flush()
+
+    # Only a few batches are listed ahead of the deleters
+    slots = threading.BoundedSemaphore(workers * 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in iter_batches(iter_delete_targets(s3_client, bucket, prefix)):
+            slots.acquire()
+            pool.submit(run, batch).add_done_callback(lambda _: slots.release())
+
+    if progress and summary['deleted']:
+        sys.stdout.write("\n")
+    summary['elapsed'] = time.monotonic() - started
+    summary['per_sec'] = summary['deleted'] / max(summary['elapsed'], 1e-6)
+    return summary
@@ -0,0 +1,503 @@
+"""
+S3 Transfer - Tunable multipart upload and ranged download engine
+Author: [Vishal Attri]
+Description: Parallel-part uploads with bandwidth cap, per-part checksums and real progress;
+             resumable parallel byte-range downloads
+"""
+
+import base64
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from s3_listing import iter_pages
+
+# ====================== TRANSFER CONFIG ======================
+MB = 1024 * 1024
+MIN_PART_SIZE_MB = 5          # S3 rejects smaller parts (except the last one)
+MAX_PART_SIZE_MB = 5 * 1024
+
+# Defaults (override via environment)
+PART_SIZE_MB = float(os.environ.get('AWS_TOOL_PART_SIZE_MB', 16))
+UPLOAD_CONCURRENCY = int(os.environ.get('AWS_TOOL_UPLOAD_CONCURRENCY', 10))
+MAX_BANDWIDTH_MB = float(os.environ.get('AWS_TOOL_MAX_BANDWIDTH_MB', 0)) or None
+CHECKSUM_ALGORITHM = os.environ.get('AWS_TOOL_CHECKSUM') or None
+
+CHECKSUM_ALGORITHMS = ('CRC32', 'CRC32C', 'SHA1', 'SHA256')
+
+# Files uploaded at once by bulk (directory/glob) uploads
+BULK_WORKERS = int(os.environ.get('AWS_TOOL_BULK_WORKERS', 16))
+
+# Byte ranges fetched at once by downloads
+DOWNLOAD_CONCURRENCY = int(os.environ.get('AWS_TOOL_DOWNLOAD_CONCURRENCY', 10))
+
+# verify_download() result when S3 gives nothing to check the file against
+UNVERIFIABLE = 'unverifiable'
+
+# Part sizes other tools commonly use (boto3/aws cli default is 8 MB)
+COMMON_PART_SIZES_MB = (8, 5, 16, 32, 64, 100, 128)
+
+def make_transfer_config(part_size_mb=None, concurrency=None, max_bandwidth_mb=None):
+    """Build a TransferConfig from MB-based settings"""
+    from boto3.s3.transfer import TransferConfig   # boto3 loads only once a transfer starts
+
+    part_size_mb = part_size_mb or PART_SIZE_MB
+    concurrency = concurrency or UPLOAD_CONCURRENCY
+    max_bandwidth_mb = max_bandwidth_mb if max_bandwidth_mb is not None else MAX_BANDWIDTH_MB
+
+    if not MIN_PART_SIZE_MB <= part_size_mb <= MAX_PART_SIZE_MB:
+        raise ValueError(f"Part size must be {MIN_PART_SIZE_MB}-{MAX_PART_SIZE_MB} MB")
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+
+    part_size = int(part_size_mb * MB)
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=concurrency,
+        max_bandwidth=int(max_bandwidth_mb * MB) if max_bandwidth_mb else None,
+        use_threads=concurrency > 1,
+    )
+
+def checksum_args(checksum=None):
+    """ExtraArgs asking S3 to verify every part with the given algorithm"""
+    checksum = checksum or CHECKSUM_ALGORITHM
+    if not checksum:
+        return None
+    checksum = checksum.upper()
+    if checksum not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"Checksum must be one of {', '.join(CHECKSUM_ALGORITHMS)}")
+    return {'ChecksumAlgorithm': checksum}
+
+# ====================== PROGRESS ======================
+
+class ProgressBar:
+    """Progress bar driven by boto3 byte callbacks (safe across part threads)"""
+
+    def __init__(self, total, label="Transferring", width=20, stream=None, done=0):
+        self.total = total
+        self.label = label
+        self.width = width
+        self.stream = stream or sys.stdout
+        self.seen = done
+        self.resumed = done   # bytes already there when a download resumes
+        self.started = time.monotonic()
+        self._drawn = -1
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_amount):
+        with self._lock:
+            self.seen += bytes_amount
+            percent = int(self.seen * 100 / self.total) if self.total else 100
+            if percent != self._drawn:
+                self._drawn = percent
+                self._draw(percent)
+
+    def _draw(self, percent):
+        filled = percent * self.width // 100
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = (self.seen - self.resumed) / MB / elapsed
+        self.stream.write(
+            f"\r{self.label}: [{'▓' * filled}{' ' * (self.width - filled)}] "
+            f"{percent:3}% {self.seen / MB:.1f}/{self.total / MB:.1f} MB {rate:.1f} MB/s"
+        )
+        self.stream.flush()
+
+    def finish(self):
+        """Draw the final state and end the line"""
+        with self._lock:
+            if self._drawn != 100:
+                self.seen = self.total
+                self._draw(100)
+            self.stream.write("\n")
+            self.stream.flush()
+
+# ====================== UPLOAD ======================
+
+def upload_file(s3_client, filename, bucket, key=None, part_size_mb=None, concurrency=None,
+                max_bandwidth_mb=None, checksum=None, progress=True):
+    """Upload one file, splitting it into parallel parts above the part size.
+
+    Returns the object key. Progress is reported from the bytes actually
+    sent, not from a timer.
+    """
+    key = key or os.path.basename(filename)
+    config = make_transfer_config(part_size_mb, concurrency, max_bandwidth_mb)
+    extra_args = checksum_args(checksum)
+
+    callback = None
+    if progress:
+        callback = ProgressBar(os.path.getsize(filename), f"Uploading {os.path.basename(filename)}")
+
+    s3_client.upload_file(filename, bucket, key, ExtraArgs=extra_args, Callback=callback, Config=config)
+
+    if callback:
+        callback.finish()
+    return key
+
+# ====================== BULK UPLOAD ======================
+
+def is_bulk_source(source):
+    """True for a directory or a glob pattern"""
+    return os.path.isdir(source) or any(c in source for c in '*?[')
+
+def find_upload_files(source):
+    """Yield (path, relative key) for every file under a directory or glob"""
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in files:
+                path = os.path.join(root, name)
+                yield path, os.path.relpath(path, source).replace(os.sep, '/')
+        return
+
+    # Keys are relative to the part of the pattern before the first wildcard
+    base = source[:min(source.find(c) for c in '*?[' if c in source)]
+    base = os.path.dirname(base) or '.'
+    for path in glob.iglob(source, recursive=True):
+        if os.path.isfile(path):
+            yield path, os.path.relpath(path, base).replace(os.sep, '/')
+
+def list_remote(s3_client, bucket, prefix=''):
+    """One paginated listing of the destination: {key: (size, etag)}"""
+    remote = {}
+    for page in iter_pages(s3_client, bucket, prefix):
+        for obj in page.get('Contents', []):
+            remote[obj['Key']] = (obj['Size'], obj['ETag'].strip('"'))
+    return remote
+
+def local_etag(filename, part_size=None):
+    """ETag S3 would report: plain MD5, or md5-of-part-md5s when part_size is given
+    (one size for every part, or a list with each part's size)"""
+    if part_size is None:
+        md5 = hashlib.md5()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(MB), b''):
+                md5.update(chunk)
+        return md5.hexdigest()
+
+    sizes = iter(part_size) if isinstance(part_size, list) else None
+    digests = []
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(next(sizes, MB) if sizes else part_size), b''):
+            digests.append(hashlib.md5(chunk).digest())
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+def is_unchanged(filename, size, remote_entry, part_size):
+    """Compare size first (free), then the MD5-based ETag"""
+    if remote_entry is None or remote_entry[0] != size:
+        return False
+
+    remote_etag = remote_entry[1]
+    if '-' not in remote_etag:
+        return local_etag(filename) == remote_etag
+
+    # Multipart ETag: the part size isn't recorded, so try every candidate
+    # (ours, then common tool defaults) that gives the same part count;
+    # several sizes can give the same count, and only one of them matches
+    parts = int(remote_etag.rsplit('-', 1)[1])
+    tried = set()
+    for candidate in [part_size] + [mb * MB for mb in COMMON_PART_SIZES_MB]:
+        if candidate in tried or -(-size // candidate) != parts:
+            continue
+        tried.add(candidate)
+        if local_etag(filename, candidate) == remote_etag:
+            return True
+    return False
+
+def upload_tree(s3_client, source, bucket, prefix='', workers=None, part_size_mb=None,
+                concurrency=None, max_bandwidth_mb=None, checksum=None, skip_unchanged=True):
+    """Upload a directory or glob concurrently, skipping files S3 already has.
+
+    The destination prefix is listed once up front instead of sending a
+    HEAD per file. Returns a summary dict with counts and throughput.
+    """
+    workers = workers or BULK_WORKERS
+    prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+    config = make_transfer_config(part_size_mb, concurrency, max_bandwidth_mb)
+    extra_args = checksum_args(checksum)
+    part_size = config.multipart_chunksize
+
+    started = time.monotonic()
+    remote = list_remote(s3_client, bucket, prefix) if skip_unchanged else {}
+
+    summary = {'uploaded': 0, 'skipped': 0, 'failed': [], 'bytes': 0}
+    lock = threading.Lock()
+
+    def upload_one(item):
+        path, rel_key = item
+        key = prefix + rel_key
+        try:
+            size = os.path.getsize(path)
+            if skip_unchanged and is_unchanged(path, size, remote.get(key), part_size):
+                outcome = 'skipped'
+            else:
+                s3_client.upload_file(path, bucket, key, ExtraArgs=extra_args, Config=config)
+                outcome = 'uploaded'
+        except Exception as e:
+            with lock:
+                summary['failed'].append((path, str(e)))
+            return
+
+        with lock:
+            summary[outcome] += 1
+            if outcome == 'uploaded':
+                summary['bytes'] += size
+            done = summary['uploaded'] + summary['skipped'] + len(summary['failed'])
+            if done % 100 == 0:
+                sys.stdout.write(f"\r  {done} files processed ({summary['skipped']} unchanged)")
+                sys.stdout.flush()
+
+    # Bound the queue so a 50k-file tree doesn't create 50k futures up front
+    slots = threading.BoundedSemaphore(workers * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in find_upload_files(source):
+            slots.acquire()
+            pool.submit(upload_one, item).add_done_callback(lambda _: slots.release())
+
+    summary['elapsed'] = time.monotonic() - started
+    summary['files'] = summary['uploaded'] + summary['skipped'] + len(summary['failed'])
+    elapsed = max(summary['elapsed'], 1e-6)
+    summary['files_per_sec'] = summary['files'] / elapsed
+    summary['mb_per_sec'] = summary['bytes'] / MB / elapsed
+    if summary['files'] >= 100:
+        sys.stdout.write("\n")
+    return summary
+
+def format_summary(summary):
+    """One-line throughput summary for a bulk upload"""
+    return (f"{summary['uploaded']} uploaded, {summary['skipped']} unchanged, "
+            f"{len(summary['failed'])} failed in {summary['elapsed']:.1f}s "
+            f"({summary['files_per_sec']:.1f} files/s, {summary['mb_per_sec']:.2f} MB/s)")
+
+# ====================== DOWNLOAD ======================
+
+def part_ranges(size, part_size):
+    """[(start, end_inclusive), ...] covering size bytes"""
+    return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+def state_path(filename):
+    """Sidecar file recording which ranges of a download are on disk"""
+    return filename + '.part.json'
+
+def load_state(filename, bucket, key, head, part_size):
+    """Finished part numbers from an earlier attempt at the same object version"""
+    try:
+        with open(state_path(filename)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    same = (state.get('bucket'), state.get('key'), state.get('etag'), state.get('size'),
+            state.get('part_size')) == (bucket, key, head['ETag'], head['ContentLength'], part_size)
+    if not same or not os.path.exists(filename + '.part'):
+        return set()
+    return set(state.get('done', []))
+
+def save_state(filename, bucket, key, head, part_size, done):
+    """Write the sidecar atomically so a crash never leaves it half written"""
+    state = {'bucket': bucket, 'key': key, 'etag': head['ETag'], 'size': head['ContentLength'],
+             'part_size': part_size, 'done': sorted(done)}
+    tmp = state_path(filename) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path(filename))
+
+def preallocate(path, size):
+    """Create (or keep) a file of exactly size bytes for ranged writes"""
+    mode = 'r+b' if os.path.exists(path) else 'wb'
+    with open(path, mode) as f:
+        f.truncate(size)
+        if size and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError:
+                pass  # filesystem without fallocate: sparse file is fine
+
+def fetch_range(s3_client, bucket, key, etag, path, start, end, callback=None):
+    """GET one byte range (only if the object is unchanged) into its place in the file"""
+    response = s3_client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag)
+    with open(path, 'r+b') as f:
+        f.seek(start)
+        for chunk in response['Body'].iter_chunks(MB):
+            f.write(chunk)
+            if callback:
+                callback(len(chunk))
+        f.flush()
+        os.fsync(f.fileno())
+
+def file_checksum(filename, algorithm):
+    """Base64 full-object checksum the way S3 reports it (SHA256, SHA1 or CRC32)"""
+    if algorithm == 'CRC32':
+        crc = 0
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(MB), b''):
+                crc = zlib.crc32(chunk, crc)
+        digest = crc.to_bytes(4, 'big')
+    else:
+        h = hashlib.new(algorithm.lower())
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(MB), b''):
+                h.update(chunk)
+        digest = h.digest()
+    return base64.b64encode(digest).decode()
+
+def part_layout(s3_client, bucket, key, head, parts):
+    """Each part's size for a multipart object, or None when S3 won't tell.
+
+    GetObjectAttributes lists them for objects uploaded with checksums;
+    otherwise every part is HEADed with its PartNumber.
+    """
+    version = {'VersionId': head['VersionId']} if head.get('VersionId') else {}
+    sizes = []
+    try:
+        marker = 0
+        while True:
+            response = s3_client.get_object_attributes(Bucket=bucket, Key=key, ObjectAttributes=['ObjectParts'],
+                                                       MaxParts=1000, PartNumberMarker=marker, **version)
+            object_parts = response.get('ObjectParts', {})
+            sizes += [part['Size'] for part in object_parts.get('Parts', [])]
+            if not object_parts.get('IsTruncated'):
+                break
+            marker = object_parts['NextPartNumberMarker']
+    except s3_client.exceptions.ClientError:
+        sizes = []
+
+    if len(sizes) != parts:
+        def part_size(number):
+            return s3_client.head_object(Bucket=bucket, Key=key, PartNumber=number, **version)['ContentLength']
+        try:
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY) as pool:
+                sizes = list(pool.map(part_size, range(1, parts + 1)))
+        except s3_client.exceptions.ClientError:
+            return None
+    return sizes if sum(sizes) == head['ContentLength'] else None
+
+def verify_download(s3_client, bucket, key, head, filename):
+    """Compare the file with the object's ETag or checksum.
+
+    Returns how it was verified ('etag', 'sha256', ...), or 'unverifiable'
+    when S3 exposes nothing this tool can recompute (or won't say how a
+    multipart object was cut); raises ValueError on mismatch.
+    """
+    etag = head['ETag'].strip('"')
+    encrypted = head.get('ServerSideEncryption', '').startswith('aws:kms') or head.get('SSECustomerAlgorithm')
+
+    if not encrypted:   # with SSE-KMS/SSE-C the ETag is not an MD5
+        if '-' not in etag:
+            actual = local_etag(filename)
+            if actual != etag:
+                raise ValueError(f"ETag mismatch: expected {etag}, got {actual}")
+            return 'etag'
+
+        # Multipart ETag: most uploads use part 1's size for every part but the last,
+        # and a match on that guess is conclusive; otherwise get the real sizes
+        parts = int(etag.rsplit('-', 1)[1])
+        version = {'VersionId': head['VersionId']} if head.get('VersionId') else {}
+        try:
+            first = s3_client.head_object(Bucket=bucket, Key=key, PartNumber=1, **version)['ContentLength']
+        except s3_client.exceptions.ClientError:
+            first = None
+        if first and -(-head['ContentLength'] // first) == parts and local_etag(filename, first) == etag:
+            return 'etag'
+        sizes = part_layout(s3_client, bucket, key, head, parts)
+        if sizes is None:
+            return UNVERIFIABLE
+        actual = local_etag(filename, sizes)
+        if actual != etag:
+            raise ValueError(f"ETag mismatch: expected {etag}, got {actual}")
+        return 'etag'
+
+    for algorithm in ('SHA256', 'SHA1', 'CRC32'):
+        expected = head.get(f'Checksum{algorithm}')
+        if expected and '-' not in expected:    # composite (per-part) checksums can't be recomputed
+            actual = file_checksum(filename, algorithm)
+            if actual != expected:
+                raise ValueError(f"{algorithm} mismatch: expected {expected}, got {actual}")
+            return algorithm.lower()
+    return UNVERIFIABLE
+
+def download_file(s3_client, bucket, key, filename=None, part_size_mb=None, concurrency=None,
+                  progress=True, verify=True):
+    """Download one object with concurrent byte-range GETs, resuming earlier attempts.
+
+    Ranges are written straight into a preallocated '<filename>.part' file
+    and recorded in '<filename>.part.json' as they finish, so an interrupted
+    download only fetches the missing ranges next time. Every GET carries
+    If-Match on the ETag: if the object changes mid-download it fails
+    instead of mixing versions. Returns a summary dict.
+    """
+    filename = filename or os.path.basename(key)
+    part_size = int((part_size_mb or PART_SIZE_MB) * MB)
+    concurrency = concurrency or DOWNLOAD_CONCURRENCY
+    started = time.monotonic()
+
+    head = s3_client.head_object(Bucket=bucket, Key=key, ChecksumMode='ENABLED')
+    size = head['ContentLength']
+    ranges = part_ranges(size, part_size)
+    path = filename + '.part'
+
+    done = load_state(filename, bucket, key, head, part_size)
+    resumed = sum(ranges[i][1] - ranges[i][0] + 1 for i in done if i < len(ranges))
+    if not done:
+        preallocate(path, size)
+
+    callback = None
+    if progress:
+        callback = ProgressBar(size, f"Downloading {os.path.basename(filename)}", done=resumed)
+
+    lock = threading.Lock()
+
+    def fetch(number):
+        start, end = ranges[number]
+        fetch_range(s3_client, bucket, key, head['ETag'], path, start, end, callback)
+        with lock:
+            done.add(number)
+            save_state(filename, bucket, key, head, part_size, done)
+
+    todo = [number for number in range(len(ranges)) if number not in done]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        jobs = [pool.submit(fetch, number) for number in todo]
+        try:
+            finished, _ = wait(jobs, return_when=FIRST_EXCEPTION)
+        except BaseException:
+            # Ctrl-C: drop the queued ranges, keep the finished ones for a resume
+            for job in jobs:
+                job.cancel()
+            raise
+        failed = [job for job in finished if job.exception() is not None]
+        if failed:
+            for job in jobs:
+                job.cancel()
+            raise failed[0].exception()
+
+    if callback:
+        callback.finish()
+
+    try:
+        verified = verify_download(s3_client, bucket, key, head, path) if verify else None
+    except ValueError:
+        # Corrupt data is not worth resuming from
+        for leftover in (path, state_path(filename)):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+
+    os.replace(path, filename)
+    if os.path.exists(state_path(filename)):
+        os.remove(state_path(filename))
+
+    elapsed = time.monotonic() - started
+    return {
+        'filename': filename,
+        'bytes': size,
+        'resumed_bytes': resumed,
+        'parts': len(ranges),
+        'verified': verified,
+        'elapsed': elapsed,
+        'mb_per_sec': (size - resumed) / MB / max(elapsed, 1e-6),
+    }